@@ -3,6 +3,9 @@ import time
 from datetime import datetime, timedelta
 import re
 from scripts.element_finders import HtmlElementFinder, TextAndUrlElementFinder, SimpleTextElementFinder
+from scripts.element_finder import text_and_url_xpaths
+from scripts.legacy_locator_table import LegacyLocatorTable, locator_key
+from scripts.negative_locator_cache import NegativeLocatorCache
 from scripts.actions.factory import ActionExecutorFactory
 
 class ActionExecutor:
@@ -10,10 +13,46 @@ class ActionExecutor:
         self.html_finder = HtmlElementFinder()
         self.text_url_finder = TextAndUrlElementFinder()
         self.simple_text_finder = SimpleTextElementFinder()
+        self.negative_cache = NegativeLocatorCache.get_instance()
+
+    @staticmethod
+    def _parse_text_and_url(html_content):
+        """从跳转链接的HTML片段中取出文本和onclick里的URL，备用查找用"""
+        text_match = re.search(r'>([^<]+)<', html_content)
+        text = text_match.group(1).strip() if text_match else ""
+        
+        url_match = re.search(r"onclick=\"[^\"]*'([^']+)'|onclick=\"[^\"]*\"([^\"]+)\"", html_content)
+        url = url_match.group(1) or url_match.group(2) if url_match else ""
+        return text, url
+
+    def _probe(self, driver, action):
+        """一次 execute_script 探测主查找和所有备用查找能不能找到元素，同时拿到页面指纹"""
+        locator = LegacyLocatorTable.get_instance().get(action['element_info'], action.get('container_info'))
+        locators = [{'container': locator['container_xpath'], 'xpath': locator['xpath']}]
+        if locator['loose_xpath']:
+            locators.append({'container': None, 'xpath': locator['loose_xpath']})
+        links = None
+        if action['trigger_type'] == '跳转':
+            text, url = self._parse_text_and_url(action['element_info'])
+            if text and url:
+                locators += [{'container': None, 'xpath': xpath} for xpath in text_and_url_xpaths(text, url)]
+                links = {'text': text, 'url': url}
+        return self.negative_cache.probe(driver, locators, links)
 
     def _execute_action(self, driver, action):
         """执行单个动作"""
         print(f'action = {action}')
+        key = locator_key(action['element_info'], action.get('container_info'))
+        
+        # 这个定位失败过才探测（一次往返拿到页面指纹）：同一页面上已经确认找不到，并且仍然没有，
+        # 直接失败，不再等待各个查找方式超时；从没失败过的定位不探测，正常执行没有额外往返
+        probe = None
+        if self.negative_cache.has_absent(key):
+            probe = self._probe(driver, action)
+            if not probe.present and self.negative_cache.is_absent(probe.fingerprint, key):
+                print(f"\033[91m警告: 当前页面上没有该元素（已确认过），跳过动作\033[0m")
+                print(f"\033[91m失败的元素信息: {action['element_info']}\033[0m")
+                return False
         
         # 尝试使用主要查找方法
         element = self.html_finder.find_element(
@@ -25,12 +64,7 @@ class ActionExecutor:
         # 如果是跳转动作且主要方法失败，尝试备用方法
         if not element and action['trigger_type'] == '跳转':
             print("\n使用备用方法查找元素...")
-            html_content = action['element_info']
-            text_match = re.search(r'>([^<]+)<', html_content)
-            text = text_match.group(1).strip() if text_match else ""
-            
-            url_match = re.search(r"onclick=\"[^\"]*'([^']+)'|onclick=\"[^\"]*\"([^\"]+)\"", html_content)
-            url = url_match.group(1) or url_match.group(2) if url_match else ""
+            text, url = self._parse_text_and_url(action['element_info'])
             
             if text and url:
                 print(f"备用查找: 文本={text}, URL={url}")
@@ -47,6 +81,10 @@ class ActionExecutor:
                 print(f"\033[91m失败的元素信息: {action['element_info']}\033[0m")
                 return False
         else:
+            # 记下这个页面，同一页面再查这个元素时直接失败；查找期间页面可能还在跳转，
+            # 执行前的探测只用来快速失败，这里重新探测一次，记下查找结束时的页面
+            probe = self._probe(driver, action)
+            self.negative_cache.mark_absent(probe.fingerprint, key)
             print(f"\033[91m警告: 无法找到元素，跳过动作\033[0m")
             print(f"\033[91m失败的动作类型: {action['trigger_type']}\033[0m")
             print(f"\033[91m失败的元素信息: {action['element_info']}\033[0m")
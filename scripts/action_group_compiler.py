@@ -0,0 +1,107 @@
+import json
+import threading
+from typing import Dict, List, Optional
+from scripts.locator_cache import NAVIGATING_TYPES, compile_locator
+
+# 页面里的解释器：按顺序执行 steps，找不到元素时轮询等待；只有点击会加载内容的步骤之后才等 jQuery 请求结束。
+# 用 execute_async_script 执行，整个动作组只有一次 WebDriver 往返。
+# 结果 {ok, step, reason}：step 是下一个还没执行的步骤，失败时调用方从这一步开始按老办法逐个执行。
+_RUNTIME = r"""
+var steps = %(steps)s;
+var options = %(options)s;
+var done = arguments[arguments.length - 1];
+function find(step) {
+    if (step.by === 'name') return document.getElementsByName(step.selector)[0] || null;
+    return document.querySelector(step.selector);
+}
+function isLoading() {
+    return !!(window.jQuery && window.jQuery.active > 0);
+}
+function waitUntil(predicate, timeoutMs, then) {
+    var deadline = Date.now() + timeoutMs;
+    (function poll() {
+        var value = predicate();
+        if (value || Date.now() >= deadline) { then(value); return; }
+        setTimeout(poll, options.poll_ms);
+    })();
+}
+function run(index) {
+    if (index >= steps.length) { done({ok: true, step: index, reason: null}); return; }
+    var step = steps[index];
+    waitUntil(function () { return find(step); }, options.find_timeout_ms, function (el) {
+        if (!el) { done({ok: false, step: index, reason: 'not_found'}); return; }
+        try {
+            if (step.mode !== 'check' || !el.checked) el.click();
+        } catch (e) {
+            done({ok: false, step: index, reason: String(e)});
+            return;
+        }
+        if (!step.navigates) { run(index + 1); return; }
+        waitUntil(function () { return !isLoading(); }, options.load_timeout_ms, function (loaded) {
+            if (!loaded) { done({ok: false, step: index + 1, reason: 'load_timeout'}); return; }
+            run(index + 1);
+        });
+    });
+}
+run(0);
+"""
+
+
+def compile_action(action) -> Optional[Dict]:
+    """把一个动作翻译成页面解释器的步骤（定位方式和 LocatorCache 一致），不支持的动作类型返回 None"""
+    trigger_type = action['trigger_type']
+    locator = compile_locator(trigger_type, action.get('value'))
+    if locator is None:
+        return None
+    by, selector = locator
+    return {
+        'by': by,
+        'selector': selector,
+        'mode': 'check' if trigger_type == 'check_box_select_character' else 'click',
+        'navigates': trigger_type in NAVIGATING_TYPES,
+    }
+
+
+class CompiledActionGroup:
+    """编译好的动作组：一段 JS 程序，run() 一次 execute_async_script 执行完整个动作组"""
+
+    def __init__(self, name, steps: List[Dict], script: str):
+        self.name = name
+        self.steps = steps
+        self.script = script
+
+    def run(self, driver) -> Dict:
+        """返回 {'ok': 是否全部完成, 'step': 下一个没执行的步骤, 'reason': 失败原因}"""
+        return driver.execute_async_script(self.script) or {'ok': False, 'step': 0, 'reason': 'no_result'}
+
+
+class ActionGroupCompiler:
+    """把 action_config_advanced.json 中的动作组编译成 JS 程序，按动作内容缓存，同一个动作组只编译一次
+
+    取代逐个动作的 find_element + click + idle_before/idle_after 固定等待：
+    只在会加载新内容的点击（菜单、开始战斗）之后等 jQuery 请求结束，元素没出现时在页面里轮询。
+    """
+
+    def __init__(self, find_timeout_ms=3000, load_timeout_ms=10000, poll_ms=50):
+        self.options = {'find_timeout_ms': find_timeout_ms, 'load_timeout_ms': load_timeout_ms, 'poll_ms': poll_ms}
+        self._lock = threading.Lock()
+        self._cache: Dict[tuple, Optional[CompiledActionGroup]] = {}
+
+    def compile(self, action_group) -> Optional[CompiledActionGroup]:
+        """编译动作组，有不支持的动作类型时返回 None（调用方逐个执行）"""
+        actions = action_group.get('actions', [])
+        key = tuple((action['trigger_type'], action.get('value')) for action in actions)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        steps = [compile_action(action) for action in actions]
+        compiled = None
+        if steps and all(step is not None for step in steps):
+            script = _RUNTIME % {
+                'steps': json.dumps(steps, ensure_ascii=False),
+                'options': json.dumps(self.options),
+            }
+            compiled = CompiledActionGroup(action_group.get('name'), steps, script)
+        with self._lock:
+            self._cache[key] = compiled
+        return compiled
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+from scripts.log_manager import LogManager
+
+# 菜单、战斗按钮都是 jQuery 的 .load / ajaxForm 把内容加载到 #mybody，请求结束即加载完成
+AJAX_IDLE_SCRIPT = "return document.readyState === 'complete' && !(window.jQuery && window.jQuery.active > 0);"
+
+AJAX_IDLE = 'ajax_idle'
+ELEMENT_SELECTED = 'element_selected'
+
+# 每种动作点击之后要等到什么条件成立，None 表示点击是同步生效的，不用等
+POSTCONDITIONS = {
+    'click_main_menu': AJAX_IDLE,
+    'click_main_menu_for_town': AJAX_IDLE,
+    'click_sub_menu_stage': AJAX_IDLE,
+    'click_sub_menu_boss': AJAX_IDLE,
+    'check_box_select_character': ELEMENT_SELECTED,
+    'click_button_clear_team': None,
+    'click_button_start_battle': AJAX_IDLE,
+}
+
+
+def wait_until(condition: Callable[[], object], timeout_ms, poll_ms=50,
+               clock=time.monotonic, sleep=time.sleep) -> Tuple[object, float]:
+    """轮询 condition 直到返回真值或超时，返回 (最后一次的结果, 实际等待毫秒数)"""
+    start = clock()
+    deadline = start + timeout_ms / 1000
+    while True:
+        result = condition()
+        now = clock()
+        if result or now >= deadline:
+            return result, (now - start) * 1000
+        sleep(min(poll_ms / 1000, deadline - now))
+
+
+class AdaptiveTimeout:
+    """按最近观察到的等待时间调整超时：最近 window 次里最长的 × factor，限制在 [initial_ms, max_ms]
+
+    initial_ms（action_type_config.json 里原来的固定等待时间）是下限，超时只会因为观察到的慢响应而放宽，
+    不会因为一串快响应缩到配置值以下（条件成立时本来就会提前返回，缩短超时省不了时间，只会让偶尔的慢响应超时）。
+    """
+
+    def __init__(self, initial_ms, min_ms=300, max_ms=None, factor=2.0, window=20):
+        self.initial_ms = max(initial_ms, min_ms)
+        self.min_ms = min_ms
+        self.max_ms = max_ms if max_ms is not None else max(10000, self.initial_ms * 3)
+        self.factor = factor
+        self._observed = deque(maxlen=window)
+
+    def observe(self, waited_ms, is_timeout=False):
+        # 超时说明条件比当前超时还慢，下次按当前超时 × factor 放宽
+        self._observed.append(self.timeout_ms if is_timeout else waited_ms)
+
+    @property
+    def timeout_ms(self):
+        if not self._observed:
+            return self.initial_ms
+        return min(self.max_ms, max(self.initial_ms, max(self._observed) * self.factor))
+
+
+class ActionWaiter:
+    """AdvancedActionExecutor 用的条件等待
+
+    - 点击前：轮询查找元素，出现就继续（代替 idle_before 和找不到时的盲等重试）
+    - 点击后：等这种动作的后置条件成立（代替 idle_after）
+    每种动作、每个阶段各自一个 AdaptiveTimeout；并按动作组统计比原来的固定等待节省了多少时间。
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, poll_ms=50):
+        self.poll_ms = poll_ms
+        self.logger = LogManager.get_instance()
+        self._lock = threading.Lock()
+        self._timeouts: Dict[Tuple[str, str], AdaptiveTimeout] = {}
+        self._current_group = None
+        self._group_fixed_ms = 0.0
+        self._group_waited_ms = 0.0
+        self.report: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'ActionWaiter':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def get_timeout(self, action_type, phase, initial_ms) -> AdaptiveTimeout:
+        with self._lock:
+            key = (action_type, phase)
+            if key not in self._timeouts:
+                self._timeouts[key] = AdaptiveTimeout(initial_ms)
+            return self._timeouts[key]
+
+    def _wait(self, action_type, phase, fixed_ms, condition):
+        timeout = self.get_timeout(action_type, phase, fixed_ms)
+        result, waited_ms = wait_until(condition, timeout.timeout_ms, self.poll_ms)
+        timeout.observe(waited_ms, is_timeout=not result)
+        with self._lock:
+            self._group_fixed_ms += fixed_ms
+            self._group_waited_ms += waited_ms
+        return result
+
+    def wait_for_elements(self, driver, action_type, finder, value, idle_before=0):
+        """轮询查找元素直到出现，超时返回空列表"""
+        return self._wait(action_type, 'before', idle_before,
+                          lambda: finder.find_elements(driver, value)) or []
+
+    def wait_after_action(self, driver, action_type, element=None, idle_after=0):
+        """等动作的后置条件成立，返回是否成立（超时不算失败，调用方继续往下走）"""
+        postcondition = POSTCONDITIONS.get(action_type)
+        if postcondition == AJAX_IDLE:
+            condition = lambda: driver.execute_script(AJAX_IDLE_SCRIPT)
+        elif postcondition == ELEMENT_SELECTED and element is not None:
+            condition = element.is_selected
+        else:
+            condition = lambda: True
+        return bool(self._wait(action_type, 'after', idle_after, condition))
+
+    def begin_group(self, name):
+        with self._lock:
+            self._current_group = name
+            self._group_fixed_ms = 0.0
+            self._group_waited_ms = 0.0
+
+    def end_group(self) -> Optional[Dict[str, float]]:
+        """结束一个动作组的统计，记录并返回 {'runs', 'fixed_ms', 'waited_ms', 'saved_ms'}（累计值）"""
+        with self._lock:
+            name, self._current_group = self._current_group, None
+            if name is None:
+                return None
+            stats = self.report.setdefault(name, {'runs': 0, 'fixed_ms': 0.0, 'waited_ms': 0.0, 'saved_ms': 0.0})
+            stats['runs'] += 1
+            stats['fixed_ms'] += self._group_fixed_ms
+            stats['waited_ms'] += self._group_waited_ms
+            stats['saved_ms'] = stats['fixed_ms'] - stats['waited_ms']
+            fixed_ms, waited_ms = self._group_fixed_ms, self._group_waited_ms
+        self.logger.info(f"[性能日志] 动作组 {name}: 条件等待 {waited_ms:.0f}ms，固定等待需要 {fixed_ms:.0f}ms，"
+                         f"节省 {fixed_ms - waited_ms:.0f}ms（累计节省 {stats['saved_ms']:.0f}ms / {stats['runs']}次）")
+        return dict(stats)
@@ -5,121 +5,82 @@ import time
 from datetime import datetime
 from scripts.advanced_element_finder import AdvancedElementFinderFactory
 from scripts.log_manager import LogManager
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-import json
+from scripts.http_action_engine import CONFIRMED, NOT_SENT, UNCONFIRMED, HttpActionEngine
+from scripts.action_group_compiler import ActionGroupCompiler
+from scripts.action_waits import ActionWaiter
+from scripts.locator_cache import LocatorCache, NAVIGATING_TYPES
+from selenium.common.exceptions import StaleElementReferenceException
 import logging
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-options = Options()
-options.add_argument('--headless')  # 无头模式
-options.add_argument('--disable-gpu')
-options.add_argument('--no-sandbox')
-options.add_argument('--disable-extensions')
-options.add_argument('--disable-images')  # 可用插件或自定义profile关闭图片加载
-options.add_argument('--disable-dev-shm-usage')
-options.add_argument('--window-size=1920,1080')
-
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=options)
+from functools import partial
 
 class AdvancedActionExecutor(ABC):
-    def __init__(self):
-        self._inner_idle_time_for_web_complate = 100
+    @property
+    def waiter(self):
+        return ActionWaiter.get_instance()
+
     @abstractmethod
     def execute(self, driver, value=None, idle_before=0, idle_after=100):
         pass
 
-    def _wait(self, seconds):
-        """等待指定的毫秒数"""
-        if seconds > 0:
-            time.sleep(seconds / 1000)
+    def _find_and_click(self, driver, action_type, value, idle_before, idle_after, element_name, only_if_unselected=False):
+        """等元素出现后点击，再等这种动作的后置条件成立
 
-class MainMenuActionExecutor(AdvancedActionExecutor):
-    def __init__(self, meun_key_name):
-        super().__init__()
-        self.menu_key_name = meun_key_name
-
-    def execute(self, driver, value=None, idle_before=0, idle_after=100):
+        idle_before / idle_after（action_type_config.json）不再是固定等待，而是条件等待的初始超时
+        """
         try:
-            self._wait(idle_before)
-            finder = AdvancedElementFinderFactory.get_finder(self.menu_key_name)
-            elements = finder.find_elements(driver, value)
+            start = time.time()
+            finder = AdvancedElementFinderFactory.get_finder(action_type)
+            elements = self.waiter.wait_for_elements(driver, action_type, finder, value, idle_before)
+            t1 = time.time()
             if not elements:
-                LogManager.get_instance().error(f'未找到主菜单元素: {value}')
-                # 等待页面稳定
-                self._wait(self._inner_idle_time_for_web_complate)
-                elements = finder.find_elements(driver, value)  # 重新获取元素
-                if not elements or len(elements) == 0:
-                    LogManager.get_instance().error(f'页面刷新后未找到主菜单元素: {value}')
+                LogManager.get_instance().error(f'未找到{element_name}元素: {value}')
+                return False
+            try:
+                self._click(elements[0], only_if_unselected)
+            except StaleElementReferenceException:
+                # 缓存的元素所在的内容被页面自己换掉了（没有经过执行器的导航），重新定位一次
+                LocatorCache.get_instance().invalidate(driver, drop_elements=True)
+                elements = self.waiter.wait_for_elements(driver, action_type, finder, value, idle_before)
+                if not elements:
+                    LogManager.get_instance().error(f'未找到{element_name}元素: {value}')
                     return False
-            elements[0].click()
-            self._wait(idle_after)
+                self._click(elements[0], only_if_unselected)
+            if action_type in NAVIGATING_TYPES:
+                LocatorCache.get_instance().invalidate(driver)
+            t2 = time.time()
+            self.waiter.wait_after_action(driver, action_type, elements[0], idle_after)
+            t3 = time.time()
+            logging.info(f"[性能日志] {element_name}动作耗时: 查找={t1-start:.3f}s, 点击={t2-t1:.3f}s, 等待完成={t3-t2:.3f}s, 总计={t3-start:.3f}s")
             return True
         except Exception as e:
-            LogManager.get_instance().error(f'执行主菜单动作时发生异常: {str(e)}')
+            LogManager.get_instance().error(f'执行{element_name}动作时发生异常: {str(e)}')
             return False
 
+    @staticmethod
+    def _click(element, only_if_unselected):
+        if not (only_if_unselected and element.is_selected()):
+            element.click()
+
+class MainMenuActionExecutor(AdvancedActionExecutor):
+    def __init__(self, meun_key_name):
+        super().__init__()
+        self.menu_key_name = meun_key_name
+
+    def execute(self, driver, value=None, idle_before=0, idle_after=100):
+        return self._find_and_click(driver, self.menu_key_name, value, idle_before, idle_after, '主菜单')
+
 class SubMenuStageActionExecutor(AdvancedActionExecutor):
     def execute(self, driver, value=None, idle_before=0, idle_after=100):
-        try:
-            self._wait(idle_before)
-            finder = AdvancedElementFinderFactory.get_finder('click_sub_menu_stage')
-            elements = finder.find_elements(driver, value)
-            if not elements:
-                LogManager.get_instance().error(f'未找到子菜单关卡元素: {value}')
-                # 等待页面稳定
-                self._wait(self._inner_idle_time_for_web_complate)
-                elements = finder.find_elements(driver, value)  # 重新获取元素
-                if not elements or len(elements) == 0:
-                    LogManager.get_instance().error(f'页面刷新后未找到子菜单关卡元素: {value}')
-                    return False
-            elements[0].click()
-            self._wait(idle_after)
-            return True
-        except Exception as e:
-            LogManager.get_instance().error(f'执行子菜单关卡动作时发生异常: {str(e)}')
-            return False
+        return self._find_and_click(driver, 'click_sub_menu_stage', value, idle_before, idle_after, '子菜单关卡')
 
 class SubMenuBossActionExecutor(AdvancedActionExecutor):
     def execute(self, driver, value=None, idle_before=0, idle_after=100):
-        try:
-            self._wait(idle_before)
-            finder = AdvancedElementFinderFactory.get_finder('click_sub_menu_boss')
-            elements = finder.find_elements(driver, value)
-            if not elements or len(elements) == 0:
-                LogManager.get_instance().error(f'未找到子菜单BOSS元素: {value}')
-                return False
-            elements[0].click()
-            self._wait(idle_after)
-            return True
-        except Exception as e:
-            LogManager.get_instance().error(f'执行子菜单BOSS动作时发生异常: {str(e)}')
-            return False
+        return self._find_and_click(driver, 'click_sub_menu_boss', value, idle_before, idle_after, '子菜单BOSS')
 
 class CharacterSelectActionExecutor(AdvancedActionExecutor):
     def execute(self, driver, value=None, idle_before=0, idle_after=100):
-        try:
-            start = time.time()
-            self._wait(idle_before)
-            t1 = time.time()
-            finder = AdvancedElementFinderFactory.get_finder('check_box_select_character')
-            elements = finder.find_elements(driver, value)
-            t2 = time.time()
-            if not elements or len(elements) == 0:
-                LogManager.get_instance().error(f'未找到角色复选框元素: {value}')
-                return False
-            if not elements[0].is_selected():
-                elements[0].click()
-            t3 = time.time()
-            self._wait(idle_after)
-            t4 = time.time()
-            logging.info(f"[性能日志] 角色选择动作耗时: idle_before={t1-start:.3f}s, 查找={t2-t1:.3f}s, 点击={t3-t2:.3f}s, idle_after={t4-t3:.3f}s, 总计={t4-start:.3f}s")
-            return True
-        except Exception as e:
-            LogManager.get_instance().error(f'执行角色选择动作时发生异常: {str(e)}')
-            return False
+        return self._find_and_click(driver, 'check_box_select_character', value, idle_before, idle_after, '角色复选框',
+                                    only_if_unselected=True)
 
     @staticmethod
     def batch_select(driver, char_ids):
@@ -137,47 +98,11 @@ class CharacterSelectActionExecutor(AdvancedActionExecutor):
 
 class ClearTeamActionExecutor(AdvancedActionExecutor):
     def execute(self, driver, value=None, idle_before=0, idle_after=100):
-        try:
-            start = time.time()
-            self._wait(idle_before)
-            t1 = time.time()
-            finder = AdvancedElementFinderFactory.get_finder('click_button_clear_team')
-            elements = finder.find_elements(driver, value)
-            t2 = time.time()
-            if not elements or len(elements) == 0:
-                LogManager.get_instance().error('未找到清除队伍按钮')
-                return False
-            elements[0].click()
-            t3 = time.time()
-            self._wait(idle_after)
-            t4 = time.time()
-            logging.info(f"[性能日志] 清除队伍动作耗时: idle_before={t1-start:.3f}s, 查找={t2-t1:.3f}s, 点击={t3-t2:.3f}s, idle_after={t4-t3:.3f}s, 总计={t4-start:.3f}s")
-            return True
-        except Exception as e:
-            LogManager.get_instance().error(f'执行清除队伍动作时发生异常: {str(e)}')
-            return False
+        return self._find_and_click(driver, 'click_button_clear_team', value, idle_before, idle_after, '清除队伍按钮')
 
 class StartBattleActionExecutor(AdvancedActionExecutor):
     def execute(self, driver, value=None, idle_before=0, idle_after=100):
-        try:
-            start = time.time()
-            self._wait(idle_before)
-            t1 = time.time()
-            finder = AdvancedElementFinderFactory.get_finder('click_button_start_battle')
-            elements = finder.find_elements(driver, value)
-            t2 = time.time()
-            if not elements or len(elements) == 0:
-                LogManager.get_instance().error(f'未找到战斗按钮: {value}')
-                return False
-            elements[0].click()
-            t3 = time.time()
-            self._wait(idle_after)
-            t4 = time.time()
-            logging.info(f"[性能日志] 开始战斗动作耗时: idle_before={t1-start:.3f}s, 查找={t2-t1:.3f}s, 点击={t3-t2:.3f}s, idle_after={t4-t3:.3f}s, 总计={t4-start:.3f}s")
-            return True
-        except Exception as e:
-            LogManager.get_instance().error(f'执行开始战斗动作时发生异常: {str(e)}')
-            return False
+        return self._find_and_click(driver, 'click_button_start_battle', value, idle_before, idle_after, '战斗按钮')
 
 class AdvancedActionExecutorFactory:
     _executors = {
@@ -198,10 +123,93 @@ class AdvancedActionExecutorFactory:
             raise ValueError(f'不支持的动作类型: {action_type}')
         return executor
 
+class PreparedBattle:
+    """预先布置好的动作组：队伍已经选好（或表单已经组好），fire() 时只提交战斗"""
+
+    def __init__(self, action_group, submit):
+        self.action_group = action_group
+        self._submit = submit
+        self.is_fired = False
+
+    def fire(self):
+        """提交战斗，返回 NOT_SENT / CONFIRMED / UNCONFIRMED；只能提交一次，再次调用返回 UNCONFIRMED（不能回退再提交）"""
+        if self.is_fired:
+            return UNCONFIRMED
+        self.is_fired = True
+        return self._submit()
+
+
 class AdvancedActionManager:
     def __init__(self):
         self.factory = AdvancedActionExecutorFactory()
         self.action_type_config = self._load_action_type_config()
+        self.http_engine = None
+        self.compiler = ActionGroupCompiler()
+        self.is_compiled_enabled = True
+        self._action_listeners = []
+
+    def add_action_listener(self, listener):
+        """每次执行动作组前调用 listener(action_group)，用于让冒险页缓存等失效"""
+        self._action_listeners.append(listener)
+
+    def _notify_action(self, action_group):
+        for listener in list(self._action_listeners):
+            listener(action_group)
+
+    def set_http_client(self, http_client):
+        """设置 HTTP 客户端后，配置了 "executor": "http" 的动作组会先尝试直接提交表单"""
+        self.http_engine = HttpActionEngine(http_client) if http_client else None
+
+    def is_http_enabled_for(self, action_group):
+        return self.http_engine is not None and self.http_engine.is_enabled_for(action_group)
+
+    def execute_by_http(self, action_group, form_target=None):
+        """只用 HTTP 执行动作组，返回 NOT_SENT / CONFIRMED / UNCONFIRMED
+
+        只有 NOT_SENT（未启用、读取表单失败等，确定没有提交）时调用方才能回退到浏览器
+        """
+        if not self.is_http_enabled_for(action_group):
+            return NOT_SENT
+        self._notify_action(action_group)
+        return self.http_engine.execute(action_group, form_target)
+
+    def prearm_advanced_action(self, driver, action_group, form_target=None, page_url=None):
+        """冷却结束前预先布置动作组，返回 PreparedBattle，冷却结束时调用 fire() 只提交战斗
+
+        走 HTTP 时先读好表单、组好数据；浏览器则打开 page_url，执行除最后的开始战斗以外的所有动作（清队、选人）。
+        动作组最后一步不是开始战斗，或者布置失败时返回 None，调用方按原来的方式执行。
+        """
+        actions = action_group.get('actions', [])
+        if not actions or actions[-1]['trigger_type'] != 'click_button_start_battle':
+            return None
+        if self.is_http_enabled_for(action_group):
+            prepared = self.http_engine.prepare(action_group, form_target)
+            if prepared is not None:
+                return PreparedBattle(action_group, partial(self._submit_prepared_by_http, action_group, prepared))
+            LogManager.get_instance().warning(f"HTTP 预先布置动作组 {action_group['name']} 失败，改用浏览器布置")
+        if page_url:
+            driver.get(page_url)
+        # 布置阶段还没有开战，不通知监听者（不作废冒险页快照），fire() 提交时才通知一次
+        if len(actions) > 1 and not self.execute_advanced_action(driver, dict(action_group, actions=actions[:-1]),
+                                                                 allow_http=False, notify=False):
+            return None
+        return PreparedBattle(action_group, partial(self._submit_prepared_in_browser, driver, action_group, actions[-1]['value']))
+
+    def _submit_prepared_by_http(self, action_group, prepared):
+        self._notify_action(action_group)
+        return self.http_engine.submit(prepared)
+
+    def _submit_prepared_in_browser(self, driver, action_group, battle_button_name):
+        self._notify_action(action_group)
+        # 页面在布置之后被刷新过的话按钮已经不在了，返回 NOT_SENT 让调用方重新执行整个动作组；
+        # 点了按钮不等结果页，由调用方刷新冒险页确认
+        is_clicked = driver.execute_script('''
+            var battleBtn = document.getElementsByName(arguments[0])[0];
+            if (!battleBtn) return false;
+            battleBtn.click();
+            return true;
+        ''', battle_button_name)
+        return UNCONFIRMED if is_clicked else NOT_SENT
 
     def _load_action_type_config(self):
         """加载动作类型配置"""
@@ -269,18 +277,56 @@ class AdvancedActionManager:
         print(f"[批量boss战] 清队+{len(char_ids)}角色+战斗, 总计: {t1-t0:.3f}s, 角色: {char_ids}")
         return True
 
-    def execute_advanced_action(self, driver, action_group):
+    def execute_advanced_action(self, driver, action_group, allow_http=True, notify=True):
+        """notify=False 时不通知动作监听者（预先布置只执行到开始战斗之前，不算一次战斗）"""
         print(f"执行动作组: {action_group['name']}")
         print(f"说明: {action_group.get('note', '')}")
+        if notify:
+            self._notify_action(action_group)
+
+        if allow_http and self.is_http_enabled_for(action_group):
+            # 上面已经通知过了，这里直接用引擎执行（execute_by_http 会再通知一次）
+            result = self.http_engine.execute(action_group)
+            if result != NOT_SENT:
+                # 已经提交过，没确认到结果也不能再用浏览器执行一遍（会多打一场），由冒险页确认
+                return result == CONFIRMED
+            LogManager.get_instance().warning(f"HTTP 执行动作组 {action_group['name']} 没有提交出去，改用浏览器执行")
 
         actions = action_group['actions']
+        compiled = self.compiler.compile(action_group) if self.is_compiled_enabled else None
+        if compiled is not None:
+            start = time.time()
+            try:
+                result = compiled.run(driver)
+            except Exception as e:
+                # 不知道执行到了哪一步（可能已经点了开始战斗），不能重来
+                LogManager.get_instance().error(f"执行编译后的动作组 {action_group['name']} 时发生异常: {str(e)}")
+                return False
+            logging.info(f"[性能日志] 编译执行动作组: {action_group['name']}, {len(actions)}个动作, 总计: {time.time()-start:.3f}s")
+            if result.get('ok'):
+                return True
+            step = result.get('step', 0)
+            LogManager.get_instance().warning(
+                f"编译执行动作组 {action_group['name']} 在第{step+1}个动作失败({result.get('reason')})，从这里开始逐个执行")
+            actions = actions[step:]
+        return self._execute_actions_one_by_one(driver, action_group, actions)
+
+    def _execute_actions_one_by_one(self, driver, action_group, actions):
+        """逐个动作执行（每个动作各自查找、点击，按 action_type_config 的 idle 等待）"""
         # 检查是否为boss战批量场景：清队+N个角色选择+开始战斗
         if (len(actions) >= 3 and
             actions[0]['trigger_type'] == 'click_button_clear_team' and
             all(a['trigger_type'] == 'check_box_select_character' for a in actions[1:-1]) and
             actions[-1]['trigger_type'] == 'click_button_start_battle'):
             return self.batch_selected_characters_actions(driver, actions)
+        waiter = ActionWaiter.get_instance()
+        waiter.begin_group(action_group['name'])
+        try:
+            return self._execute_actions_in_order(driver, action_group, actions)
+        finally:
+            waiter.end_group()
 
+    def _execute_actions_in_order(self, driver, action_group, actions):
         i = 0
         while i < len(actions):
             action = actions[i]
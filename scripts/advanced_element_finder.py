@@ -1,47 +1,44 @@
 from abc import ABC, abstractmethod
-from selenium.webdriver.common.by import By
+from scripts.locator_cache import LocatorCache
 
 class AdvancedElementFinder(ABC):
     @abstractmethod
     def find_elements(self, driver, value=None):
         pass
 
-class MainMenuElementFinder(AdvancedElementFinder):
-    def find_elements(self, driver, value=None):
-        return driver.find_elements('xpath', f"//a[contains(@onclick, '{value}')]")
+class LocatorElementFinder(AdvancedElementFinder):
+    """通过 LocatorCache 查找：(动作类型, 值) 编译成 CSS / name 选择器，同一页面上重复查找直接用缓存"""
+    trigger_type = None
 
-class SubMenuStageElementFinder(AdvancedElementFinder):
     def find_elements(self, driver, value=None):
-        return driver.find_elements('xpath', f"//a[contains(@onclick, '{value}')]")
+        return LocatorCache.get_instance().find_elements(driver, self.trigger_type, value)
 
-class SubMenuBossElementFinder(AdvancedElementFinder):
-    def find_elements(self, driver, value=None):
-        return driver.find_elements('xpath', f"//a[contains(@onclick, '{value}')]")
+class MainMenuElementFinder(LocatorElementFinder):
+    # a[onclick*="value"]
+    def __init__(self, trigger_type='click_main_menu'):
+        self.trigger_type = trigger_type
 
-class CharacterSelectElementFinder(AdvancedElementFinder):
-    def find_elements(self, driver, value=None):
-        return driver.find_elements('name', value)
+class SubMenuStageElementFinder(LocatorElementFinder):
+    trigger_type = 'click_sub_menu_stage'
 
-class ClearTeamElementFinder(AdvancedElementFinder):
-    def find_elements(self, driver, value=None):
-        ## <input type="button" class="btn" onclick="checkDelAll()" value="清除">
-        return driver.find_elements('xpath', f'//input[@type="button"][@onclick="{value}"]')
+class SubMenuBossElementFinder(LocatorElementFinder):
+    trigger_type = 'click_sub_menu_boss'
 
-class StartBattleElementFinder(AdvancedElementFinder):
-    def find_elements(self, driver, value=None):
-        if value == 'monster_battle':
-            return driver.find_elements('name', 'monster_battle')
-        elif value == 'union_battle':
-            return driver.find_elements('name', 'union_battle')
-        elif value == 'ChallengeRank':
-            return driver.find_elements('name', 'ChallengeRank')
-        else:
-            return driver.find_elements('xpath', "//input[@type='submit'][@value='戰鬥!']")
+class CharacterSelectElementFinder(LocatorElementFinder):
+    trigger_type = 'check_box_select_character'
+
+class ClearTeamElementFinder(LocatorElementFinder):
+    ## <input type="button" class="btn" onclick="checkDelAll()" value="清除">
+    trigger_type = 'click_button_clear_team'
+
+class StartBattleElementFinder(LocatorElementFinder):
+    # monster_battle / union_battle / ChallengeRank 按 name 查找，其他按 value="戰鬥!" 的提交按钮
+    trigger_type = 'click_button_start_battle'
 
 class AdvancedElementFinderFactory:
     _finders = {
         'click_main_menu': MainMenuElementFinder(),
-        'click_main_menu_for_town': MainMenuElementFinder(),
+        'click_main_menu_for_town': MainMenuElementFinder('click_main_menu_for_town'),
         'click_sub_menu_stage': SubMenuStageElementFinder(),
         'click_sub_menu_boss': SubMenuBossElementFinder(),
         'check_box_select_character': CharacterSelectElementFinder(),
@@ -55,4 +52,4 @@ class AdvancedElementFinderFactory:
         finder = cls._finders.get(action_type)
         if not finder:
             raise ValueError(f'不支持的动作类型: {action_type}')
-        return finder
\ No newline at end of file
+        return finder
@@ -0,0 +1,65 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from scripts.log_manager import LogManager
+
+
+class AsyncBotRuntime:
+    """让多个 HofAutoBot 共用一个事件循环的运行时
+
+    状态通过 process_async(runtime) 运行：阻塞的 WebDriver / requests 调用放进有上限的线程池，
+    发呆（IdleState）不占线程，直接在事件循环里等时间轮的下一个到期时间，
+    时间轮上的任务变化、cleanup() 的 wakeup 都会立刻唤醒等待。
+    """
+
+    def __init__(self, max_blocking_workers=4):
+        self.max_blocking_workers = max_blocking_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_blocking_workers, thread_name_prefix='hof-blocking')
+        self.logger = LogManager.get_instance()
+
+    async def run_blocking(self, func, *args, **kwargs):
+        """在有上限的线程池里执行阻塞调用（同一时间最多 max_blocking_workers 个）"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def idle(self, bot):
+        """等待 bot 的时间轮触发当前的发呆任务，等待期间不占用任何线程"""
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        listener = lambda: loop.call_soon_threadsafe(changed.set)
+        scheduler = bot.scheduler
+        scheduler.add_listener(listener)
+        try:
+            while not bot.is_finished and bot.current_state.is_waiting():
+                deadline = scheduler.next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - scheduler.clock())
+                changed.clear()
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                scheduler.advance()
+        finally:
+            scheduler.remove_listener(listener)
+
+    async def run_bot(self, bot):
+        while not bot.is_finished:
+            await bot.current_state.process_async(self)
+
+    async def run_all(self, bots):
+        """在当前事件循环里并发运行所有 Bot，任何一个抛出异常都只记录日志，不影响其他 Bot"""
+        results = await asyncio.gather(*(self.run_bot(bot) for bot in bots), return_exceptions=True)
+        for bot, result in zip(bots, results):
+            if isinstance(result, Exception):
+                self.logger.error(f'Bot 异常退出: {result}')
+        return results
+
+    def run(self, bots):
+        """阻塞运行直到所有 Bot 结束"""
+        try:
+            return asyncio.run(self.run_all(bots))
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
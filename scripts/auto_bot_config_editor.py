@@ -6,6 +6,10 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QH
                              QTabWidget, QScrollArea, QGroupBox, QMessageBox)
 from PyQt5.QtCore import Qt
 
+# 直接运行本文件时也能导入 scripts 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.boss_config_repository import BossConfigRepository
+
 class AutoBotConfigEditor(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -29,8 +33,7 @@ class AutoBotConfigEditor(QMainWindow):
         
         # 加载boss_config.json
         boss_config_path = os.path.join(config_dir, 'boss_config.json')
-        with open(boss_config_path, 'r', encoding='utf-8') as f:
-            self.boss_config = json.load(f)
+        self.boss_config = {'boss_list': BossConfigRepository.get_instance(boss_config_path).get_boss_list()}
         
         # 加载action_config.json
         action_config_path = os.path.join(config_dir, 'action_config.json')
@@ -84,6 +87,7 @@ class AutoBotConfigEditor(QMainWindow):
             ('stage_cost_stamina', '小怪战斗消耗体力'),
             ('max_stamnia_limit', '体力上限'),
             ('recover_stamina_per_hour', '每小时恢复体力'),
+            ('hunt_snapshot_max_age_seconds', '冒险页缓存秒数'),
             ('keep_stamnia_for_normal_stage', '切换小怪保留体力')
         ]
         
@@ -310,7 +314,8 @@ class AutoBotConfigEditor(QMainWindow):
         try:
             # 更新基本设置
             for setting_key in ['boss_cost_stamina', 'quest_cost_stamina', 'stage_cost_stamina',
-                              'max_stamnia_limit', 'recover_stamina_per_hour', 'keep_stamnia_for_normal_stage']:
+                              'max_stamnia_limit', 'recover_stamina_per_hour', 'hunt_snapshot_max_age_seconds',
+                              'keep_stamnia_for_normal_stage']:
                 spinbox = self.findChild(QSpinBox, setting_key)
                 if spinbox:
                     self.auto_bot_config[setting_key] = spinbox.value()
@@ -31,6 +31,14 @@ class AutoBotConfigManager:
     def max_stamnia_limit(self) -> int: # 体力上限
         return self.config.get('max_stamnia_limit', 4000)
 
+    @property
+    def recover_stamina_per_hour(self) -> int: # 每小时恢复体力
+        return self.config.get('recover_stamina_per_hour', 1000)
+
+    @property
+    def hunt_snapshot_max_age_seconds(self) -> int: # 冒险页缓存有效期，0 表示每次都重新读取
+        return self.config.get('hunt_snapshot_max_age_seconds', 60)
+
     @property
     def is_challenge_vip_boss(self) -> bool:
         return self.config.get('is_challenge_vip_boss', False)
@@ -91,10 +99,18 @@ class AutoBotConfigManager:
     def idle_seconds_for_challenge_boss(self) -> int:
         return self.config.get('idle_seconds_for_challenge_boss', 30)
 
+    @property
+    def boss_prearm_seconds(self) -> int: # boss 挑战冷却最后多少秒内预先打开boss页面、选好队伍，0 表示不预先布置
+        return self.config.get('boss_prearm_seconds', 10)
+
     @property
     def idle_seconds_for_challenge_vip_boss(self) -> int:
         return self.config.get('idle_seconds_for_challenge_vip_boss', 40)
 
+    @property
+    def vip_boss_prepare_lead_seconds(self) -> float: # VIP boss 刷新前提前多少秒打开boss页面
+        return self.config.get('vip_boss_prepare_lead_seconds', 3)
+
     @property
     def challenge_boss_cooldown_seconds(self) -> int:
         return self.config.get('challege_boss_cooldown_seconds', 1200)
@@ -1,25 +1,23 @@
-import re
-import requests
-import json
 import os
+import re
 from datetime import datetime, timedelta
+from scripts.boss_config_repository import BossConfigRepository, boss_config_path_for
+from scripts.hunt_page_parser import HuntSnapshot, parse_hunt_page
+from scripts.kill_log_client import KillLogClient
+from scripts.kill_log_index import KillLogIndex
 
 class BattleWatcherManager:
     def __init__(self):
-        self.config_path = os.path.join(os.path.dirname(__file__), '..', 'configs', 'boss_config.json')
-        self.cooldown_total_seconds = None
-        self.alived_boss_ids = []
+        self.boss_config_repository = BossConfigRepository.get_instance()
+        self.snapshot = HuntSnapshot()
+        self.server_data = None
+        # 日志地址 -> [KillLogIndex, 建索引时的日志版本]
+        self._kill_log_indexes = {}
 
     def get_boss_info(self, union_id):
         """从boss_config.json中获取指定union_id的boss信息"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                boss_config = json.load(f)
-                
-            for boss in boss_config['boss_list']:
-                if boss['union_id'] == union_id:
-                    return boss
-            return None
+            return self.boss_config_repository.get_by_union_id(union_id)
         except Exception as e:
             print(f'获取boss信息失败: {str(e)}')
             return None
@@ -47,56 +45,50 @@ class BattleWatcherManager:
             print(f'处理时间戳失败: {str(e)}')
             return None
 
+    def set_server_data(self, server_data):
+        """设置当前服务器配置，读取战斗日志时使用其中的 http_timeout_sec / http_retry_max / http_retry_backoff_sec"""
+        self.server_data = server_data
+        if server_data and server_data.get('config_path'):
+            config_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), server_data['config_path'])
+            self.boss_config_repository = BossConfigRepository.get_instance(boss_config_path_for(config_dir))
+
+    def _get_kill_log_client(self, url):
+        return KillLogClient.get_instance(url, self.server_data)
+
+    def get_kill_log_index(self, url):
+        """返回 url 对应日志的击杀索引，日志缓存过期时重新请求并只合并新增的记录"""
+        client = self._get_kill_log_client(url)
+        text = client.get_text()
+        entry = self._kill_log_indexes.get(url)
+        if entry is None:
+            entry = self._kill_log_indexes[url] = [KillLogIndex(), None]
+        index = entry[0]
+        index.set_bosses(self.boss_config_repository.get_boss_list())
+        if entry[1] != client.version:
+            index.update(text)
+            entry[1] = client.version
+        return index
+
+    def get_boss_latest_kill_timestamp(self, union_id, url):
+        """指定boss最近一次战斗记录的16位时间戳字符串，找不到或请求失败返回 None"""
+        try:
+            return self.get_kill_log_index(url).get_latest_timestamp(union_id)
+        except Exception as e:
+            print(f'获取战斗日志失败: {str(e)}')
+            return None
+
     def get_boss_next_battle_real_time(self, union_id, seconds_to_add=240, url = 'https://pim0110.com/hall?ulog'):
         """获取指定boss的下次战斗时间"""
-        def get_lastest_timestamp_from_boss_battle_log(union_id):
-            """获取指定boss的最近一次战斗记录时间戳"""
-            boss_info = self.get_boss_info(union_id)
-            print(f'获取{boss_info["name"]}的最近一次战斗记录时间戳')
-            if not boss_info:
-                return None
-            boss_name = boss_info["name"]
-            try:
-                timeout_sec = 5.0
-                max_attempts = 3
-                backoff_sec = 1.0
-                last_exc = None
-                response = None
-                for attempt in range(1, max_attempts + 1):
-                    try:
-                        response = requests.get(url, timeout=timeout_sec)
-                        break
-                    except Exception as e:
-                        last_exc = e
-                        print(f'获取战斗日志失败({attempt}/{max_attempts}): {str(e)}')
-                        import time
-                        time.sleep(backoff_sec * attempt)
-                if response is None:
-                    raise last_exc if last_exc else Exception('未知错误')
-                response.encoding = 'utf-8'
-                content = response.text
-                
-                timestamp_pattern = r'ulog=(\d+)'
-                first_matched_boss_text = ""
-                
-                for line in content.split('<br />'):
-                    if boss_name in line:
-                        first_matched_boss_text = line
-                        break
-                
-                match = re.search(timestamp_pattern, first_matched_boss_text, re.DOTALL)
-                if match:
-                    matched_text =  match.group(1)
-                    print("matched_text = "+ matched_text)
-                    return matched_text
-                else:
-                    print(f'未找到{boss_name}的最近一次战斗记录, url = {url},\n\n timestamp_pattern = {timestamp_pattern} \n\n res.content = {content}')
-                return None
-            except Exception as e:
-                print(f'获取战斗日志失败: {str(e)}')
-                return None
-        # 获取boss信息
-        latest_timestamp_str = get_lastest_timestamp_from_boss_battle_log(union_id)
+        boss_info = self.get_boss_info(union_id)
+        if not boss_info:
+            return None
+        print(f'获取{boss_info["name"]}的最近一次战斗记录时间戳')
+        latest_timestamp_str = self.get_boss_latest_kill_timestamp(union_id, url)
+        if latest_timestamp_str is None:
+            print(f'未找到{boss_info["name"]}的最近一次战斗记录, url = {url}')
+        return self._to_next_battle_time_info(latest_timestamp_str, seconds_to_add)
+
+    def _to_next_battle_time_info(self, latest_timestamp_str, seconds_to_add):
         if latest_timestamp_str:
             time_info = self.process_timestamp(latest_timestamp_str, seconds_to_add)
             if time_info:
@@ -107,85 +99,36 @@ class BattleWatcherManager:
 
     def get_player_challenge_boss_cooldown(self):
         """获取玩家挑战boss的冷却时间"""
-        if self.cooldown_total_seconds is None:
-            return 0
-        return self.cooldown_total_seconds
-    
+        return self.snapshot.cooldown_seconds
+
     def get_player_stamina(self):
         """获取玩家当前体力值"""
-        return self.stamina
+        return self.snapshot.stamina or 0
 
     def get_all_alive_boss(self):
         """获取所有存活的boss"""
-        return self.alived_boss_ids
-
-    def _update_all_alive_boss(self, content_text):
-        """获取所有存活的boss"""
-        try:
-            # 匹配所有存活的boss
-            import re
-
-            # 修正后的正则表达式（注意结尾的 ')')
-            boss_regex_pattern = r"RA_UseBack\s*\(\s*'index2\.php\?union=(\d+)'\s*\)"
-
-            # 匹配所有 boss ID
-            boss_matches = re.findall(boss_regex_pattern, content_text)
-
-            if boss_matches:
-                print('所有存活的boss:', boss_matches)
-                int_list = []
-                for x in boss_matches:
-                    try:
-                        int_list.append(int(x))
-                    except ValueError:
-                        print(f"警告：'{x}' 无法转换为整数，已跳过。")
-                self.alived_boss_ids = int_list  # 取消注释后可实际赋值
-            else:
-                print('未找到存活的boss')
-        except Exception as e:
-            print(f'获取所有存活的boss失败: {str(e)}')
-
-    def _update_player_challenge_boss_cooldown(self, content_text):
-        """获取玩家挑战boss的冷却时间"""
-        try:
-            content = content_text
-            # 匹配冷却时间
-            cooldown_pattern = r'離下次戰鬥還需要 : <span class="bold">(\d+:\d+)</span>'
-            cooldown_match = re.search(cooldown_pattern, content)
-            if cooldown_match:
-                cooldown = cooldown_match.group(1)  # 提取匹配的时间
-                # 将时间转换为秒数
-                minutes, seconds = map(int, cooldown.split(':'))
-                self.cooldown_total_seconds = minutes * 60 + seconds
-                print(f'剩余冷却时间:{cooldown}（剩余{self.cooldown_total_seconds}秒）')
-            else:
-                print('未找到冷却时间信息，说明可以打boss')
-                self.cooldown_total_seconds = 0
-        except Exception as e:
-            print(f'获取冷却时间失败: {str(e)}')
-
-    def _update_player_stamina(self, content_text):
-        """获取玩家当前体力值"""
-        try:
-            content = content_text
-            # 匹配体力值
-            stamina_pattern = r'<span id="mtime">(\d+)</span>'
-            stamina_match = re.search(stamina_pattern, content)
-            if stamina_match:
-                self.stamina = int(stamina_match.group(1))  # 提取匹配的体力值并转换为整数
-                print(f'当前体力值: {self.stamina}/4000')
-            else:
-                print('未找到体力值信息，请检查登录状态和地址是否正确')
-                return None
-        except Exception as e:
-            print(f'获取体力值失败，请检查登录状态和地址是否正确: {str(e)}')
-            return None
-
-    def update_all_from_hunt_page(self, content_text):
-        """更新hunt页面信息"""
-        self._update_all_alive_boss(content_text)
-        self._update_player_stamina(content_text)
-        self._update_player_challenge_boss_cooldown(content_text)
+        return self.snapshot.alive_boss_ids
+
+    def update_all_from_hunt_page(self, content_text, fetched_at=None):
+        """更新hunt页面信息，返回解析出的 HuntSnapshot"""
+        return self.update_from_snapshot(parse_hunt_page(content_text, fetched_at))
+
+    def update_from_snapshot(self, snapshot):
+        """直接使用已经提取好的 HuntSnapshot（例如浏览器里用 JS 提取的）"""
+        self.snapshot = snapshot
+        if snapshot.alive_boss_ids:
+            print('所有存活的boss:', sorted(snapshot.alive_boss_ids))
+        else:
+            print('未找到存活的boss')
+        if snapshot.stamina is not None:
+            print(f'当前体力值: {snapshot.stamina}/4000')
+        else:
+            print('未找到体力值信息，请检查登录状态和地址是否正确')
+        if snapshot.cooldown_seconds > 0:
+            print(f'剩余冷却时间: 剩余{snapshot.cooldown_seconds}秒')
+        else:
+            print('未找到冷却时间信息，说明可以打boss')
+        return snapshot
 
     def is_user_pvp_first_place(self, content_text):
         """判断当前用户是否为PVP第一名
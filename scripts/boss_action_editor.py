@@ -8,6 +8,10 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QClipboard, QIcon
 
+# 直接运行本文件时也能导入 scripts 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.boss_config_repository import BossConfigRepository
+
 class BossActionEditor(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -37,10 +41,9 @@ class BossActionEditor(QMainWindow):
         self.configs_path = os.path.join(base_path, self.current_server['config_path'])
         
         # 加载boss配置
-        with open(os.path.join(self.configs_path, 'boss_config.json'), 'r', encoding='utf-8') as f:
-            self.boss_config = json.load(f)
-            # 按union_id排序
-            self.boss_config['boss_list'].sort(key=lambda x: x['union_id'])
+        boss_list = BossConfigRepository.get_instance(os.path.join(self.configs_path, 'boss_config.json')).get_boss_list()
+        # 按union_id排序
+        self.boss_config = {'boss_list': sorted(boss_list, key=lambda x: x['union_id'])}
         
         # 加载角色配置
         with open(os.path.join(self.configs_path, 'character_config.json'), 'r', encoding='utf-8') as f:
@@ -421,9 +424,8 @@ class BossActionEditor(QMainWindow):
         
         try:
             # 重新加载配置
-            with open(os.path.join(self.configs_path, 'boss_config.json'), 'r', encoding='utf-8') as f:
-                self.boss_config = json.load(f)
-                self.boss_config['boss_list'].sort(key=lambda x: x['union_id'])
+            boss_list = BossConfigRepository.get_instance(os.path.join(self.configs_path, 'boss_config.json')).get_boss_list()
+            self.boss_config = {'boss_list': sorted(boss_list, key=lambda x: x['union_id'])}
             
             with open(os.path.join(self.configs_path, 'character_config.json'), 'r', encoding='utf-8') as f:
                 self.character_config = json.load(f)
@@ -2,6 +2,7 @@ import os
 import json
 from typing import Dict
 from scripts.battle_watcher_manager import BattleWatcherManager
+from scripts.boss_config_repository import BossConfigRepository, boss_config_path_for
 
 class BossBattleManager:
     def __init__(self):
@@ -10,6 +11,9 @@ class BossBattleManager:
         self.character_config_path = None
         self.action_config_path = None
         self.server_id = None
+        # 配置文件索引缓存: key -> (路径, 修改时间, 索引)
+        self._index_cache = {}
+        self._team_level_cache = None
         
     def set_server_id(self, server_id):
         """
@@ -22,8 +26,34 @@ class BossBattleManager:
         server_folder = f"server_{server_id:02d}"
         self.character_config_path = os.path.join(self.base_path, 'configs', server_folder, 'character_config.json')
         self.action_config_path = os.path.join(self.base_path, 'configs', server_folder, 'action_config_advanced.json')
-        self.boss_config_path = os.path.join(self.base_path, 'configs', 'boss_config.json')
+        self.boss_config_path = boss_config_path_for(os.path.join(self.base_path, 'configs', server_folder),
+                                                     os.path.join(self.base_path, 'configs', 'boss_config.json'))
         
+    def _load_json(self, path, name):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f'加载{name}失败: {str(e)}')
+            return None
+
+    def _get_index(self, key, path, name, build_index):
+        """读取并缓存某个配置文件的索引，文件修改时间变化后重新加载
+
+        同一份文件只在修改后才重新读取，boss循环里的判断只剩一次 os.stat
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except (OSError, TypeError):
+            mtime = None
+        cached = self._index_cache.get(key)
+        if cached is not None and cached[0] == path and cached[1] == mtime and mtime is not None:
+            return cached[2]
+        data = self._load_json(path, name) if mtime is not None else None
+        index = build_index(data) if data else {}
+        self._index_cache[key] = (path, mtime, index)
+        return index
+
     def load_boss_config(self):
         """
         加载Boss配置信息
@@ -31,12 +61,7 @@ class BossBattleManager:
         Returns:
             dict: Boss配置信息
         """
-        try:
-            with open(self.boss_config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f'加载Boss配置失败: {str(e)}')
-            return None
+        return {'boss_list': BossConfigRepository.get_instance(self.boss_config_path).get_boss_list()}
             
     def load_character_config(self):
         """
@@ -45,12 +70,7 @@ class BossBattleManager:
         Returns:
             dict: 角色配置信息
         """
-        try:
-            with open(self.character_config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f'加载角色配置失败: {str(e)}')
-            return None
+        return self._load_json(self.character_config_path, '角色配置')
             
     def load_action_config(self):
         """
@@ -59,12 +79,39 @@ class BossBattleManager:
         Returns:
             dict: 动作配置信息
         """
-        try:
-            with open(self.action_config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f'加载动作配置失败: {str(e)}')
-            return None
+        return self._load_json(self.action_config_path, '动作配置')
+
+    def _character_level_index(self):
+        """udid -> 等级"""
+        return self._get_index('character', self.character_config_path, '角色配置', lambda config: {
+            character['udid']: int(character['level']) for character in config.get('characters', [])
+        })
+
+    def _action_characters_index(self):
+        """动作ID（字符串） -> 动作里勾选的角色udid列表"""
+        def build_index(config):
+            index = {}
+            for action_id, action_group in config.items():
+                # value 格式为"char_xxxxxxxxxx"，char_后面的部分就是角色ID
+                index[action_id] = [action['value'][5:] for action in action_group.get('actions', [])
+                                    if action.get('trigger_type') == 'check_box_select_character'
+                                    and action['value'].startswith('char_')]
+            return index
+        return self._get_index('action', self.action_config_path, '动作配置', build_index)
+
+    def _team_level_index(self):
+        """动作ID（字符串） -> 队伍等级之和，角色或动作配置变化后重新计算"""
+        character_levels = self._character_level_index()
+        action_characters = self._action_characters_index()
+        # 以两个文件的（路径, 修改时间）作为版本号
+        key = (self._index_cache['character'][:2], self._index_cache['action'][:2])
+        if self._team_level_cache is None or self._team_level_cache[0] != key:
+            team_levels = {
+                action_id: sum(character_levels.get(char_id, 0) for char_id in character_ids)
+                for action_id, character_ids in action_characters.items()
+            }
+            self._team_level_cache = (key, team_levels)
+        return self._team_level_cache[1]
     
     def get_boss_level_limit(self, boss_id):
         """
@@ -76,15 +123,7 @@ class BossBattleManager:
         Returns:
             int: Boss的等级限制，如果未找到则返回None
         """
-        boss_config = self.load_boss_config()
-        if not boss_config:
-            return None
-            
-        for boss in boss_config['boss_list']:
-            if boss['union_id'] == boss_id:
-                return boss['level_limit']
-                
-        return None
+        return BossConfigRepository.get_instance(self.boss_config_path).get_level_limit(boss_id)
     
     def get_character_level(self, character_id):
         """
@@ -96,40 +135,23 @@ class BossBattleManager:
         Returns:
             int: 角色的等级，如果未找到则返回0
         """
-        character_config = self.load_character_config()
-        if not character_config:
-            return 0
-            
-        for character in character_config['characters']:
-            if character['udid'] == character_id:
-                return int(character['level'])
-                
-        return 0
+        return self._character_level_index().get(character_id, 0)
     
     def get_action_characters(self, action_id):
         """
         获取指定动作中包含的角色ID列表
         
         Args:
-            action_id: 动作ID
+            action_id: 动作ID（配置里的 plan_action_id 是整数，动作配置的键是字符串，两种都可以）
             
         Returns:
             list: 角色ID列表
         """
-        action_config = self.load_action_config()
-        if not action_config or action_id not in action_config:
-            return []
-            
-        character_ids = []
-        for action in action_config[action_id]['actions']:
-            if action['trigger_type'] == 'check_box_select_character':
-                # 从value中提取角色ID，格式为"char_xxxxxxxxxx"
-                # 直接提取完整的ID，不需要正则表达式
-                if action['value'].startswith('char_'):
-                    # 提取char_后面的部分作为角色ID
-                    character_ids.append(action['value'][5:])
-                    
-        return character_ids
+        return list(self._action_characters_index().get(str(action_id), []))
+
+    def get_action_total_level(self, action_id):
+        """获取指定动作中所有角色的等级之和"""
+        return self._team_level_index().get(str(action_id), 0)
     
     def is_action_level_exceed_boss_limit(self, action_id, boss_id):
         """
@@ -150,16 +172,12 @@ class BossBattleManager:
             return None
             
         # 获取动作中包含的角色ID
-        character_ids = self.get_action_characters(action_id)
-        if not character_ids:
+        if not self._action_characters_index().get(str(action_id)):
             print(f'动作(ID:{action_id})中未包含角色')
             return False
             
-        # 计算角色等级之和
-        total_level = 0
-        for char_id in character_ids:
-            char_level = self.get_character_level(char_id)
-            total_level += char_level
+        # 角色等级之和已经按动作预先算好
+        total_level = self.get_action_total_level(action_id)
             
         print(f'动作(ID:{action_id})中角色等级之和为{total_level}，Boss(ID:{boss_id})等级限制为{boss_level_limit}')
         
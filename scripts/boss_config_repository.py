@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_BOSS_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'configs', 'boss_config.json')
+
+
+def boss_config_path_for(config_dir: str, default_path: str = DEFAULT_BOSS_CONFIG_PATH) -> str:
+    """服务器配置目录（configs/server_0N）里有自己的 boss_config.json 时用它，否则用全局的 configs/boss_config.json
+
+    编辑器读写的是服务器目录下的文件，运行时也要读同一个，两边才一致
+    """
+    path = os.path.join(config_dir, 'boss_config.json')
+    return path if os.path.exists(path) else default_path
+
+
+def server_boss_config_paths(configs_dir: str = os.path.dirname(DEFAULT_BOSS_CONFIG_PATH)) -> List[str]:
+    """configs 下所有服务器目录里已有的 boss_config.json"""
+    try:
+        names = sorted(os.listdir(configs_dir))
+    except OSError:
+        return []
+    paths = [os.path.join(configs_dir, name, 'boss_config.json') for name in names if name.startswith('server_')]
+    return [path for path in paths if os.path.exists(path)]
+
+
+class BossConfigRepository:
+    """进程内共享的 boss 配置（boss_config.json）
+
+    每个文件只有一个实例（get_instance），内存里保存 union_id -> boss、name -> boss 两个索引；
+    每次查询只 os.stat 一次，文件修改时间变了才重新读取。
+    写入也走这里（save_boss_list），写完直接更新内存，不需要其他地方再重新加载。
+    """
+    _instances: Dict[str, 'BossConfigRepository'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, config_path: str = DEFAULT_BOSS_CONFIG_PATH):
+        self.config_path = config_path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._boss_list: List[Dict] = []
+        self._by_union_id: Dict[int, Dict] = {}
+        self._by_name: Dict[str, Dict] = {}
+
+    @classmethod
+    def get_instance(cls, config_path: Optional[str] = None) -> 'BossConfigRepository':
+        path = os.path.abspath(config_path or DEFAULT_BOSS_CONFIG_PATH)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def _index(self, boss_list):
+        self._boss_list = boss_list
+        self._by_union_id = {boss['union_id']: boss for boss in boss_list}
+        self._by_name = {boss['name']: boss for boss in boss_list}
+
+    def _refresh(self):
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            mtime = None
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            boss_list = []
+            if mtime is not None:
+                try:
+                    with open(self.config_path, 'r', encoding='utf-8') as f:
+                        boss_list = json.load(f).get('boss_list', [])
+                except Exception as e:
+                    print(f'加载Boss配置失败: {str(e)}')
+                    # 下次查询再试（文件可能正在被写入）
+                    mtime = None
+            self._index(boss_list)
+            self._mtime = mtime
+
+    def get_boss_list(self) -> List[Dict]:
+        """所有 boss（按文件中的顺序），返回的是副本，可以随意排序修改"""
+        self._refresh()
+        return [dict(boss) for boss in self._boss_list]
+
+    def get_by_union_id(self, union_id) -> Optional[Dict]:
+        """返回副本，修改它不会影响其他地方读到的配置"""
+        self._refresh()
+        boss = self._by_union_id.get(union_id)
+        return dict(boss) if boss is not None else None
+
+    def get_by_name(self, name) -> Optional[Dict]:
+        """返回副本，修改它不会影响其他地方读到的配置"""
+        self._refresh()
+        boss = self._by_name.get(name)
+        return dict(boss) if boss is not None else None
+
+    def get_level_limit(self, union_id) -> Optional[int]:
+        self._refresh()
+        boss = self._by_union_id.get(union_id)
+        return boss['level_limit'] if boss else None
+
+    def save_boss_list(self, boss_list: List[Dict]):
+        """写入 boss_config.json 并更新内存中的索引"""
+        config = {'boss_list': boss_list}
+        with self._lock:
+            with open(self.config_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, indent=2)
+            self._index([dict(boss) for boss in boss_list])
+            self._mtime = os.path.getmtime(self.config_path)
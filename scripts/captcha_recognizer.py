@@ -6,6 +6,7 @@ from PIL import Image
 import requests
 from selenium.webdriver.common.by import By
 import json
+from scripts.driver_provider import resource_blocking_paused
 
 def _ensure_tesseract_path():
     try:
@@ -136,31 +137,33 @@ def recognize_captcha(driver, selector="#captchaImage", attempts=5, interval=1.0
     _ensure_tesseract_path()
     elem = driver.find_element(By.CSS_SELECTOR, selector)
     last = ""
-    for _ in range(max(1, attempts)):
-        # 优先使用网络下载，避免触发前台焦点
-        src = _get_captcha_src(driver, selector=selector)
-        net_img = _download_image_by_cookies(driver, src)
-        if net_img is not None:
-            processed = _preprocess_image_advanced(net_img)
-        else:
-            rect, dpr = _get_element_rect(driver, elem)
-            img, _dpr = _capture_page_screenshot(driver)
-            crop = _crop_by_rect(img, (rect["x"], rect["y"], rect["width"], rect["height"]), dpr=dpr)
-            processed = _preprocess_image_advanced(crop)
-        config = "--psm 8 --oem 1 -c tessedit_char_whitelist=0123456789"
-        text = pytesseract.image_to_string(processed, lang="eng", config=config).strip()
-        digits = _normalize_digits(text, len_min=len_min, len_max=len_max)
-        last = digits
-        if len(digits) >= len_min and len(digits) <= len_max and digits.isdigit():
-            break
-        try:
-            driver.execute_script("if(arguments[0]) { try { arguments[0].click(); } catch(e){} }", elem)
-        except Exception:
+    # 验证码图片不能被资源屏蔽拦截，识别期间临时放开
+    with resource_blocking_paused(driver):
+        for _ in range(max(1, attempts)):
+            # 优先使用网络下载，避免触发前台焦点
+            src = _get_captcha_src(driver, selector=selector)
+            net_img = _download_image_by_cookies(driver, src)
+            if net_img is not None:
+                processed = _preprocess_image_advanced(net_img)
+            else:
+                rect, dpr = _get_element_rect(driver, elem)
+                img, _dpr = _capture_page_screenshot(driver)
+                crop = _crop_by_rect(img, (rect["x"], rect["y"], rect["width"], rect["height"]), dpr=dpr)
+                processed = _preprocess_image_advanced(crop)
+            config = "--psm 8 --oem 1 -c tessedit_char_whitelist=0123456789"
+            text = pytesseract.image_to_string(processed, lang="eng", config=config).strip()
+            digits = _normalize_digits(text, len_min=len_min, len_max=len_max)
+            last = digits
+            if len(digits) >= len_min and len(digits) <= len_max and digits.isdigit():
+                break
             try:
-                driver.execute_script("var s=document.querySelector(\"span[onclick*='getCaptcha']\"); if(s){try{s.click()}catch(e){}} else if(window.getCaptcha){try{getCaptcha()}catch(e){}}")
+                driver.execute_script("if(arguments[0]) { try { arguments[0].click(); } catch(e){} }", elem)
             except Exception:
-                pass
-        time.sleep(interval)
+                try:
+                    driver.execute_script("var s=document.querySelector(\"span[onclick*='getCaptcha']\"); if(s){try{s.click()}catch(e){}} else if(window.getCaptcha){try{getCaptcha()}catch(e){}}")
+                except Exception:
+                    pass
+            time.sleep(interval)
     if map_file:
         data = _load_captcha_map(map_file)
         corrected, info = _apply_captcha_map_info(last, data)
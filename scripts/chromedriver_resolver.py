@@ -0,0 +1,177 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from scripts.log_manager import LogManager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 本机可能的 Chrome 可执行文件位置，按顺序探测
+CHROME_BINARY_CANDIDATES = [
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    'google-chrome',
+    'google-chrome-stable',
+    'chromium',
+    'chromium-browser',
+]
+
+# Windows 上的安装位置（Application 目录，里面有 chrome.exe 和以版本号命名的子目录）
+WINDOWS_CHROME_DIRS = [
+    os.path.join('%ProgramFiles%', 'Google', 'Chrome', 'Application'),
+    os.path.join('%ProgramFiles(x86)%', 'Google', 'Chrome', 'Application'),
+    os.path.join('%LocalAppData%', 'Google', 'Chrome', 'Application'),
+]
+# Chrome 把当前版本写在这两个注册表键的 version 值里
+WINDOWS_REGISTRY_KEYS = [
+    ('HKEY_CURRENT_USER', r'Software\Google\Chrome\BLBeacon'),
+    ('HKEY_LOCAL_MACHINE', r'Software\Google\Chrome\BLBeacon'),
+]
+
+_VERSION_PATTERN = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+_resolved_cache = {}
+# 探测到的 Chrome 版本，进程内只探测一次（未探测时为 _NOT_DETECTED）
+_NOT_DETECTED = object()
+_detected_version = _NOT_DETECTED
+
+
+def _detect_windows_chrome_version():
+    """Windows 上 chrome.exe --version 不输出版本号，改为读注册表，读不到再看安装目录下的版本号子目录"""
+    try:
+        import winreg
+    except ImportError:
+        winreg = None
+    for hive_name, key_path in WINDOWS_REGISTRY_KEYS if winreg else []:
+        try:
+            with winreg.OpenKey(getattr(winreg, hive_name), key_path) as key:
+                version, _ = winreg.QueryValueEx(key, 'version')
+        except OSError:
+            continue
+        match = _VERSION_PATTERN.search(str(version))
+        if match:
+            return match.group(0)
+    for app_dir in WINDOWS_CHROME_DIRS:
+        app_dir = re.sub(r'%([^%]+)%', lambda m: os.environ.get(m.group(1), m.group(0)), app_dir)
+        if not os.path.exists(os.path.join(app_dir, 'chrome.exe')):
+            continue
+        versions = [name for name in os.listdir(app_dir) if _VERSION_PATTERN.fullmatch(name)]
+        if versions:
+            return max(versions, key=_version_key)
+    return None
+
+
+def _detect_chrome_version_from_binary():
+    for candidate in CHROME_BINARY_CANDIDATES:
+        binary = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if not binary or not os.path.exists(binary):
+            continue
+        try:
+            output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=5).stdout
+        except Exception:
+            continue
+        match = _VERSION_PATTERN.search(output or '')
+        if match:
+            return match.group(0)
+    return None
+
+
+def detect_chrome_version(refresh=False):
+    """探测本机 Chrome 版本，返回形如 "144.0.7559.109" 的字符串，探测不到返回 None
+
+    结果在进程内缓存（要启动子进程或读注册表），refresh=True 时重新探测
+    """
+    global _detected_version
+    if refresh or _detected_version is _NOT_DETECTED:
+        if os.name == 'nt':
+            _detected_version = _detect_windows_chrome_version()
+        else:
+            _detected_version = _detect_chrome_version_from_binary()
+    return _detected_version
+
+
+def _cache_dirs():
+    """webdriver_manager 可能使用的缓存目录（WDM_LOCAL=1 时在当前目录下）"""
+    dirs = [
+        os.path.join(os.getcwd(), '.wdm'),
+        os.path.join(PROJECT_ROOT, '.wdm'),
+        os.path.join(PROJECT_ROOT, 'scripts', '.wdm'),
+        os.path.join(PROJECT_ROOT, 'tools', '.wdm'),
+        os.path.join(os.path.expanduser('~'), '.wdm'),
+    ]
+    result = []
+    for d in dirs:
+        d = os.path.abspath(d)
+        if d not in result:
+            result.append(d)
+    return result
+
+
+def load_cached_drivers(cache_dirs=None):
+    """读取本地 drivers.json，返回 [(driver_version, binary_path)]，只保留二进制文件存在的记录"""
+    entries = []
+    for cache_dir in cache_dirs or _cache_dirs():
+        index_path = os.path.join(cache_dir, 'drivers.json')
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except Exception:
+            continue
+        for key, info in index.items():
+            if 'chromedriver' not in key:
+                continue
+            binary_path = info.get('binary_path')
+            match = _VERSION_PATTERN.search(key)
+            if not binary_path or not match or not os.path.exists(binary_path):
+                continue
+            entries.append((match.group(0), binary_path))
+    return entries
+
+
+def _version_key(version):
+    return tuple(int(x) for x in version.split('.'))
+
+
+def find_cached_driver(chrome_version, cache_dirs=None):
+    """在本地缓存中查找与 Chrome 主版本号匹配的 chromedriver
+
+    版本未知时返回 None（交给 webdriver_manager 联网解析），不猜一个可能主版本号不匹配的驱动
+    """
+    if not chrome_version:
+        return None
+    major = chrome_version.split('.')[0]
+    entries = [e for e in load_cached_drivers(cache_dirs) if e[0].split('.')[0] == major]
+    if not entries:
+        return None
+    entries.sort(key=lambda e: _version_key(e[0]), reverse=True)
+    return entries[0][1]
+
+
+def resolve_chromedriver_path(cache_dirs=None):
+    """解析 chromedriver 路径
+
+    优先级：环境变量 CHROMEDRIVER_PATH > 本进程已解析结果 > 本地缓存（按 Chrome 版本匹配）
+    > webdriver_manager 联网下载。命中本地缓存时不会访问网络。
+    """
+    logger = LogManager.get_instance()
+    start = time.time()
+    env_path = os.environ.get('CHROMEDRIVER_PATH')
+    if env_path and os.path.exists(env_path):
+        logger.info(f'chromedriver 解析完成(环境变量): {env_path}, 耗时: {(time.time() - start) * 1000:.1f}ms')
+        return env_path
+
+    chrome_version = detect_chrome_version()
+    cache_key = chrome_version or '-'
+    if cache_key in _resolved_cache:
+        return _resolved_cache[cache_key]
+
+    path = find_cached_driver(chrome_version, cache_dirs)
+    source = '本地缓存'
+    if not path:
+        from webdriver_manager.chrome import ChromeDriverManager
+        os.environ.setdefault('WDM_LOCAL', '1')
+        path = ChromeDriverManager().install()
+        source = '联网下载'
+    _resolved_cache[cache_key] = path
+    logger.info(f'chromedriver 解析完成({source}): {path}, Chrome版本: {chrome_version}, 耗时: {(time.time() - start) * 1000:.1f}ms')
+    return path
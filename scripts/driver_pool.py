@@ -0,0 +1,236 @@
+import atexit
+import threading
+import time
+from functools import partial
+from scripts.log_manager import LogManager
+from scripts.server_config_manager import ServerConfigManager
+from scripts.driver_provider import create_chrome_driver
+
+
+class PooledDriver:
+    """从 DriverPool 借出的浏览器实例
+
+    除 get/refresh 会额外记录导航次数外，其余属性与方法全部转发给真实的 WebDriver，
+    因此可以直接当作普通 driver 传给动作执行器、WebDriverWait 等。
+    """
+
+    def __init__(self, driver, pool):
+        self._driver = driver
+        self._pool = pool
+        self.created_at = time.monotonic()
+        self.navigation_count = 0
+        self.is_closed = False
+
+    @property
+    def raw_driver(self):
+        return self._driver
+
+    @property
+    def age_seconds(self):
+        return time.monotonic() - self.created_at
+
+    def get(self, url):
+        self.navigation_count += 1
+        return self._driver.get(url)
+
+    def refresh(self):
+        self.navigation_count += 1
+        return self._driver.refresh()
+
+    def release(self):
+        """归还到池中，由池决定保留还是回收"""
+        self._pool.release(self)
+
+    def quit(self):
+        """真正关闭浏览器，并从池中移除"""
+        if self.is_closed:
+            return
+        self.is_closed = True
+        self._pool.discard(self)
+        self._driver.quit()
+
+    def __getattr__(self, name):
+        if name == '_driver':
+            raise AttributeError(name)
+        return getattr(self._driver, name)
+
+
+class DriverPool:
+    """预热的浏览器池，按 headless 区分，进程内所有服务器共享
+
+    配置读取自 server_address.json 中的 driver_pool 字段：
+        size: 池中最多保留的空闲浏览器数量
+        max_age_hours: 浏览器存活超过该小时数后回收，避免内存持续增长
+        max_navigations: 导航（get/refresh）次数超过该值后回收
+        prestart: 是否在后台预先启动浏览器
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    DEFAULT_SIZE = 1
+    DEFAULT_MAX_AGE_HOURS = 6.0
+    DEFAULT_MAX_NAVIGATIONS = 2000
+
+    def __init__(self, factory, size=DEFAULT_SIZE, max_age_hours=DEFAULT_MAX_AGE_HOURS,
+                 max_navigations=DEFAULT_MAX_NAVIGATIONS, prestart=False):
+        self.factory = factory
+        self.size = max(0, int(size))
+        self.max_age_seconds = float(max_age_hours) * 3600
+        self.max_navigations = int(max_navigations)
+        self.prestart = prestart
+        self.logger = LogManager.get_instance()
+        self._idle = []
+        self._lock = threading.Lock()
+        self._warming = 0
+
+    @classmethod
+    def get_instance(cls, headless=True) -> 'DriverPool':
+        """获取指定 headless 模式的共享池"""
+        with cls._instances_lock:
+            pool = cls._instances.get(headless)
+            if pool is None:
+                pool_config = cls._load_pool_config()
+                window_size = '1280,900' if headless else None
+                pool = cls(
+                    factory=partial(create_chrome_driver, headless=headless, window_size=window_size),
+                    size=pool_config.get('size', cls.DEFAULT_SIZE),
+                    max_age_hours=pool_config.get('max_age_hours', cls.DEFAULT_MAX_AGE_HOURS),
+                    max_navigations=pool_config.get('max_navigations', cls.DEFAULT_MAX_NAVIGATIONS),
+                    prestart=pool_config.get('prestart', False),
+                )
+                cls._instances[headless] = pool
+                if len(cls._instances) == 1:
+                    atexit.register(cls.shutdown_all)
+            return pool
+
+    @classmethod
+    def shutdown_all(cls):
+        """关闭所有池中的空闲浏览器"""
+        with cls._instances_lock:
+            pools = list(cls._instances.values())
+        for pool in pools:
+            pool.shutdown()
+
+    @staticmethod
+    def _load_pool_config():
+        all_server_config = ServerConfigManager().get_all_server_info_config() or {}
+        return all_server_config.get('driver_pool', {})
+
+    def acquire(self) -> PooledDriver:
+        """借出一个健康的浏览器，池中没有可用的就新建一个"""
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                break
+            if self._is_expired(pooled) or not self._is_healthy(pooled):
+                self._close(pooled)
+                continue
+            self.logger.info(f'从浏览器池借出实例，已导航{pooled.navigation_count}次，存活{pooled.age_seconds:.0f}秒')
+            self._replenish()
+            return pooled
+        pooled = PooledDriver(self.factory(), self)
+        self._replenish()
+        return pooled
+
+    def release(self, pooled: PooledDriver):
+        """归还浏览器，过期、不健康或池已满时直接关闭"""
+        if pooled.is_closed:
+            return
+        with self._lock:
+            if pooled in self._idle:
+                return
+        if self._is_expired(pooled) or not self._is_healthy(pooled):
+            self._close(pooled)
+            return
+        with self._lock:
+            is_full = len(self._idle) >= self.size
+        if is_full or not self._reset(pooled):
+            self._close(pooled)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(pooled)
+                return
+        self._close(pooled)
+
+    def discard(self, pooled: PooledDriver):
+        """从空闲列表中移除（浏览器被外部直接关闭时调用）"""
+        with self._lock:
+            if pooled in self._idle:
+                self._idle.remove(pooled)
+
+    def warm_up(self, count=None):
+        """同步预热浏览器，直到空闲数量达到 count（默认 size）"""
+        target = self.size if count is None else min(count, self.size)
+        while True:
+            with self._lock:
+                if len(self._idle) + self._warming >= target:
+                    return
+                self._warming += 1
+            try:
+                pooled = PooledDriver(self.factory(), self)
+            except Exception as e:
+                self.logger.error(f'预热浏览器失败: {e}')
+                return
+            finally:
+                with self._lock:
+                    self._warming -= 1
+            self.release(pooled)
+
+    def shutdown(self):
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+        for pooled in idle:
+            self._close(pooled)
+
+    @property
+    def idle_count(self):
+        with self._lock:
+            return len(self._idle)
+
+    def _replenish(self):
+        if not self.prestart:
+            return
+        threading.Thread(target=self.warm_up, name='DriverPoolWarmUp', daemon=True).start()
+
+    def _is_expired(self, pooled: PooledDriver):
+        if self.max_age_seconds > 0 and pooled.age_seconds >= self.max_age_seconds:
+            return True
+        if self.max_navigations > 0 and pooled.navigation_count >= self.max_navigations:
+            return True
+        return False
+
+    def _is_healthy(self, pooled: PooledDriver):
+        try:
+            pooled.raw_driver.current_url
+            state = pooled.raw_driver.execute_script('return document.readyState')
+            return state in ('loading', 'interactive', 'complete')
+        except Exception as e:
+            self.logger.warning(f'浏览器健康检查失败，将回收: {e}')
+            return False
+
+    def _reset(self, pooled: PooledDriver):
+        """清掉上一个账号的登录状态再放回池中：1服、2服都在同一个域名下，留着 cookie 下一个账号会直接沿用别人的会话
+
+        清理失败时返回 False，由调用方关闭浏览器，宁可重建也不把带着会话的浏览器借给别的账号
+        """
+        driver = pooled.raw_driver
+        try:
+            driver.execute_script('try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}')
+            driver.delete_all_cookies()
+            # delete_all_cookies 只删当前页面域名下的，CDP 可以清掉整个浏览器的
+            if hasattr(driver, 'execute_cdp_cmd'):
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            pooled.get('about:blank')
+            return True
+        except Exception as e:
+            self.logger.warning(f'清理浏览器会话失败，将回收: {e}')
+            return False
+
+    def _close(self, pooled: PooledDriver):
+        try:
+            pooled.quit()
+        except Exception as e:
+            self.logger.error(f'回收浏览器实例时出错: {e}')
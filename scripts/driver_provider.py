@@ -0,0 +1,107 @@
+import time
+from contextlib import contextmanager
+from scripts.log_manager import LogManager
+from scripts.chromedriver_resolver import resolve_chromedriver_path
+
+# 通过 CDP Network.setBlockedURLs 屏蔽的资源，游戏逻辑只依赖 HTML 与 JS
+BLOCKED_IMAGE_PATTERNS = ['*.gif*', '*.png*', '*.jpg*', '*.jpeg*', '*.webp*', '*.svg*', '*.ico*', '*.bmp*']
+BLOCKED_FONT_PATTERNS = ['*.woff*', '*.ttf*', '*.otf*', '*.eot*']
+BLOCKED_MEDIA_PATTERNS = ['*.mp3*', '*.mp4*', '*.ogg*', '*.wav*', '*.webm*']
+BLOCKED_STYLESHEET_PATTERNS = ['*.css*']
+
+
+def build_blocked_url_patterns(block_stylesheets=True):
+    """生成需要屏蔽的 URL 模式列表，无头模式下没人看页面，连样式表一起屏蔽"""
+    patterns = BLOCKED_IMAGE_PATTERNS + BLOCKED_FONT_PATTERNS + BLOCKED_MEDIA_PATTERNS
+    if block_stylesheets:
+        patterns = patterns + BLOCKED_STYLESHEET_PATTERNS
+    return patterns
+
+
+def build_chrome_options(headless=True, window_size='1280,900'):
+    """所有浏览器共用的启动参数（命令行、GUI、Bot 都从这里构建）"""
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-dev-shm-usage')
+    if window_size:
+        options.add_argument(f'--window-size={window_size}')
+    # DOMContentLoaded 之后就返回，不等待图片等子资源
+    options.page_load_strategy = 'eager'
+    return options
+
+
+def set_resource_blocking(driver, enabled, block_stylesheets=True):
+    """开启/关闭资源屏蔽，返回是否设置成功"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        urls = build_blocked_url_patterns(block_stylesheets) if enabled else []
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
+        driver.resource_blocking_stylesheets = block_stylesheets
+        return True
+    except Exception as e:
+        LogManager.get_instance().warning(f'设置资源屏蔽失败: {e}')
+        return False
+
+
+def pause_resource_blocking(driver):
+    """临时放开资源屏蔽，返回是否真的放开了（未开启屏蔽的浏览器返回 False）"""
+    block_stylesheets = getattr(driver, 'resource_blocking_stylesheets', None)
+    if not isinstance(block_stylesheets, bool):
+        return False
+    return set_resource_blocking(driver, False, block_stylesheets)
+
+
+def resume_resource_blocking(driver):
+    """恢复 pause_resource_blocking 之前的屏蔽设置"""
+    block_stylesheets = getattr(driver, 'resource_blocking_stylesheets', None)
+    if not isinstance(block_stylesheets, bool):
+        return False
+    return set_resource_blocking(driver, True, block_stylesheets)
+
+
+@contextmanager
+def resource_blocking_paused(driver):
+    """临时放开资源屏蔽（白名单），用于需要真正加载验证码图片的场景
+
+    CDP 的 setBlockedURLs 只支持黑名单，因此验证码图片需要显示或截图时，
+    在这个上下文中临时清空屏蔽列表，结束后恢复。
+    """
+    paused = pause_resource_blocking(driver)
+    try:
+        yield
+    finally:
+        if paused:
+            resume_resource_blocking(driver)
+
+
+def create_chrome_driver(headless=True, window_size='1280,900', block_resources=True):
+    """创建一个 Chrome 浏览器实例
+
+    selenium 在这里才导入，chromedriver 路径优先从本地缓存解析，
+    保证 import 本模块（以及 hof_auto_bot_main 等上层模块）时不会启动任何浏览器进程。
+
+    Args:
+        headless: 是否无头模式
+        window_size: 窗口大小，格式为 "宽,高"
+        block_resources: 是否屏蔽图片、字体、媒体（无头模式下还包括样式表）
+
+    Returns:
+        webdriver.Chrome: 浏览器实例
+    """
+    from selenium.webdriver import Chrome
+    from selenium.webdriver.chrome.service import Service
+
+    options = build_chrome_options(headless=headless, window_size=window_size)
+    start = time.time()
+    service = Service(resolve_chromedriver_path())
+    driver = Chrome(service=service, options=options)
+    if block_resources:
+        set_resource_blocking(driver, True, block_stylesheets=headless)
+    LogManager.get_instance().info(f'浏览器启动完成, headless={headless}, 耗时: {time.time() - start:.3f}s')
+    return driver
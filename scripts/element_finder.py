@@ -1,11 +1,8 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 import re
 
-def parse_html_content(content):
+def parse_html_content(content, verbose=True):
     """解析HTML内容，提取文本、属性值等"""
     text = ""
     attrs = {}
@@ -30,18 +27,31 @@ def parse_html_content(content):
         if url_match:
             attrs['target_url'] = url_match.group(1) or url_match.group(2)
     
-    print(f"解析HTML内容: 标签={tag_name}, 文本={text}, 属性={attrs}")
+    if verbose:
+        print(f"解析HTML内容: 标签={tag_name}, 文本={text}, 属性={attrs}")
     return tag_name, text, attrs
 
-def build_xpath(tag_name, text, attrs, is_container=False):
+def build_xpath(tag_name, text, attrs, is_container=False, verbose=True):
     """构建XPath表达式"""
-    conditions = []
-    
     if tag_name:
         xpath_base = f".//{tag_name}" if not is_container else f"//{tag_name}"
     else:
         xpath_base = ".//*" if not is_container else "//*"
     
+    conditions, _ = build_xpath_conditions(text, attrs)
+    if conditions:
+        xpath = f"{xpath_base}[{' and '.join(conditions)}]"
+    else:
+        xpath = xpath_base
+    
+    if verbose:
+        print(f"构建的XPath: {xpath}")
+    return xpath
+
+def build_xpath_conditions(text, attrs):
+    """构建XPath的谓词条件，返回 (保留的条件, 因为条件太多被丢掉的条件)"""
+    conditions = []
+    
     # 优先使用文本内容匹配，这通常是最可靠的
     if text:
         conditions.append(f"contains(text(),\"{text}\")")
@@ -71,99 +81,46 @@ def build_xpath(tag_name, text, attrs, is_container=False):
                 conditions.append(f"contains(@{attr},\"{value[:15]}\")")
     
     # 如果条件太多可能导致匹配过于严格，保留最重要的几个条件
+    dropped = []
     if len(conditions) > 3 and text:
         # 保留文本匹配和最多两个重要属性
         important_conditions = [c for c in conditions if 'text()' in c or 'onclick' in c or 'href' in c]
         if len(important_conditions) > 0:
+            dropped = [c for c in conditions if c not in important_conditions[:3]]
             conditions = important_conditions[:3]
     
-    if conditions:
-        xpath = f"{xpath_base}[{' and '.join(conditions)}]"
-    else:
-        xpath = xpath_base
-    
-    print(f"构建的XPath: {xpath}")
-    return xpath
+    return conditions, dropped
 
 def find_element_by_html(driver, html_content, container_html=None, timeout=10):
-    """根据HTML内容定位元素，支持递归查找所有子元素"""
+    """根据HTML内容定位元素（容器内或整个页面中第一个可见可用的元素）
+
+    定位来自预编译的定位表（tools/compile_legacy_locators.py），不再每次解析HTML片段；
+    元素没出现时按自适应的短超时轮询，timeout 只是等待上限。
+    """
+    from scripts.legacy_locator_table import LegacyLocatorTable
     try:
-        if container_html and container_html.strip():
-            print(f"\n开始查找容器元素，使用内容: {container_html}")
-            tag_name, text, attrs = parse_html_content(container_html)
-            container_xpath = build_xpath(tag_name, text, attrs, True)
-            print(f"容器查找XPath: {container_xpath}")
-            
-            try:
-                container = WebDriverWait(driver, timeout).until(
-                    EC.presence_of_element_located((By.XPATH, container_xpath))
-                )
-                print(f"找到容器元素: {container.tag_name}")
-                
-                tag_name, text, attrs = parse_html_content(html_content)
-                element_xpath = build_xpath(tag_name, text, attrs)
-                print(f"\n在容器中查找元素，使用XPath: {element_xpath}")
-                
-                elements = container.find_elements(By.XPATH, element_xpath)
-                print(f"在容器中找到 {len(elements)} 个匹配元素")
-                
-                for i, element in enumerate(elements, 1):
-                    if element.is_displayed() and element.is_enabled():
-                        print(f"找到可用元素: {element.tag_name}")
-                        return element
-                
-                print("未找到可用的元素")
-                return None
-                
-            except TimeoutException:
-                print(f"等待容器元素超时: {container_xpath}")
-                return None
-                
-        else:
-            print(f"\n直接在页面中查找元素，使用内容: {html_content}")
-            tag_name, text, attrs = parse_html_content(html_content)
-            element_xpath = build_xpath(tag_name, text, attrs, True)
-            print(f"元素查找XPath: {element_xpath}")
-            
-            try:
-                elements = driver.find_elements(By.XPATH, element_xpath)
-                print(f"在页面中找到 {len(elements)} 个匹配元素")
-                
-                if not elements and text:
-                    # 如果使用精确文本匹配没找到，尝试使用更宽松的文本匹配
-                    print("尝试使用更宽松的文本匹配方式...")
-                    loose_xpath = f"//{tag_name or '*'}[contains(text(),'{text}')]" 
-                    elements = driver.find_elements(By.XPATH, loose_xpath)
-                    print(f"宽松匹配找到 {len(elements)} 个匹配元素")
-                
-                for i, element in enumerate(elements, 1):
-                    if element.is_displayed() and element.is_enabled():
-                        print(f"找到可用元素: {element.tag_name}, 文本: {element.text}")
-                        return element
-                
-                print("未找到可用的元素")
-                return None
-                
-            except Exception as e:
-                print(f"查找元素时出错: {str(e)}")
-                return None
-                
+        return LegacyLocatorTable.get_instance().find_element(driver, html_content, container_html, timeout)
     except Exception as e:
         print(f"查找元素时出错: {str(e)}")
         return None
 
+def text_and_url_xpaths(text, url_part):
+    """find_element_by_text_and_url 依次尝试的XPath（不含最后在所有链接里手动筛选的一步）"""
+    return [
+        f"//a[contains(text(),'{text}') and contains(@onclick,'{url_part}')]",  # 文本和onclick都匹配
+        f"//a[text()='{text}' and contains(@onclick,'{url_part}')]",  # 精确文本和onclick部分匹配
+        f"//a[contains(text(),'{text}')]",  # 只匹配文本
+        f"//a[contains(@onclick,'{url_part}')]",  # 只匹配onclick部分
+        f"//p/a[contains(text(),'{text}')]",  # 考虑p标签下的a标签
+        f"//p//a[contains(text(),'{text}')]",  # 考虑p标签下的任何层级的a标签
+        f"//div//a[contains(text(),'{text}')]",  # 考虑div标签下的任何层级的a标签
+    ]
+
 def find_element_by_text_and_url(driver, text, url_part):
     """直接使用文本内容和URL部分查找元素，这是一种更简单但可能更可靠的方法"""
     try:
         # 尝试多种XPath策略
-        xpaths = [
-            f"//a[contains(text(),'{text}') and contains(@onclick,'{url_part}')]",  # 文本和onclick都匹配
-            f"//a[text()='{text}' and contains(@onclick,'{url_part}')]",  # 精确文本和onclick部分匹配
-            f"//a[contains(text(),'{text}')]",  # 只匹配文本
-            f"//a[contains(@onclick,'{url_part}')]",  # 只匹配onclick部分
-            f"//p/a[contains(text(),'{text}')]",  # 考虑p标签下的a标签
-            f"//p//a[contains(text(),'{text}')]",  # 考虑p标签下的任何层级的a标签
-            f"//div//a[contains(text(),'{text}')]",  # 考虑div标签下的任何层级的a标签
+        xpaths = text_and_url_xpaths(text, url_part) + [
             f"//a",  # 找出所有链接，然后在代码中筛选
         ]
         
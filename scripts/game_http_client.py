@@ -0,0 +1,143 @@
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from scripts.log_manager import LogManager
+
+
+class GameHttpError(Exception):
+    """HTTP 方式获取游戏页面失败（网络错误、非 200、会话失效等），调用方应回退到浏览器
+
+    is_sent: 请求可能已经被服务器处理了（连接建立之后才出错）。提交战斗的 POST 在这种情况下不能再提交，
+    只有连接都没建立、或者服务器返回登录页（没有按已登录处理）时为 False
+    """
+
+    def __init__(self, message, is_sent=True):
+        super().__init__(message)
+        self.is_sent = is_sent
+
+
+class GameHttpClient:
+    """直接用 HTTP 读取游戏页面的客户端
+
+    登录仍然在浏览器里完成，这里借用浏览器的 cookie 和 User-Agent，
+    通过 keep-alive 的 requests.Session 读取只读页面（例如冒险页），
+    不需要浏览器导航、等待渲染、再通过 WebDriver 传回整页源码。
+    服务器下发的新 cookie 会同步回浏览器，浏览器重新登录后会话失效时再从浏览器同步一次。
+    """
+
+    LOGIN_PAGE_MARKERS = ('captchaImage', 'name="Login"')
+    # 轮询用的快速读取：最多重试一次、间隔很短，失败马上交给浏览器，不在每次轮询里等完整的退避重试
+    QUICK_ATTEMPTS = 2
+    QUICK_RETRY_BACKOFF_SEC = 0.2
+
+    def __init__(self, driver, base_url, timeout=5.0, retry_max=3, retry_backoff=1.0):
+        self.driver = driver
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.timeout = timeout
+        self.retry_max = max(1, int(retry_max))
+        self.retry_backoff = retry_backoff
+        self.logger = LogManager.get_instance()
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.is_cookies_synced = False
+
+    @classmethod
+    def from_server_data(cls, driver, server_data):
+        """根据 server_address.json 中的服务器配置创建客户端"""
+        return cls(
+            driver,
+            server_data['url'],
+            timeout=float(server_data.get('http_timeout_sec', 5.0)),
+            retry_max=int(server_data.get('http_retry_max', 3)),
+            retry_backoff=float(server_data.get('http_retry_backoff_sec', 1.0)),
+        )
+
+    def sync_cookies_from_driver(self):
+        """把浏览器当前的 cookie 和 User-Agent 复制到 HTTP 会话"""
+        self.session.cookies.clear()
+        for c in self.driver.get_cookies():
+            self.session.cookies.set(c.get('name'), c.get('value'), domain=c.get('domain'), path=c.get('path') or '/')
+        try:
+            user_agent = self.driver.execute_script('return navigator.userAgent')
+            if user_agent:
+                self.session.headers['User-Agent'] = user_agent
+        except Exception:
+            pass
+        self.is_cookies_synced = True
+
+    def _push_cookies_to_driver(self, response):
+        """服务器在 HTTP 会话里更新了 cookie 时，同步回浏览器，避免两边会话不一致"""
+        if not response.cookies:
+            return
+        browser_cookies = {c.get('name'): c.get('value') for c in self.driver.get_cookies()}
+        for cookie in response.cookies:
+            if browser_cookies.get(cookie.name) == cookie.value:
+                continue
+            try:
+                self.driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'path': cookie.path or '/'})
+            except Exception as e:
+                self.logger.warning(f'同步 cookie {cookie.name} 到浏览器失败: {e}')
+
+    def is_login_page(self, html):
+        return all(marker in html for marker in self.LOGIN_PAGE_MARKERS)
+
+    @staticmethod
+    def _is_connect_failure(exc):
+        """连接都没有建立（连不上、DNS 失败、连接超时），请求肯定没有发到服务器"""
+        if isinstance(exc, requests.ConnectTimeout):
+            return True
+        if isinstance(exc, requests.ConnectionError) and exc.args:
+            return isinstance(getattr(exc.args[0], 'reason', None), NewConnectionError)
+        return False
+
+    def _request(self, method, path, attempts=None, backoff=None, **kwargs):
+        url = path if path.startswith('http') else self.base_url + path
+        attempts = attempts or self.retry_max
+        backoff = self.retry_backoff if backoff is None else backoff
+        last_exc = None
+        for attempt in range(1, attempts + 1):
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                if response.status_code != 200:
+                    raise GameHttpError(f'{method} {url} 返回 {response.status_code}')
+                response.encoding = 'utf-8'
+                return response
+            except (requests.RequestException, GameHttpError) as e:
+                last_exc = e
+                self.logger.warning(f'HTTP 请求失败({attempt}/{attempts}): {e}')
+                if attempt < attempts:
+                    time.sleep(backoff * attempt)
+        raise GameHttpError(str(last_exc), is_sent=not self._is_connect_failure(last_exc))
+
+    def _fetch(self, method, path, **kwargs):
+        """发送请求并返回页面 HTML，会话失效时从浏览器重新同步 cookie 再试一次，仍是登录页则抛出 GameHttpError"""
+        if not self.is_cookies_synced:
+            self.sync_cookies_from_driver()
+        # URL 中的 # 片段只对浏览器有意义
+        path = path.split('#', 1)[0]
+        response = self._request(method, path, **kwargs)
+        if self.is_login_page(response.text):
+            self.sync_cookies_from_driver()
+            response = self._request(method, path, **kwargs)
+            if self.is_login_page(response.text):
+                raise GameHttpError('会话已失效，返回了登录页', is_sent=False)
+        self._push_cookies_to_driver(response)
+        return response.text
+
+    def get_page(self, path, is_quick=False):
+        """读取页面 HTML；is_quick 时最多快速重试一次（调用方有浏览器可以回退）"""
+        if is_quick:
+            return self._fetch('GET', path, attempts=self.QUICK_ATTEMPTS, backoff=self.QUICK_RETRY_BACKOFF_SEC)
+        return self._fetch('GET', path)
+
+    def post_form(self, path, data):
+        """提交表单并返回结果页 HTML，data 为 [(name, value)] 列表（允许重名字段）
+
+        战斗类表单重复提交会多打一场，所以只发一次，不做失败重试
+        """
+        return self._fetch('POST', path, attempts=1, data=data)
+
+    def close(self):
+        self.session.close()
@@ -4,7 +4,6 @@ from datetime import datetime, timedelta
 import time
 import json
 from scripts.actions.factory import ActionExecutorFactory
-from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from scripts.advanced_action_executor import AdvancedActionExecutor, AdvancedActionManager
@@ -15,6 +14,13 @@ from scripts.auto_bot_config_manager import AutoBotConfigManager
 from scripts.boss_battle_manager import BossBattleManager
 from scripts.captcha_recognizer import recognize_captcha
 from scripts.account_config_reader import get_account_config
+from scripts.driver_pool import DriverPool, PooledDriver
+from scripts.game_http_client import GameHttpClient, GameHttpError
+from scripts.timer_wheel import TimerWheel
+from scripts.hunt_page_parser import HuntSnapshot, parse_hunt_page
+from scripts.page_extractors import extract_hunt_snapshot, extract_pvp_ranking
+from scripts.hunt_snapshot_cache import HuntSnapshotCache
+from scripts.vip_spawn_scheduler import VipSpawnScheduler
 
 from scripts.states.state_factory import StateFactory
 
@@ -32,8 +38,14 @@ from scripts.states.state_factory import StateFactory
 import os
 
 class HofAutoBot:
-    def __init__(self):
-        """构造函数"""
+    def __init__(self, scheduler=None):
+        """构造函数
+
+        Args:
+            scheduler: 发呆用的时间轮，多个 Bot 在同一线程里运行时共用一个
+        """
+        self.scheduler = scheduler or TimerWheel()
+        self.driver = None
         self.current_state_str = None
         self.server_config_manager = None
         self.auto_bot_config_manager = None
@@ -41,36 +53,59 @@ class HofAutoBot:
         self.is_finished = False
         self.status_update_signal = None
 
-        self.challenge_next_cooldown = 0
-        self.player_stamina = 0
+        self.hunt_snapshot = HuntSnapshot()
+        self.hunt_snapshot_cache = HuntSnapshotCache()
+        self.hunt_page_load_count = 0
         self.waiting_vip_boss_time = 0
 
         self.next_vip_boss_spawn_timestamp = 0
         self.next_vip_boss_id = 0
         self.is_waiting_for_vip_boss = False
+        self.vip_spawn_scheduler = VipSpawnScheduler(self.scheduler)
         
         self.logger = LogManager.get_instance()
         self.directly_challenge_boss_id = None
         self.directly_challenge_boss_action = None
         self.boss_battle_manager = None
+        self.http_client = None
+        self.last_hunt_page_html = None
 
         from scripts.states.base_state import BaseState
         self.current_state = BaseState(self)
 
     COOLDOWN_SECONDS_FOR_CHALLENGE_BOSS = 1200
 
+    @property
+    def player_stamina(self):
+        """最近一次冒险页上的体力值（没读到时为 0）"""
+        return self.hunt_snapshot.stamina or 0
+
+    @property
+    def challenge_next_cooldown(self):
+        """最近一次冒险页上的boss挑战冷却秒数"""
+        return self.hunt_snapshot.cooldown_seconds
+
+    @property
+    def all_alived_boss_ids(self):
+        return self.hunt_snapshot.alive_boss_ids
+
     def set_next_vip_boss_spawn_timestamp(self, vip_boss_id, timestamp):
         self.next_vip_boss_spawn_timestamp = timestamp
         print(f"fffffff {self.next_vip_boss_spawn_timestamp}")
         self.next_vip_boss_id = vip_boss_id
         self.is_waiting_for_vip_boss = True
+        # 正在发呆的话，最晚在 VIP 刷新时醒来
+        self.current_state.wake_up(after=max(0.0, timestamp / 1000000 - time.time()))
 
     def reset_waiting_vip_boss_spawn_info(self):
         self.next_vip_boss_spawn_timestamp = -1
         self.next_vip_boss_id = -1
         self.is_waiting_for_vip_boss = False
+        self.vip_spawn_scheduler.disarm()
 
     def switch_to_next_state(self, state):
+        if self.current_state is not state:
+            self.current_state.cancel()
         self.current_state = state
         self.current_state_str = state.__class__.__name__
 
@@ -79,11 +114,38 @@ class HofAutoBot:
             if self.is_finished:
                 return
             self.run_once()
-            
+            self.wait_for_timers()
+
+    async def run_async(self, runtime):
+        """在 AsyncBotRuntime 的事件循环里运行，多个 Bot 可以共用一个事件循环"""
+        await runtime.run_bot(self)
+
+    @staticmethod
+    def run_many(bots):
+        """在同一个线程里轮流运行多个 Bot，它们需要共用同一个时间轮（构造时传入同一个 scheduler）"""
+        scheduler = bots[0].scheduler
+        while any(not bot.is_finished for bot in bots):
+            for bot in bots:
+                bot.run_once()
+            if all(bot.is_finished or bot.current_state.is_waiting() for bot in bots):
+                scheduler.wait()
+            else:
+                scheduler.advance()
+
+    def wait_for_timers(self, max_wait=None):
+        """当前状态在发呆时睡到到期（或被 cleanup/wakeup 唤醒），否则只触发已到期的任务"""
+        if self.current_state is not None and self.current_state.is_waiting():
+            self.scheduler.wait(max_wait)
+        else:
+            self.scheduler.advance()
+
     def run_once(self):
         """执行一次状态处理，支持暂停/恢复功能"""
         if self.is_finished:
             return
+        if self.current_state is not None and self.current_state.is_waiting():
+            # 发呆中，到期前不需要碰浏览器
+            return
         if self._is_on_login_page():
             self.logger.info("检测到登录页，进入断线重连状态")
             self.switch_to_next_state(StateFactory.create_reconnect_state(self))
@@ -102,35 +164,90 @@ class HofAutoBot:
 
     def _check_is_user_pvp_first_rank(self):
         """检查当前用户是否为PVP第一名"""
+        ranking = extract_pvp_ranking(self.driver)
+        current_user = ranking['current_user']
+        first_place_user = ranking['first_place_user']
+        if current_user and first_place_user:
+            is_first = current_user == first_place_user
+            print(f"用户是否为第一名: {is_first} (当前用户: '{current_user}', 第一名: '{first_place_user}')")
+            return is_first
+        # 页面结构和预期不一致时，退回到完整源码 + 正则的方式
         return self.battle_watcher_manager.is_user_pvp_first_place(self.driver.page_source)
 
-    def _update_info_from_hunt_page(self):
+    def _get_http_client(self):
+        if self.http_client is None:
+            self.http_client = GameHttpClient.from_server_data(self.driver, self.server_config_manager.current_server_data)
+        return self.http_client
+
+    def _fetch_hunt_snapshot_by_browser(self, hunt_url):
+        """浏览器方式读取冒险页（HTTP 失败时的回退），会让浏览器停在冒险页
+
+        只在页面里用 JS 提取需要的字段，提取失败才传回整个 page_source 解析
+        """
+        driver = self.driver
+        # 检查当前URL是否与目标URL相同，如果相同则刷新页面，否则导航到目标URL
+        current_url = driver.current_url
+        if current_url == hunt_url or hunt_url in current_url:
+            driver.refresh()
+        else:
+            driver.get(hunt_url)
+        # 等待页面加载
+        wait = WebDriverWait(driver, 10)
+        wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
+        snapshot = extract_hunt_snapshot(driver)
+        if snapshot is None:
+            snapshot = parse_hunt_page(driver.page_source)
+        return snapshot
+
+    def invalidate_hunt_snapshot(self, *args):
+        """执行过动作后冒险页的内容可能变了，下一次 _update_info_from_hunt_page 重新读取"""
+        self.hunt_snapshot_cache.invalidate()
+
+    def _update_info_from_hunt_page(self, force=False):
+        """刷新冒险页信息到 self.hunt_snapshot
+
+        Args:
+            force: 为 True 时忽略缓存，一定重新读取页面
+        """
+        config = self.auto_bot_config_manager
+        cached = None if force else self.hunt_snapshot_cache.get(
+            config.hunt_snapshot_max_age_seconds, config.recover_stamina_per_hour, config.max_stamnia_limit)
+        if cached is not None:
+            self.hunt_snapshot = cached
+            self.logger.info(f'使用{cached.age_seconds:.0f}秒前的冒险页信息，推算体力：{cached.stamina}，冷却：{cached.cooldown_seconds}秒')
+            self._emit_status()
+            return
+
         self.logger.info(f'{self.server_config_manager.current_server_data["name"]} 开始更新boss信息')
         current_server_data = self.server_config_manager.current_server_data
         hunt_url = f'{current_server_data["url"]}{current_server_data["hunt_page"]}'
         #<a href="#" onclick="RA_UseBack('index2.php?hunt')">冒險</a>
         print(f"hunt_url = {hunt_url}")
-        driver = self.driver
         try:
-            # 检查当前URL是否与目标URL相同，如果相同则刷新页面，否则导航到目标URL
-            current_url = driver.current_url
-            if current_url == hunt_url or hunt_url in current_url:
-                driver.refresh()
-            else:
-                driver.get(hunt_url)
-            # 等待页面加载
-            wait = WebDriverWait(driver, 10)
-            wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
-            # 更新boss信息
-            self.battle_watcher_manager.update_all_from_hunt_page(driver.page_source)
-            self.all_alived_boss_ids = self.battle_watcher_manager.get_all_alive_boss()
-            self.challenge_next_cooldown = self.battle_watcher_manager.get_player_challenge_boss_cooldown()
+            # 只读数据直接走 HTTP，一次往返即可；失败（包括会话失效）时最多快速重试一次就回退到浏览器
+            try:
+                html = self._get_http_client().get_page(current_server_data["hunt_page"], is_quick=True)
+                self.last_hunt_page_html = html
+                # 更新boss信息
+                self.hunt_snapshot = self.battle_watcher_manager.update_all_from_hunt_page(html)
+            except GameHttpError as e:
+                self.logger.warning(f'HTTP 获取冒险页失败，改用浏览器: {e}')
+                # 浏览器停在冒险页上，需要源码的地方直接查页面
+                self.last_hunt_page_html = None
+                snapshot = self._fetch_hunt_snapshot_by_browser(hunt_url)
+                self.hunt_snapshot = self.battle_watcher_manager.update_from_snapshot(snapshot)
+            self.hunt_snapshot_cache.update(self.hunt_snapshot)
+            self.hunt_page_load_count += 1
             print(f"self.challenge_next_cooldown = {self.challenge_next_cooldown}")
-            self.player_stamina = self.battle_watcher_manager.get_player_stamina()
 
         except Exception as e:
             self.logger.error(f'{self.server_config_manager.current_server_data["name"]} 获取boss信息失败: {e}')
 
+        self._emit_status()
+
+        self.logger.info(f'{self.server_config_manager.current_server_data["name"]} 更新boss信息完毕')
+
+    def _emit_status(self):
         # 发送状态更新信号
         if self.status_update_signal:
             status_info = {
@@ -140,13 +257,11 @@ class HofAutoBot:
             }
             self.status_update_signal.emit(status_info)
 
-        self.logger.info(f'{self.server_config_manager.current_server_data["name"]} 更新boss信息完毕')
-
     def _get_recover_stamina_time(self, current_stamina, need_stamnia):
         """获取恢复体力的时间"""
         stamina_diff = need_stamnia - current_stamina
-        recover_stamnia_per_second = 1000 / 3600
-        recover_time = stamina_diff * recover_stamnia_per_second
+        recover_stamnia_per_second = self.auto_bot_config_manager.recover_stamina_per_hour / 3600
+        recover_time = stamina_diff / recover_stamnia_per_second
         return recover_time
 
    
@@ -226,17 +341,29 @@ class HofAutoBot:
 
     def cleanup(self):
         self.is_finished = True
-        """释放 Bot 持有的资源"""
+        if self.current_state is not None:
+            self.current_state.cancel()
+        self.vip_spawn_scheduler.disarm()
+        self.scheduler.wakeup()
+        """释放 Bot 持有的资源，池中借出的浏览器归还给池而不是直接关闭"""
         if self.driver:
             try:
-                self.driver.quit()
+                if isinstance(self.driver, PooledDriver):
+                    self.driver.release()
+                else:
+                    self.driver.quit()
             except Exception as e:
                 self.logger.error(f"释放 Bot 的浏览器实例时出错: {e}")
             finally:
                 self.driver = None
+        if self.http_client:
+            self.http_client.close()
+            self.http_client = None
     def initialize_with_driver(self, server_id, driver):
         """初始化自动战斗"""
         self.driver = driver
+        self.http_client = None
+        self.hunt_snapshot_cache.invalidate()
         self.server_config_manager = ServerConfigManager()
         self.server_config_manager.set_current_server_id(server_id)
         current_server_data = self.server_config_manager.current_server_data
@@ -247,16 +374,20 @@ class HofAutoBot:
 
         self.auto_bot_config_manager = AutoBotConfigManager(auto_bot_config_path)
         self.battle_watcher_manager = BattleWatcherManager()
+        self.battle_watcher_manager.set_server_data(current_server_data)
         self.action_manager = AdvancedActionManager()
         self.boss_battle_manager = BossBattleManager()
         self.boss_battle_manager.set_server_id(server_id)
         log_path = os.path.join(os.path.dirname(__file__), '..', 'logs', f'log_server_{current_server_data.get("id")}.txt')
         print(log_path)
-        self.logger.set_log_path(log_path)
+        # 每个 Bot 用自己服务器的日志文件，同一进程里运行多个 Bot（run_many / AsyncBotRuntime）时不会互相覆盖
+        self.logger = LogManager.for_path(log_path)
 
         if not self.driver:
              # 初始化浏览器
-            self.driver = webdriver.Chrome()
+            self.driver = DriverPool.get_instance(headless=False).acquire()
+        self.action_manager.set_http_client(self._get_http_client())
+        self.action_manager.add_action_listener(self.invalidate_hunt_snapshot)
 
         # 检查当前URL是否与目标URL相同，如果相同则刷新页面，否则导航到目标URL
         current_url = self.driver.current_url
@@ -281,6 +412,8 @@ class HofAutoBot:
             self.boss_battle_manager.set_server_id(self.server_config_manager.current_server_data.get("id", 1))
         if self.battle_watcher_manager:
             pass
+        # 发呆时间来自配置，重新加载后立刻按新配置重新决策
+        self.current_state.wake_up()
     def _initialize_from_command_line(self):
         """等待登录"""
         # 初始化服务器配置管理器
@@ -324,7 +457,7 @@ class HofAutoBot:
         print('即将打开浏览器，待登录成功后按y继续')
         
         # 初始化浏览器
-        self.driver = webdriver.Chrome()
+        self.driver = DriverPool.get_instance(headless=False).acquire()
         # 这里是初始化浏览器，直接使用get方法即可
         self.driver.get(url)
         print('正在打开浏览器...')
@@ -346,9 +479,12 @@ class HofAutoBot:
 
         self.auto_bot_config_manager = AutoBotConfigManager(auto_bot_config_path)
         self.battle_watcher_manager = BattleWatcherManager()
+        self.battle_watcher_manager.set_server_data(current_server_data)
         self.action_manager = AdvancedActionManager()
         self.boss_battle_manager = BossBattleManager()
         self.boss_battle_manager.set_server_id(selected_server_id)
+        self.action_manager.set_http_client(self._get_http_client())
+        self.action_manager.add_action_listener(self.invalidate_hunt_snapshot)
         self.current_state = StateFactory.create_prepare_boss_state(self)
         return True
 
@@ -0,0 +1,198 @@
+import re
+import time
+import logging
+from html.parser import HTMLParser
+from scripts.game_http_client import GameHttpError
+from scripts.log_manager import LogManager
+
+# submit() / execute() 的结果
+# 没有提交出去（无法用 HTTP 表达、读取表单失败、连接没有建立），调用方可以回退到浏览器
+NOT_SENT = 'not_sent'
+# 已提交，返回了战斗结果页
+CONFIRMED = 'confirmed'
+# 已提交（或可能已提交），但没有确认到战斗结果（错误页、没有结果标记、提交后出错）；
+# 重复提交会多打一场，调用方不能再提交，应刷新冒险页确认结果
+UNCONFIRMED = 'unconfirmed'
+
+
+class _FormParser(HTMLParser):
+    """收集页面中所有 form 的 action 和字段，只处理提交战斗需要的 input/select"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms = []
+        self._form = None
+        self._select = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'form':
+            self._form = {'action': attrs.get('action') or '', 'fields': [], 'submits': {}}
+            self.forms.append(self._form)
+        elif self._form is None:
+            return
+        elif tag == 'input':
+            name = attrs.get('name')
+            if not name:
+                return
+            input_type = (attrs.get('type') or 'text').lower()
+            value = attrs.get('value') or ''
+            if input_type == 'submit':
+                self._form['submits'][name] = value
+            elif input_type in ('checkbox', 'radio'):
+                # 角色勾选由动作组决定，页面上原来勾选的角色（上次的队伍）不带上
+                if 'checked' in attrs and not name.startswith('char_'):
+                    self._form['fields'].append((name, value or 'on'))
+            elif input_type != 'button':
+                self._form['fields'].append((name, value))
+        elif tag == 'select' and attrs.get('name'):
+            self._select = {'name': attrs['name'], 'first': None, 'selected': None}
+        elif tag == 'option' and self._select is not None:
+            value = attrs.get('value') or ''
+            if self._select['first'] is None:
+                self._select['first'] = value
+            if 'selected' in attrs:
+                self._select['selected'] = value
+
+    def handle_endtag(self, tag):
+        if tag == 'select' and self._select is not None:
+            if self._form is not None:
+                value = self._select['selected'] if self._select['selected'] is not None else self._select['first']
+                self._form['fields'].append((self._select['name'], value or ''))
+            self._select = None
+        elif tag == 'form':
+            self._form = None
+
+
+# 战斗结果页的标记：页面脚本 Battle_Result_Load / Map_Battle_Result 操作的 .battle_result 区块和 #MAP_BATTLE_PROCESS
+_BATTLE_RESULT_PATTERN = re.compile(r'''class=["'][^"']*\bbattle_result\b|id=["']MAP_BATTLE_PROCESS["']''')
+# 没打成时（boss 已被击杀、冷却中、等级超限等）服务器返回 <div class="error ...">原因</div>
+_ERROR_PATTERN = re.compile(r'''<div class=["']error[^"']*["']>(.*?)</div>''', re.DOTALL)
+
+
+def check_battle_result(html):
+    """判断提交后返回的是不是战斗结果页，返回 (是否打成, 没打成的原因)"""
+    error_match = _ERROR_PATTERN.search(html)
+    if error_match:
+        return False, error_match.group(1).strip()
+    if _BATTLE_RESULT_PATTERN.search(html):
+        return True, None
+    return False, '返回的页面中没有战斗结果'
+
+
+def find_battle_form(html, battle_button_name):
+    """在页面中找到包含指定战斗按钮（submit 或同名 hidden 字段）的表单"""
+    parser = _FormParser()
+    parser.feed(html)
+    for form in parser.forms:
+        if battle_button_name in form['submits'] or any(name == battle_button_name for name, _ in form['fields']):
+            return form
+    return None
+
+
+class HttpActionEngine:
+    """不经过浏览器、直接用 HTTP 提交战斗表单的动作执行引擎
+
+    动作组最终都是一次表单 POST：清队、勾选 char_* 复选框、按下 union_battle/monster_battle 等按钮。
+    这里先 GET 一次表单所在页面，取得表单 action 和隐藏字段，再按动作组里的角色和按钮直接 POST。
+    只有在动作组配置了 "executor": "http" 时才会使用，任何意外情况都返回 False，由调用方回退到浏览器执行。
+    """
+
+    EXECUTOR_NAME = 'http'
+    SUPPORTED_TRIGGER_TYPES = {
+        'click_main_menu',
+        'click_main_menu_for_town',
+        'click_sub_menu_stage',
+        'click_sub_menu_boss',
+        'click_button_clear_team',
+        'check_box_select_character',
+        'click_button_start_battle',
+    }
+
+    def __init__(self, http_client):
+        self.http_client = http_client
+        self.logger = LogManager.get_instance()
+
+    def is_enabled_for(self, action_group):
+        return action_group.get('executor') == self.EXECUTOR_NAME
+
+    def build_plan(self, action_group, form_target=None):
+        """把动作组转换成 (表单页面, 勾选的角色, 战斗按钮)，动作组无法用 HTTP 表达时返回 None"""
+        actions = action_group.get('actions', [])
+        if not actions or actions[-1]['trigger_type'] != 'click_button_start_battle':
+            return None
+        char_ids = []
+        for action in actions:
+            trigger_type = action['trigger_type']
+            if trigger_type not in self.SUPPORTED_TRIGGER_TYPES:
+                return None
+            if trigger_type in ('click_sub_menu_stage', 'click_sub_menu_boss'):
+                form_target = action['value']
+            elif trigger_type == 'click_button_clear_team':
+                char_ids = []
+            elif trigger_type == 'check_box_select_character' and action['value'] not in char_ids:
+                char_ids.append(action['value'])
+        if not form_target:
+            return None
+        return f'index2.php?{form_target}', char_ids, actions[-1]['value']
+
+    def prepare(self, action_group, form_target=None):
+        """读取表单页并组好要提交的数据，返回 (提交地址, 表单数据)，无法用 HTTP 表达或读取失败返回 None
+
+        只读不写，可以在冷却结束前调用（预先布置），冷却结束时用 submit() 提交
+        """
+        plan = self.build_plan(action_group, form_target)
+        if plan is None:
+            self.logger.info(f'动作组 {action_group.get("name")} 无法转换为 HTTP 表单提交')
+            return None
+        page, char_ids, battle_button_name = plan
+        try:
+            form = find_battle_form(self.http_client.get_page(page), battle_button_name)
+        except GameHttpError as e:
+            self.logger.warning(f'HTTP 读取动作组 {action_group.get("name")} 的表单失败: {e}')
+            return None
+        if form is None:
+            self.logger.warning(f'{page} 中未找到包含 {battle_button_name} 的表单')
+            return None
+        data = list(form['fields'])
+        data.extend((char_id, '1') for char_id in char_ids)
+        if battle_button_name in form['submits']:
+            data.append((battle_button_name, form['submits'][battle_button_name]))
+        return form['action'] or page, data
+
+    def submit(self, prepared):
+        """提交 prepare() 组好的表单，返回 NOT_SENT / CONFIRMED / UNCONFIRMED
+
+        只有确定没有提交出去时返回 NOT_SENT；POST 发出去之后无论返回什么都不能再提交
+        """
+        path, data = prepared
+        try:
+            html = self.http_client.post_form(path, data)
+        except GameHttpError as e:
+            if not e.is_sent:
+                self.logger.warning(f'HTTP 提交 {path} 失败，没有提交出去: {e}')
+                return NOT_SENT
+            self.logger.warning(f'HTTP 提交 {path} 后出错，可能已经提交，不再重复提交: {e}')
+            return UNCONFIRMED
+        is_fought, reason = check_battle_result(html)
+        if not is_fought:
+            self.logger.warning(f'HTTP 提交 {path} 后没有确认到战斗结果，不再重复提交: {reason}')
+            return UNCONFIRMED
+        return CONFIRMED
+
+    def execute(self, action_group, form_target=None):
+        """用 HTTP 执行动作组，返回 NOT_SENT / CONFIRMED / UNCONFIRMED（见 submit）
+
+        Args:
+            action_group: action_config_advanced.json 中的动作组
+            form_target: 表单所在页面，例如 "union=7"；动作组里有 click_sub_menu_* 时以动作组为准
+        """
+        start = time.time()
+        prepared = self.prepare(action_group, form_target)
+        if prepared is None:
+            return NOT_SENT
+        t1 = time.time()
+        result = self.submit(prepared)
+        t2 = time.time()
+        logging.info(f"[性能日志] HTTP 动作组: {action_group.get('name')}, 读取表单={t1-start:.3f}s, 提交={t2-t1:.3f}s, 结果={result}")
+        return result
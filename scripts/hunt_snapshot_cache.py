@@ -0,0 +1,36 @@
+import time
+from typing import Optional
+from scripts.hunt_page_parser import HuntSnapshot
+
+
+class HuntSnapshotCache:
+    """冒险页快照缓存
+
+    一轮状态切换里 PrepareBoss -> NormalBoss、PrepareStage -> NormalStage 都会各自刷一次冒险页，
+    而两次之间什么都没做，页面内容只差几秒的体力恢复和冷却流逝。
+    缓存最近一次的快照，在 max_age_seconds 以内直接按恢复速度推算当前的体力和冷却；
+    打过仗（执行过动作）之后体力、冷却、存活boss都可能变了，调用 invalidate() 让下一次重新抓取。
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._snapshot = None
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def update(self, snapshot: HuntSnapshot):
+        # 没读到体力说明拿到的不是正常的冒险页（未登录等），不缓存
+        self._snapshot = snapshot if snapshot.stamina is not None else None
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def get(self, max_age_seconds, recover_stamina_per_hour, max_stamina) -> Optional[HuntSnapshot]:
+        """返回推算到当前时刻的快照；没有缓存、已失效或超过 max_age_seconds 时返回 None"""
+        snapshot = self._snapshot
+        now = self.clock()
+        if snapshot is None or max_age_seconds <= 0 or now - snapshot.fetched_at > max_age_seconds:
+            self.miss_count += 1
+            return None
+        self.hit_count += 1
+        return snapshot.extrapolate(now, recover_stamina_per_hour, max_stamina)
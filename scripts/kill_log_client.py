@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from scripts.log_manager import LogManager
+
+
+class KillLogError(Exception):
+    """读取击杀日志（?ulog）失败"""
+
+
+class KillLogClient:
+    """击杀日志（?ulog）的 HTTP 客户端，每个日志地址一个实例，进程内共享
+
+    - keep-alive 的 requests.Session，不用每次查询都重新握手
+    - 带 If-None-Match / If-Modified-Since 的条件请求，日志没变时服务器返回 304，不再传输整页
+    - 失败重试的次数、超时、退避来自 server_address.json，退避时间加随机抖动，避免多个 Bot 同时重试
+    - 日志内容缓存 cache_ttl_sec 秒，同一轮里查询多个 VIP boss 只请求一次；
+      version 在内容变化（200）时加一，调用方据此判断是否需要重新建索引
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, url, timeout=5.0, retry_max=3, retry_backoff=1.0, cache_ttl_sec=15.0,
+                 clock=time.monotonic, session=None):
+        self.url = url
+        self.timeout = timeout
+        self.retry_max = max(1, int(retry_max))
+        self.retry_backoff = retry_backoff
+        self.cache_ttl_sec = cache_ttl_sec
+        self.clock = clock
+        self.logger = LogManager.get_instance()
+        self.session = session or requests.Session()
+        if session is None:
+            self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._lock = threading.Lock()
+        self._etag = None
+        self._last_modified = None
+        self._text = None
+        self._fetched_at = None
+        self.version = 0
+
+    @classmethod
+    def get_instance(cls, url, server_data=None):
+        """获取 url 对应的共享客户端，server_data 中的 http_* 配置会覆盖当前设置"""
+        with cls._instances_lock:
+            client = cls._instances.get(url)
+            if client is None:
+                client = cls(url)
+                cls._instances[url] = client
+        if server_data:
+            client.timeout = float(server_data.get('http_timeout_sec', client.timeout))
+            client.retry_max = max(1, int(server_data.get('http_retry_max', client.retry_max)))
+            client.retry_backoff = float(server_data.get('http_retry_backoff_sec', client.retry_backoff))
+            client.cache_ttl_sec = float(server_data.get('kill_log_cache_ttl_sec', client.cache_ttl_sec))
+        return client
+
+    def _backoff_seconds(self, attempt):
+        return self.retry_backoff * attempt * random.uniform(0.5, 1.5)
+
+    def _request(self):
+        headers = {}
+        if self._etag:
+            headers['If-None-Match'] = self._etag
+        if self._last_modified:
+            headers['If-Modified-Since'] = self._last_modified
+        last_exc = None
+        for attempt in range(1, self.retry_max + 1):
+            try:
+                response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+                if response.status_code not in (200, 304):
+                    raise KillLogError(f'GET {self.url} 返回 {response.status_code}')
+                return response
+            except (requests.RequestException, KillLogError) as e:
+                last_exc = e
+                self.logger.warning(f'获取战斗日志失败({attempt}/{self.retry_max}): {e}')
+                if attempt < self.retry_max:
+                    time.sleep(self._backoff_seconds(attempt))
+        raise KillLogError(str(last_exc))
+
+    def _is_cache_fresh(self):
+        return self._fetched_at is not None and self.clock() - self._fetched_at < self.cache_ttl_sec
+
+    def get_text(self, force=False):
+        """返回日志页面（最新的记录在前），缓存未过期时不发请求"""
+        with self._lock:
+            if not force and self._is_cache_fresh():
+                return self._text
+            response = self._request()
+            if response.status_code == 304 and self._text is not None:
+                self.logger.debug('战斗日志没有变化(304)')
+            else:
+                response.encoding = 'utf-8'
+                self._text = response.text
+                self._etag = response.headers.get('ETag')
+                self._last_modified = response.headers.get('Last-Modified')
+                self.version += 1
+            self._fetched_at = self.clock()
+            return self._text
+
+    def invalidate(self):
+        """下一次 get_text 一定发请求（条件请求仍然有效）"""
+        with self._lock:
+            self._fetched_at = None
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,71 @@
+import re
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+_ULOG_PATTERN = re.compile(r'ulog=(\d+)')
+
+
+class KillLogIndex:
+    """击杀日志（?ulog）的索引：{union_id: 最近一条记录的16位 ulog 时间戳}
+
+    日志是新的在前，每条记录以 ulog=<16位时间戳> 开头，后面跟着 "xxx vs boss名"。
+    update() 从头往后扫一遍，每条记录用所有 boss 名拼成的一个正则判断是哪只 boss；
+    碰到已经见过的（不比上次最新的 ulog 新）记录就停下，所以日志不变或只多了几条时，
+    再次 update 只处理新增的那几条。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest_by_union_id: Dict[int, str] = {}
+        self._newest_ulog = 0
+        self._boss_names: Tuple[Tuple[str, int], ...] = ()
+        self._name_pattern = None
+        self._union_id_by_name: Dict[str, int] = {}
+
+    def set_bosses(self, bosses: Iterable[dict]):
+        """设置需要识别的 boss（boss_config.json 中的 boss_list），boss 列表变化后已有索引作废"""
+        boss_names = tuple(sorted((boss['name'], boss['union_id']) for boss in bosses if boss.get('name')))
+        with self._lock:
+            if boss_names == self._boss_names:
+                return
+            self._boss_names = boss_names
+            self._union_id_by_name = dict(boss_names)
+            # 长的名字优先，避免一个 boss 名是另一个的前缀时匹配到短的
+            names = sorted(self._union_id_by_name, key=len, reverse=True)
+            self._name_pattern = re.compile('|'.join(re.escape(name) for name in names)) if names else None
+            self._latest_by_union_id = {}
+            self._newest_ulog = 0
+
+    def update(self, log_text: str) -> int:
+        """把日志中比上次更新的记录加入索引，返回本次处理的记录数"""
+        with self._lock:
+            if self._name_pattern is None:
+                return 0
+            matches = _ULOG_PATTERN.finditer(log_text)
+            current = next(matches, None)
+            newest_ulog = self._newest_ulog
+            processed = 0
+            seen_union_ids = set()
+            while current is not None:
+                ulog = int(current.group(1))
+                if ulog <= self._newest_ulog:
+                    # 之后的都是已经处理过的旧记录
+                    break
+                following = next(matches, None)
+                end = following.start() if following else len(log_text)
+                name_match = self._name_pattern.search(log_text, current.end(), end)
+                if name_match:
+                    union_id = self._union_id_by_name[name_match.group(0)]
+                    # 新的在前，本次第一次见到的就是这只 boss 最新的记录，比索引里原有的都新
+                    if union_id not in seen_union_ids:
+                        seen_union_ids.add(union_id)
+                        self._latest_by_union_id[union_id] = current.group(1)
+                newest_ulog = max(newest_ulog, ulog)
+                processed += 1
+                current = following
+            self._newest_ulog = newest_ulog
+            return processed
+
+    def get_latest_timestamp(self, union_id) -> Optional[str]:
+        """指定 boss 最近一条记录的16位时间戳字符串，日志里没有时返回 None"""
+        return self._latest_by_union_id.get(union_id)
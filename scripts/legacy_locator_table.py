@@ -0,0 +1,214 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from scripts.action_waits import AdaptiveTimeout, wait_until
+from scripts.element_finder import build_xpath_conditions, parse_html_content
+from scripts.log_manager import LogManager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCATOR_TABLE_NAME = 'action_locators.json'
+# 旧版动作配置（action_editor 写 configs/action_config.json，各服务器目录下也可能有一份），定位表和它放在同一目录
+DEFAULT_ACTION_CONFIG_PATTERNS = (
+    os.path.join(PROJECT_ROOT, 'configs', 'action_config.json'),
+    os.path.join(PROJECT_ROOT, 'configs', 'server_*', 'action_config.json'),
+)
+DEFAULT_TABLE_PATTERNS = tuple(os.path.join(os.path.dirname(pattern), LOCATOR_TABLE_NAME)
+                               for pattern in DEFAULT_ACTION_CONFIG_PATTERNS)
+
+# 编译器标出的歧义：这些 XPath 在页面上很可能匹配到不止一个元素，find_element_by_html 只取第一个可见的
+NO_CONDITIONS = 'no_conditions'            # 没有任何条件，匹配所有同名标签
+PREFIX_ONLY = 'prefix_only'                # 只靠 onclick 的片段（RA_UseBack / 前 15 个字符）匹配
+CONDITIONS_DROPPED = 'conditions_dropped'  # 条件太多，build_xpath 把 id / name 条件丢掉了
+DUPLICATE = 'duplicate'                    # 和另一个片段编译出同样的定位
+
+# 一次往返：找容器 -> 在容器里找元素（没有容器时找不到再用宽松文本匹配）-> 返回第一个可见可用的
+_LOOKUP_SCRIPT = r"""
+var containerXpath = arguments[0], xpath = arguments[1], looseXpath = arguments[2];
+function all(expr, root) {
+    var result = document.evaluate(expr, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+}
+function usable(el) {
+    return !el.disabled && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+var root = document;
+if (containerXpath) {
+    root = all(containerXpath, document)[0];
+    if (!root) return null;
+}
+var candidates = all(xpath, root);
+if (!candidates.length && looseXpath) candidates = all(looseXpath, root);
+for (var i = 0; i < candidates.length; i++) {
+    if (usable(candidates[i])) return candidates[i];
+}
+return null;
+"""
+
+
+def locator_key(element_info, container_info=None) -> str:
+    """定位表的键：(element_info, container_info) 的摘要，空容器和没有容器视为同一个"""
+    raw = json.dumps([element_info or '', (container_info or '').strip()], ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _xpath_literal(value):
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = [f'"{part}"' for part in value.split('"')]
+    return 'concat(' + ", '\"', ".join(parts) + ')'
+
+
+def _compile_xpath(snippet, is_container) -> Tuple[str, str, List[str], str]:
+    """和 build_xpath 生成一样的 XPath，同时给出歧义原因；返回 (xpath, 标签名, 歧义原因, 文本)"""
+    tag_name, text, attrs = parse_html_content(snippet, verbose=False)
+    has_target_url = 'target_url' in attrs
+    conditions, dropped = build_xpath_conditions(text, attrs)
+    prefix = '//' if is_container else './/'
+    xpath = f"{prefix}{tag_name or '*'}"
+    if conditions:
+        xpath += f"[{' and '.join(conditions)}]"
+    ambiguous = []
+    if not conditions:
+        ambiguous.append(NO_CONDITIONS)
+    elif not has_target_url and all(c.startswith('contains(@onclick') for c in conditions):
+        ambiguous.append(PREFIX_ONLY)
+    if any(c.startswith(('@id=', '@name=')) for c in dropped):
+        ambiguous.append(CONDITIONS_DROPPED)
+    return xpath, tag_name, ambiguous, text
+
+
+def compile_legacy_locator(element_info, container_info=None) -> Dict:
+    """把 element_info / container_info 两段 HTML 编译成定位（与 find_element_by_html 原来的查找方式一致）
+
+    返回 {'element_info', 'container_info', 'container_xpath', 'xpath', 'loose_xpath', 'ambiguous'}
+    """
+    container_info = (container_info or '').strip()
+    container_xpath = None
+    ambiguous = []
+    if container_info:
+        container_xpath, _, container_ambiguous, _ = _compile_xpath(container_info, True)
+        ambiguous += [f'container_{reason}' for reason in container_ambiguous]
+    xpath, tag_name, element_ambiguous, text = _compile_xpath(element_info, not container_info)
+    ambiguous += element_ambiguous
+    loose_xpath = None
+    if not container_info and text:
+        # 原来没有容器时，精确匹配找不到再退回只按文本匹配
+        loose_xpath = f"//{tag_name or '*'}[contains(text(),{_xpath_literal(text)})]"
+    return {
+        'element_info': element_info,
+        'container_info': container_info,
+        'container_xpath': container_xpath,
+        'xpath': xpath,
+        'loose_xpath': loose_xpath,
+        'ambiguous': ambiguous,
+    }
+
+
+def compile_action_configs(action_configs: Iterable[Dict]) -> Dict[str, Dict]:
+    """编译旧版动作配置（{id: {'name', 'actions': [{'element_info', 'container_info', ...}]}}）里的所有片段"""
+    table: Dict[str, Dict] = {}
+    owners: Dict[Tuple, str] = {}
+    for config in action_configs:
+        for group in config.values():
+            for action in group.get('actions', []):
+                element_info = action.get('element_info')
+                if not element_info:
+                    continue
+                key = locator_key(element_info, action.get('container_info'))
+                if key in table:
+                    continue
+                locator = compile_legacy_locator(element_info, action.get('container_info'))
+                signature = (locator['container_xpath'], locator['xpath'])
+                if signature in owners:
+                    locator['ambiguous'].append(DUPLICATE)
+                    other = table[owners[signature]]
+                    if DUPLICATE not in other['ambiguous']:
+                        other['ambiguous'].append(DUPLICATE)
+                else:
+                    owners[signature] = key
+                table[key] = locator
+    return table
+
+
+class LegacyLocatorTable:
+    """预编译的旧版动作定位表（tools/compile_legacy_locators.py 生成的 action_locators.json）
+
+    运行时只查表，不再每次用正则解析 HTML 片段、重新拼 XPath；
+    表里没有的片段（配置改了还没重新编译）当场编译一次并记住。
+    查找是一次 execute_script，元素没出现时短轮询，超时按每个定位最近的实际等待时间自适应。
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, table_paths: Optional[Iterable[str]] = None, initial_wait_ms=1000, poll_ms=50):
+        self.table_paths = list(table_paths) if table_paths is not None else default_table_paths()
+        self.initial_wait_ms = initial_wait_ms
+        self.poll_ms = poll_ms
+        self.logger = LogManager.get_instance()
+        self._lock = threading.Lock()
+        self._locators: Optional[Dict[str, Dict]] = None
+        self._timeouts: Dict[str, AdaptiveTimeout] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'LegacyLocatorTable':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _load(self) -> Dict[str, Dict]:
+        locators = {}
+        for path in self.table_paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    locators.update(json.load(f))
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.logger.warning(f'加载定位表失败 {path}: {str(e)}')
+        return locators
+
+    def reload(self):
+        with self._lock:
+            self._locators = None
+            self._timeouts.clear()
+
+    def get(self, element_info, container_info=None) -> Dict:
+        key = locator_key(element_info, container_info)
+        with self._lock:
+            if self._locators is None:
+                self._locators = self._load()
+            locator = self._locators.get(key)
+            if locator is None:
+                self.logger.debug(f'定位表中没有该片段，运行时编译（请重新运行 tools/compile_legacy_locators.py）: {element_info}')
+                locator = compile_legacy_locator(element_info, container_info)
+                self._locators[key] = locator
+            return locator
+
+    def _timeout(self, key, max_ms) -> AdaptiveTimeout:
+        with self._lock:
+            if key not in self._timeouts:
+                self._timeouts[key] = AdaptiveTimeout(min(self.initial_wait_ms, max_ms), max_ms=max_ms)
+            return self._timeouts[key]
+
+    def find_element(self, driver, element_info, container_info=None, timeout=10):
+        """返回第一个可见可用的元素，超时返回 None；timeout（秒）是自适应等待的上限"""
+        locator = self.get(element_info, container_info)
+        wait = self._timeout(locator_key(element_info, container_info), max(timeout * 1000, 300))
+        element, waited_ms = wait_until(
+            lambda: driver.execute_script(_LOOKUP_SCRIPT, locator['container_xpath'],
+                                          locator['xpath'], locator['loose_xpath']),
+            wait.timeout_ms, self.poll_ms)
+        wait.observe(waited_ms, is_timeout=element is None)
+        return element
+
+
+def default_table_paths() -> List[str]:
+    return [path for pattern in DEFAULT_TABLE_PATTERNS for path in sorted(glob.glob(pattern))]
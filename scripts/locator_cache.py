@@ -0,0 +1,123 @@
+import itertools
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+MENU_TYPES = ('click_main_menu', 'click_main_menu_for_town', 'click_sub_menu_stage', 'click_sub_menu_boss')
+NAMED_BATTLE_BUTTONS = ('monster_battle', 'union_battle', 'ChallengeRank')
+# 点击后页面内容会被替换（jQuery .load / ajaxForm）的动作类型
+NAVIGATING_TYPES = frozenset(MENU_TYPES + ('click_button_start_battle',))
+
+# 一次往返同时完成：检查页面代数标记（不在了说明内容被替换过，重新插一个）+ 查找元素
+# 标记放在 #mybody 里，菜单、战斗的 ajax 加载和整页跳转都会把它一起换掉
+_LOOKUP_SCRIPT = r"""
+var token = arguments[0], by = arguments[1], selector = arguments[2];
+var marker = document.getElementById('hof-page-marker');
+var fresh = !!marker && marker.getAttribute('data-token') === token;
+if (!fresh) {
+    if (marker) marker.parentNode.removeChild(marker);
+    marker = document.createElement('span');
+    marker.id = 'hof-page-marker';
+    marker.style.display = 'none';
+    marker.setAttribute('data-token', token);
+    (document.getElementById('mybody') || document.body || document.documentElement).appendChild(marker);
+}
+var found = by === 'name' ? document.getElementsByName(selector) : document.querySelectorAll(selector);
+return {fresh: fresh, elements: Array.prototype.slice.call(found)};
+"""
+
+
+def _css_string(value):
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def compile_locator(trigger_type, value) -> Optional[Tuple[str, str]]:
+    """把 (动作类型, 值) 编译成最快的定位方式 ('css' 或 'name', 选择器)，不支持的动作类型返回 None
+
+    与原来的 XPath 等价：//a[contains(@onclick, v)] -> a[onclick*="v"]，按 name 查找的直接用 name
+    """
+    if trigger_type in MENU_TYPES:
+        return 'css', f'a[onclick*={_css_string(value)}]'
+    if trigger_type == 'check_box_select_character':
+        return 'name', value
+    if trigger_type == 'click_button_clear_team':
+        return 'css', f'input[type="button"][onclick={_css_string(value)}]'
+    if trigger_type == 'click_button_start_battle':
+        if value in NAMED_BATTLE_BUTTONS:
+            return 'name', value
+        return 'css', 'input[type="submit"][value="戰鬥!"]'
+    return None
+
+
+class _PageState:
+    def __init__(self, token):
+        self.token = token
+        self.navigation_count = None
+        self.is_verified = False
+        self.elements: Dict[Tuple[str, str], List] = {}
+
+
+class LocatorCache:
+    """按页面代数缓存定位到的元素
+
+    每个浏览器一份状态：页面里插入的代数标记 token、已经定位到的元素。
+    - 同一页面上重复查找（两次导航之间）直接返回缓存，不访问浏览器
+    - 导航后（点击菜单/战斗按钮后由执行器调用 invalidate，driver.get/refresh 由 PooledDriver 的导航计数发现）
+      下一次查找和标记检查合在一次 execute_script 里：标记还在说明内容没换，缓存继续有效
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = weakref.WeakKeyDictionary()
+        self._tokens = itertools.count(1)
+        self.hit_count = 0
+        self.lookup_count = 0
+
+    @classmethod
+    def get_instance(cls) -> 'LocatorCache':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _state(self, driver) -> _PageState:
+        with self._lock:
+            state = self._states.get(driver)
+            if state is None:
+                state = _PageState(f'hof-{next(self._tokens)}')
+                self._states[driver] = state
+        navigation_count = getattr(driver, 'navigation_count', None)
+        if navigation_count != state.navigation_count:
+            state.navigation_count = navigation_count
+            state.is_verified = False
+            state.elements.clear()
+        return state
+
+    def find_elements(self, driver, trigger_type, value) -> List:
+        locator = compile_locator(trigger_type, value)
+        if locator is None:
+            raise ValueError(f'不支持的动作类型: {trigger_type}')
+        state = self._state(driver)
+        cached = state.elements.get(locator)
+        if state.is_verified and cached:
+            self.hit_count += 1
+            return cached
+        self.lookup_count += 1
+        result = driver.execute_script(_LOOKUP_SCRIPT, state.token, *locator) or {}
+        if not result.get('fresh'):
+            # 内容换过了，之前定位到的元素都不能用了
+            state.elements.clear()
+        elements = list(result.get('elements') or [])
+        if elements:
+            state.elements[locator] = elements
+        state.is_verified = True
+        return elements
+
+    def invalidate(self, driver, drop_elements=False):
+        """页面可能已经变化：下次查找先确认代数标记；drop_elements 时直接丢弃缓存（元素已经失效）"""
+        state = self._state(driver)
+        state.is_verified = False
+        if drop_elements:
+            state.elements.clear()
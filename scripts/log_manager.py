@@ -1,11 +1,21 @@
-from typing import Optional
+from typing import Dict, Optional
 import os
+import threading
 from datetime import datetime
+from scripts.log_writer import BufferedLogWriter, read_latest_lines
 
 class LogManager:
     _instance: Optional['LogManager'] = None
     _is_debug: bool = False
     _log_path: Optional[str] = None
+    _writer: Optional[BufferedLogWriter] = None
+    # for_path 创建的按日志文件区分的 logger（同一进程里运行多个 Bot 时每个 Bot 一个）
+    _path_loggers: Dict[str, 'LogManager'] = {}
+    _path_loggers_lock = threading.Lock()
+    # 日志轮转：单个文件 5MB 或 1 天，保留 log_server_N.txt.1 ~ .5
+    LOG_MAX_BYTES = 5 * 1024 * 1024
+    LOG_BACKUP_COUNT = 5
+    LOG_ROTATE_INTERVAL_SEC = 24 * 3600
 
     def __new__(cls) -> 'LogManager':
         if cls._instance is None:
@@ -25,39 +35,82 @@ class LogManager:
     @classmethod
     def set_log_path(cls, log_path: str) -> None:
         """设置日志文件路径"""
+        if cls._writer is not None and cls._writer.path != log_path:
+            cls._writer.close()
+            cls._writer = None
         cls._log_path = log_path
         # 确保日志文件所在目录存在
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        if cls._writer is None:
+            cls._writer = BufferedLogWriter(
+                log_path,
+                max_bytes=cls.LOG_MAX_BYTES,
+                backup_count=cls.LOG_BACKUP_COUNT,
+                rotate_interval_sec=cls.LOG_ROTATE_INTERVAL_SEC,
+            )
+
+    @classmethod
+    def for_path(cls, log_path: str) -> 'LogManager':
+        """返回写入 log_path 的 logger，同一路径共用一个
+
+        和 set_log_path 不同，不会改动全局单例的日志文件：
+        run_many / AsyncBotRuntime 在一个进程里运行多个 Bot 时，每个 Bot 写自己服务器的日志文件
+        """
+        log_path = os.path.abspath(log_path)
+        with cls._path_loggers_lock:
+            logger = cls._path_loggers.get(log_path)
+            if logger is None:
+                os.makedirs(os.path.dirname(log_path), exist_ok=True)
+                logger = object.__new__(cls)
+                logger._log_path = log_path
+                logger._writer = BufferedLogWriter(
+                    log_path,
+                    max_bytes=cls.LOG_MAX_BYTES,
+                    backup_count=cls.LOG_BACKUP_COUNT,
+                    rotate_interval_sec=cls.LOG_ROTATE_INTERVAL_SEC,
+                )
+                cls._path_loggers[log_path] = logger
+            return logger
+
+    @classmethod
+    def _writers(cls) -> list:
+        writers = [logger._writer for logger in list(cls._path_loggers.values())]
+        if cls._writer is not None:
+            writers.append(cls._writer)
+        return writers
+
+    @classmethod
+    def flush(cls) -> None:
+        """立即把缓冲中的日志写入文件"""
+        for writer in cls._writers():
+            writer.flush()
+
+    @classmethod
+    def read_latest(cls, limit: int = 500, log_path: Optional[str] = None) -> list:
+        """读取最新的 limit 行日志，最新的在最前面（供 GUI 日志窗口使用）"""
+        path = log_path or cls._log_path
+        if not path:
+            return []
+        for writer in cls._writers():
+            if os.path.abspath(writer.path) == os.path.abspath(path):
+                writer.flush()
+        return read_latest_lines(path, limit=limit, backup_count=cls.LOG_BACKUP_COUNT)
 
     def _get_timestamp(self) -> str:
         """获取当前时间戳，精确到微秒"""
         return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
 
     def _write_to_file(self, message: str) -> None:
-        """将消息写入日志文件，按时间倒序写入，最新的消息在最上面"""
-        if not self._log_path:
+        """将消息追加到日志文件（先进缓冲区，由后台线程批量写入），查看时用 read_latest 按时间倒序读取"""
+        if self._writer is None:
             return
-        
-        try:
-            # 如果文件不存在，直接写入
-            if not os.path.exists(self._log_path):
-                with open(self._log_path, 'w', encoding='utf-8') as f:
-                    f.write(f"{message}\n")
-                return
-            
-            # 如果文件存在，读取现有内容
-            with open(self._log_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 在文件开头写入新消息
-            with open(self._log_path, 'w', encoding='utf-8') as f:
-                f.write(f"{message}\n{content}")
-        except Exception as e:
-            print(f"\033[91m[ERROR] Failed to write log to file: {str(e)}\033[0m")
-
-    def debug(self, message: str, is_write_in_file: bool = False) -> None:
-        """输出调试信息"""
+        self._writer.write(message)
+
+    def debug(self, message: str, *args, is_write_in_file: bool = False) -> None:
+        """输出调试信息；message 可以带 %s 占位符、参数放在 args 里，只在开启调试时才格式化（热路径上不用先拼字符串）"""
         if self._is_debug:
+            if args:
+                message = message % args
             log_message = f"[{self._get_timestamp()}][DEBUG] {message}"
             print(log_message)
             if is_write_in_file:
@@ -0,0 +1,52 @@
+import os
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QCheckBox, QLabel
+from PyQt5.QtCore import QTimer
+from scripts.log_manager import LogManager
+
+
+class LogViewerDialog(QDialog):
+    """日志查看窗口：文件是按时间顺序追加的，这里只从文件末尾读取最新的若干行并倒序显示"""
+
+    MAX_LINES = 500
+    REFRESH_INTERVAL_MS = 2000
+
+    def __init__(self, server_id, parent=None):
+        super().__init__(parent)
+        self.log_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs', f'log_server_{server_id}.txt')
+        self.setWindowTitle(f'日志（最新在上） - log_server_{server_id}.txt')
+        self.resize(900, 600)
+        self.init_ui()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(self.REFRESH_INTERVAL_MS)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        layout.addWidget(self.text)
+        btn_layout = QHBoxLayout()
+        self.auto_refresh_box = QCheckBox('自动刷新')
+        self.auto_refresh_box.setChecked(True)
+        self.btn_refresh = QPushButton('刷新')
+        self.btn_close = QPushButton('关闭')
+        self.count_label = QLabel('')
+        btn_layout.addWidget(self.auto_refresh_box)
+        btn_layout.addWidget(self.count_label)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.btn_refresh)
+        btn_layout.addWidget(self.btn_close)
+        layout.addLayout(btn_layout)
+        self.btn_refresh.clicked.connect(self.refresh)
+        self.btn_close.clicked.connect(self.close)
+        self.auto_refresh_box.toggled.connect(lambda checked: self.timer.start(self.REFRESH_INTERVAL_MS) if checked else self.timer.stop())
+
+    def refresh(self):
+        lines = LogManager.read_latest(self.MAX_LINES, log_path=self.log_path)
+        self.text.setPlainText('\n'.join(lines))
+        self.count_label.setText(f'显示最新 {len(lines)} 行')
+
+    def done(self, result):
+        self.timer.stop()
+        super().done(result)
@@ -0,0 +1,193 @@
+import atexit
+import os
+import re
+import threading
+import time
+
+# LogManager 写入的每条日志以 [2024-01-01 12:00:00.123456] 开头，不以它开头的行是上一条日志的续行
+ENTRY_TIMESTAMP_PATTERN = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?)\]')
+
+
+class BufferedLogWriter:
+    """只追加的缓冲日志写入器
+
+    write() 只把一行放进内存缓冲区（加锁，多线程安全），由后台线程每 flush_interval 秒
+    或缓冲区超过 max_buffer_lines 行时批量追加到文件末尾；文件超过 max_bytes 或跨过时间边界
+    （rotate_interval_sec 为一天时就是本地的零点）时轮转为 log.txt.1 … log.txt.N（数字越大越旧）。
+
+    时间边界按文件最后一次写入的时间判断，Bot 每天重启也会轮转；
+    旧版本写的“最新在前”的日志文件在打开时转换成按时间顺序追加的格式。
+    """
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backup_count=5, rotate_interval_sec=None,
+                 flush_interval=1.0, max_buffer_lines=1000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotate_interval_sec = rotate_interval_sec
+        self.flush_interval = flush_interval
+        self.max_buffer_lines = max_buffer_lines
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._is_closed = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        convert_latest_first_file(path)
+        # 当前文件所属的时间段：已有文件按最后一次写入的时间算
+        try:
+            self._period = self._period_of(os.path.getmtime(path))
+        except OSError:
+            self._period = self._period_of(time.time())
+        self._thread = threading.Thread(target=self._flush_loop, name='log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line):
+        with self._lock:
+            if self._is_closed:
+                return
+            self._buffer.append(line)
+            is_full = len(self._buffer) >= self.max_buffer_lines
+        if is_full:
+            self._wakeup.set()
+
+    def _flush_loop(self):
+        while not self._is_closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中的所有行追加到文件"""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return
+        with self._file_lock:
+            try:
+                if self._should_rotate():
+                    self._rotate()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines))
+                    f.write('\n')
+                self._period = self._period_of(time.time())
+            except Exception as e:
+                print(f"\033[91m[ERROR] Failed to write log to file: {str(e)}\033[0m")
+
+    def _period_of(self, timestamp):
+        """timestamp 所在的时间段编号，按本地时间对齐（一天的时间段从零点开始）"""
+        if not self.rotate_interval_sec:
+            return 0
+        return int((timestamp + time.localtime(timestamp).tm_gmtoff) // self.rotate_interval_sec)
+
+    def _should_rotate(self):
+        if self.rotate_interval_sec and self._period_of(time.time()) != self._period:
+            return os.path.exists(self.path)
+        try:
+            return self.max_bytes and os.path.getsize(self.path) >= self.max_bytes
+        except OSError:
+            return False
+
+    def _rotate(self):
+        """log.txt -> log.txt.1 -> log.txt.2 ...，超过 backup_count 的最旧文件删除"""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+        else:
+            oldest = f'{self.path}.{self.backup_count}'
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f'{self.path}.{i}'
+                if os.path.exists(src):
+                    os.replace(src, f'{self.path}.{i + 1}')
+            os.replace(self.path, f'{self.path}.1')
+        self._period = self._period_of(time.time())
+
+    def close(self):
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=2.0)
+        self.flush()
+        atexit.unregister(self.close)
+
+
+def _group_entries(lines):
+    """把行按日志条目分组（续行跟着它前面带时间戳的那一行）"""
+    entries = []
+    for line in lines:
+        if ENTRY_TIMESTAMP_PATTERN.match(line) or not entries:
+            entries.append([line])
+        else:
+            entries[-1].append(line)
+    return entries
+
+
+def convert_latest_first_file(path):
+    """旧版 LogManager 把每条新日志写在文件最前面，检测到这种文件时按条目倒过来重写成按时间顺序
+
+    只看第一条和最后一条日志的时间戳，按时间顺序的文件不会被改动；返回是否做了转换
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return False
+    stamps = [m.group(1) for m in map(ENTRY_TIMESTAMP_PATTERN.match, lines) if m]
+    if len(stamps) < 2 or stamps[0] <= stamps[-1]:
+        return False
+    entries = _group_entries(lines)
+    # 第一个条目前面可能有不带时间戳的行，留在最前面
+    head = entries.pop(0) if not ENTRY_TIMESTAMP_PATTERN.match(entries[0][0]) else []
+    temp_path = f'{path}.converting'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        for line in head + [line for entry in reversed(entries) for line in entry]:
+            f.write(line)
+            f.write('\n')
+    # 保留原来的修改时间，轮转仍然按原文件最后写入的时间判断
+    stat = os.stat(path)
+    os.replace(temp_path, path)
+    os.utime(path, (stat.st_atime, stat.st_mtime))
+    return True
+
+
+def _read_lines_reversed(path, block_size=64 * 1024):
+    """从文件末尾按块向前读取，逐行返回（最新的行在前）"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b'\n')
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.decode('utf-8', errors='replace')
+        if remainder:
+            yield remainder.decode('utf-8', errors='replace')
+
+
+def read_latest_lines(path, limit=500, backup_count=5):
+    """按“最新在前”的顺序读取最多 limit 行，当前文件不够时继续读轮转出去的 .1、.2 …
+
+    只从文件末尾向前读需要的部分，和文件大小无关，GUI 可以频繁刷新。
+    """
+    result = []
+    for candidate in [path] + [f'{path}.{i}' for i in range(1, backup_count + 1)]:
+        if len(result) >= limit:
+            break
+        if not os.path.exists(candidate):
+            continue
+        for line in _read_lines_reversed(candidate):
+            result.append(line)
+            if len(result) >= limit:
+                break
+    return result
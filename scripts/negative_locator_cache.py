@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+# 一次往返：算页面指纹 + 检查所有候选定位（主定位和各个备用查找方式）里有没有可见可用的元素
+# 指纹只取链接、按钮、表单的结构（标签、name、onclick、href、value 属性、链接文字），
+# 倒计时之类的文字变化不影响，出现/消失一个 boss 链接就会变
+PRESENCE_PROBE_SCRIPT = r"""
+var locators = arguments[0], links = arguments[1];
+var nodes = document.querySelectorAll('a, input, button, select, form');
+var parts = [location.href];
+for (var i = 0; i < nodes.length; i++) {
+    var n = nodes[i];
+    parts.push([n.tagName, n.getAttribute('name') || '', n.getAttribute('onclick') || '',
+                n.getAttribute('href') || '', n.getAttribute('value') || '',
+                n.tagName === 'A' ? n.textContent : ''].join('|'));
+}
+var s = parts.join('\n'), h = 5381;
+for (var i = 0; i < s.length; i++) h = ((h * 33) ^ s.charCodeAt(i)) >>> 0;
+var fingerprint = nodes.length + ':' + s.length + ':' + h.toString(16);
+function usable(el) {
+    return !el.disabled && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+function anyUsable(xpath, root) {
+    var result = document.evaluate(xpath, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < result.snapshotLength; i++) if (usable(result.snapshotItem(i))) return true;
+    return false;
+}
+function present() {
+    for (var i = 0; i < locators.length; i++) {
+        var loc = locators[i], root = document;
+        try {
+            if (loc.container) {
+                root = document.evaluate(loc.container, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                if (!root) continue;
+            }
+            if (anyUsable(loc.xpath, root)) return true;
+        } catch (e) {}
+    }
+    if (links) {
+        var text = (links.text || '').toLowerCase(), url = (links.url || '').toLowerCase();
+        var anchors = document.getElementsByTagName('a');
+        for (var i = 0; i < anchors.length; i++) {
+            var a = anchors[i];
+            if (!usable(a)) continue;
+            if ((text && a.textContent.trim().toLowerCase().indexOf(text) >= 0) ||
+                (url && (a.getAttribute('onclick') || '').toLowerCase().indexOf(url) >= 0)) return true;
+        }
+    }
+    return false;
+}
+return {fingerprint: fingerprint, present: present()};
+"""
+
+
+class PresenceProbe(NamedTuple):
+    fingerprint: Optional[str]
+    present: bool
+
+
+class NegativeLocatorCache:
+    """记录"这个页面上确实没有这个元素"（页面指纹 + 定位键），按最近使用淘汰
+
+    旧版 ActionExecutor 找不到元素时要依次等完主查找和备用查找；
+    同一个页面、同一个定位已经确认找不到过一次，再次查找时探测一下仍然没有就直接失败，不再等待。
+    has_absent(key) 只查内存：从来没失败过的定位不需要探测，正常执行的动作没有额外的往返。
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._absent: 'OrderedDict[tuple, bool]' = OrderedDict()
+        # 定位键 -> 记录了几个页面
+        self._key_counts: Dict[str, int] = {}
+        self.hit_count = 0
+
+    @classmethod
+    def get_instance(cls) -> 'NegativeLocatorCache':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def probe(driver, locators: List[Dict], links: Optional[Dict] = None) -> PresenceProbe:
+        """locators: [{'container': 容器XPath或None, 'xpath': XPath}]；links: {'text', 'url'} 在所有链接里按文字/onclick 筛选"""
+        try:
+            result = driver.execute_script(PRESENCE_PROBE_SCRIPT, locators, links) or {}
+        except Exception:
+            # 探测失败不能当成"没有"，按存在处理，走正常查找
+            return PresenceProbe(None, True)
+        return PresenceProbe(result.get('fingerprint'), bool(result.get('present')))
+
+    def has_absent(self, key) -> bool:
+        """这个定位在任意页面上被记录过找不到（只有这时才值得探测页面指纹）"""
+        with self._lock:
+            return key in self._key_counts
+
+    def is_absent(self, fingerprint, key) -> bool:
+        if fingerprint is None:
+            return False
+        with self._lock:
+            if (fingerprint, key) not in self._absent:
+                return False
+            self._absent.move_to_end((fingerprint, key))
+            self.hit_count += 1
+            return True
+
+    def mark_absent(self, fingerprint, key):
+        if fingerprint is None:
+            return
+        with self._lock:
+            if (fingerprint, key) not in self._absent:
+                self._key_counts[key] = self._key_counts.get(key, 0) + 1
+            self._absent[(fingerprint, key)] = True
+            self._absent.move_to_end((fingerprint, key))
+            while len(self._absent) > self.max_entries:
+                (_, evicted_key), _ = self._absent.popitem(last=False)
+                self._key_counts[evicted_key] -= 1
+                if not self._key_counts[evicted_key]:
+                    del self._key_counts[evicted_key]
+
+    def clear(self):
+        with self._lock:
+            self._absent.clear()
+            self._key_counts.clear()
@@ -0,0 +1,109 @@
+import time
+from typing import Dict, Optional
+from scripts.hunt_page_parser import HuntSnapshot
+
+HUNT = 'hunt'
+PVP_RANKING = 'pvp_ranking'
+CHARACTER_LIST = 'character_list'
+
+# 在页面里执行的提取函数，每个只返回需要的几个字段，不再把整个 page_source（几十到上百 KB）
+# 通过 WebDriver 传回 Python 再用正则 / BeautifulSoup 解析
+_EXTRACTOR_LIBRARY = r"""
+var extractors = {
+    hunt: function () {
+        var mtime = document.getElementById('mtime');
+        var cooldown = 0;
+        var cooldownNode = document.evaluate("//div[contains(text(), '離下次戰鬥還需要')]", document, null,
+                                             XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (cooldownNode) {
+            var m = /(\d+):(\d+)/.exec(cooldownNode.textContent);
+            if (m) cooldown = parseInt(m[1], 10) * 60 + parseInt(m[2], 10);
+        }
+        var ids = [];
+        var links = document.querySelectorAll("[onclick*='index2.php?union=']");
+        for (var i = 0; i < links.length; i++) {
+            var u = /RA_UseBack\s*\(\s*'index2\.php\?union=(\d+)'\s*\)/.exec(links[i].getAttribute('onclick'));
+            if (u) ids.push(parseInt(u[1], 10));
+        }
+        return {
+            stamina: mtime ? parseInt(mtime.textContent, 10) : null,
+            cooldown_seconds: cooldown,
+            alive_boss_ids: ids
+        };
+    },
+    pvp_ranking: function () {
+        var userNode = document.querySelector('#menu2 > div > div');
+        var crowns = document.querySelectorAll("img[src*='crown01.png']");
+        var top = null;
+        var heads = document.querySelectorAll('div.u');
+        for (var i = 0; i < heads.length; i++) {
+            if (heads[i].textContent.indexOf('TOP 5') >= 0) { top = heads[i]; break; }
+        }
+        var crown = null;
+        for (var j = 0; j < crowns.length; j++) {
+            if (!top || (top.compareDocumentPosition(crowns[j]) & Node.DOCUMENT_POSITION_FOLLOWING)) {
+                crown = crowns[j];
+                break;
+            }
+        }
+        var firstPlace = null;
+        var cell = crown ? crown.closest('tr') : null;
+        cell = cell ? cell.querySelector('td.td8') : null;
+        if (cell) firstPlace = cell.textContent.split('(')[0].trim();
+        return {
+            current_user: userNode ? userNode.textContent.trim() : null,
+            first_place_user: firstPlace
+        };
+    },
+    character_list: function () {
+        var content = document.getElementById('Jq_Conten');
+        return {html: content ? content.outerHTML : null};
+    }
+};
+var result = {};
+var names = arguments[0];
+for (var k = 0; k < names.length; k++) {
+    try {
+        result[names[k]] = extractors[names[k]]();
+    } catch (e) {
+        result[names[k]] = {error: String(e)};
+    }
+}
+return result;
+"""
+
+
+def extract(driver, *names) -> Dict[str, dict]:
+    """在当前页面里一次 execute_script 执行多个提取函数，返回 {名字: 结果}
+
+    某个提取函数在页面里抛异常时，对应结果为 {'error': ...}，不影响其他的。
+    """
+    return driver.execute_script(_EXTRACTOR_LIBRARY, list(names)) or {}
+
+
+def extract_hunt_snapshot(driver) -> Optional[HuntSnapshot]:
+    """从浏览器当前的冒险页提取 HuntSnapshot，提取失败返回 None"""
+    data = extract(driver, HUNT).get(HUNT) or {}
+    if 'error' in data:
+        return None
+    return HuntSnapshot(
+        alive_boss_ids=frozenset(data.get('alive_boss_ids') or []),
+        stamina=data.get('stamina'),
+        cooldown_seconds=data.get('cooldown_seconds') or 0,
+        fetched_at=time.time(),
+    )
+
+
+def extract_pvp_ranking(driver) -> dict:
+    """从 PVP 准备页提取 {'current_user': 当前用户名, 'first_place_user': 第一名用户名}，找不到的为 None"""
+    data = extract(driver, PVP_RANKING).get(PVP_RANKING) or {}
+    return {
+        'current_user': data.get('current_user'),
+        'first_place_user': data.get('first_place_user'),
+    }
+
+
+def extract_character_list_html(driver) -> Optional[str]:
+    """返回角色列表 div#Jq_Conten 的 HTML，页面上没有时返回 None"""
+    data = extract(driver, CHARACTER_LIST).get(CHARACTER_LIST) or {}
+    return data.get('html')
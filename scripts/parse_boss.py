@@ -1,7 +1,7 @@
 import os
-import json
 import re
 from bs4 import BeautifulSoup
+from scripts.boss_config_repository import BossConfigRepository, server_boss_config_paths
 
 def parse_boss_info(html_content):
     soup = BeautifulSoup(html_content, 'html.parser')
@@ -60,11 +60,10 @@ def update_boss_config():
         # 按union_id排序
         boss_list.sort(key=lambda x: x['union_id'])
         
-        # 保存到boss_config.json
-        config = {'boss_list': boss_list}
-        config_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'configs/boss_config.json')
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        # 保存到boss_config.json（同时更新进程内共享的boss配置），各服务器目录下已有的boss_config.json也一起更新
+        BossConfigRepository.get_instance().save_boss_list(boss_list)
+        for path in server_boss_config_paths():
+            BossConfigRepository.get_instance(path).save_boss_list(boss_list)
             
         print(f'成功更新boss配置，共{len(boss_list)}个boss信息')
         
@@ -7,14 +7,11 @@ import json
 import argparse
 import time
 import signal
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver import Chrome
 from scripts.captcha_recognizer import recognize_captcha
 from scripts.hof_auto_bot_main import HofAutoBot
 from scripts.account_config_reader import get_account_config
+from scripts.driver_pool import DriverPool
 
 _GLOBAL_DRIVER = None
 _GLOBAL_BOT = None
@@ -92,15 +89,7 @@ def _load_server(server_id=None, server_name=None):
     return servers[0] if servers else None
 
 def _open_driver(headless=True):
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--window-size=1280,900")
-    os.environ.setdefault("WDM_LOCAL", "1")
-    service = Service(ChromeDriverManager().install())
-    return Chrome(service=service, options=options)
+    return DriverPool.get_instance(headless=headless).acquire()
 
 def _login_and_start(server, headless=True, refresh_max=None, refresh_interval=None, map_file=None, tesseract_path=None):
     if tesseract_path:
@@ -8,6 +8,10 @@ class BaseState:
     def process(self):
         raise NotImplementedError
 
+    async def process_async(self, runtime):
+        """asyncio 运行时使用：run_once（登录检测 + process）整体放到阻塞线程池里执行"""
+        await runtime.run_blocking(self.bot.run_once)
+
 
     def get_next_state(self) -> None:
         return self.next_state
@@ -15,6 +19,16 @@ class BaseState:
     def on_finish(self):
         pass
 
+    def is_waiting(self):
+        """是否在时间轮上等待到期（等待期间 run_once 不做任何事）"""
+        return False
+
+    def wake_up(self, after=0):
+        pass
+
+    def cancel(self):
+        pass
+
     def set_state(self, state):
         self.log(f'set_state: \033[91m{self.__class__.__name__} -> \033[93m{state.__class__.__name__}\033[37m')
         self.bot.switch_to_next_state(state)
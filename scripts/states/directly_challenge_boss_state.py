@@ -1,6 +1,9 @@
+import time
+from functools import partial
 from .base_state import BaseState
 from scripts.hof_auto_bot_main import HofAutoBot
 from .state_factory import StateFactory
+from scripts.http_action_engine import CONFIRMED, NOT_SENT
 
 class DirectlyChallengeBossState(BaseState):
 
@@ -12,26 +15,140 @@ class DirectlyChallengeBossState(BaseState):
         self.on_challenge_success = None
         self.on_challenge_failed = None
         self.is_challeged_success = False
+        self.prepared_battle = None
+        self.cooldown_ends_at = None
+        # 发呆到预布置时间窗口后，冷却结束的时间（scheduler 时钟）；不为 None 时 process 先去预布置
+        self.prearm_cooldown_ends_at = None
+        # VIP boss 刷新前要提前打开页面时，打开后回到的状态；不为 None 时 process 先去打开页面
+        self.prepare_return_state = None
         # self.next_state = None
     def process(self):
+        if self.prepare_return_state is not None:
+            return_state, self.prepare_return_state = self.prepare_return_state, None
+            if self.bot.vip_spawn_scheduler.is_armed(self.union_id):
+                # 还没到刷新时刻：只提前打开页面，再回去等刷新
+                self.prepare()
+                self.set_state(return_state)
+                return
+            # 刷新的定时任务已经触发过了，不用再打开页面，直接挑战
+        if self.prearm_cooldown_ends_at is not None:
+            # 预布置要开页面、选队伍，放在 process 里做（走 run_blocking），不在时间轮回调里阻塞事件循环
+            remaining = max(0, self.prearm_cooldown_ends_at - self.bot.scheduler.clock())
+            self.prearm_cooldown_ends_at = None
+            self.set_state(self.wait_for_cooldown(remaining))
+            return
         union_id = self.union_id
         self.log(f"直接挑战boss {union_id}")
         if not self.advanced_action_config:
             self.log(f'未找到动作配置，没有办法处理boss({union_id})，中止处理。')
             self.is_challaged_success = False
         else:
-            url = f"{self.bot.server_config_manager.current_server_data['url']}index.php?union={union_id}#"
-            # 检查当前URL是否与目标URL相同，如果相同则刷新页面，否则导航到目标URL
-            current_url = self.bot.driver.current_url
-            if current_url == url or (f"union={union_id}" in current_url):
-                self.bot.driver.refresh()
-            else:
-                self.bot.driver.get(url)
-            self.bot.action_manager.execute_advanced_action(self.bot.driver, self.advanced_action_config)
-            self.log(f"锤完了，更新一下信息，看打成功没有（有可能被人抢了）")
-            self.bot._update_info_from_hunt_page()
-            self.is_challaged_success = self.bot.challenge_next_cooldown > 0
+            self._submit_battle(union_id)
+            # 不管哪种方式、有没有确认到结果，都刷新冒险页确认这次挑战的结果
+            self._update_challenge_result()
         self.on_finish()
+
+    def _submit_battle(self, union_id):
+        """提交一次boss战：预先布置的 -> HTTP -> 浏览器
+
+        重复提交会多打一场，只有前一种方式确定没有提交出去（NOT_SENT）时才换下一种
+        """
+        if self.prepared_battle is not None and self._fire_prepared_battle() != NOT_SENT:
+            return
+        result = self.bot.action_manager.execute_by_http(self.advanced_action_config, form_target=f"union={union_id}")
+        if result != NOT_SENT:
+            self.log("已通过 HTTP 提交boss战" if result == CONFIRMED else "已通过 HTTP 提交boss战，没有确认到战斗结果，刷新冒险页确认")
+            self.bot.vip_spawn_scheduler.report_fired(union_id)
+            return
+        url = self._boss_page_url()
+        # 检查当前URL是否与目标URL相同，如果相同则刷新页面，否则导航到目标URL
+        current_url = self.bot.driver.current_url
+        if current_url == url or (f"union={union_id}" in current_url):
+            self.bot.driver.refresh()
+        else:
+            self.bot.driver.get(url)
+        self.bot.action_manager.execute_advanced_action(self.bot.driver, self.advanced_action_config, allow_http=False)
+        self.bot.vip_spawn_scheduler.report_fired(union_id)
+
+    def wait_for_cooldown(self, cooldown_seconds):
+        """boss 挑战还在冷却时调用，返回发呆到冷却结束后再挑战的状态；没有冷却时直接返回自己
+
+        冷却的最后 boss_prearm_seconds 秒内先打开boss页面、选好队伍（prearm），冷却结束时 process 只需要提交战斗；
+        离冷却结束还远时先发呆到这个时间窗口再布置（太早布置的页面会过期，浏览器也一直被占着）
+        """
+        if cooldown_seconds <= 0:
+            return self
+        prearm_seconds = self.bot.auto_bot_config_manager.boss_prearm_seconds
+        idle_state = StateFactory.create_idle_state(self.bot)
+        if prearm_seconds <= 0:
+            idle_state.set_idle_time(cooldown_seconds, partial(self.set_state, self))
+        elif cooldown_seconds > prearm_seconds:
+            idle_state.set_idle_time(cooldown_seconds - prearm_seconds,
+                                     partial(self._switch_to_prearm, prearm_seconds))
+        else:
+            self.prearm(cooldown_seconds)
+            idle_state.set_idle_time(cooldown_seconds, partial(self.set_state, self))
+        return idle_state
+
+    def _switch_to_prearm(self, cooldown_seconds):
+        """时间轮回调：只记下冷却结束时间并切回自己，预布置由下一次 process 来做"""
+        self.prearm_cooldown_ends_at = self.bot.scheduler.clock() + cooldown_seconds
+        self.set_state(self)
+
+    def prearm(self, cooldown_seconds):
+        """预先布置好战斗，cooldown_seconds 秒后冷却结束，布置成功返回 True"""
+        if not self.advanced_action_config:
+            return False
+        try:
+            self.prepared_battle = self.bot.action_manager.prearm_advanced_action(
+                self.bot.driver, self.advanced_action_config,
+                form_target=f"union={self.union_id}", page_url=self._boss_page_url())
+        except Exception as e:
+            self.log(f"预先布置boss({self.union_id})战斗失败，冷却结束后再打开页面: {e}")
+            self.prepared_battle = None
+        if self.prepared_battle is None:
+            return False
+        self.cooldown_ends_at = time.monotonic() + cooldown_seconds
+        self.log(f"已预先布置好boss({self.union_id})的队伍，{cooldown_seconds}秒后冷却结束时提交")
+        return True
+
+    def _fire_prepared_battle(self):
+        prepared_battle, self.prepared_battle = self.prepared_battle, None
+        result = prepared_battle.fire()
+        if result == NOT_SENT:
+            self.log(f"预先布置的战斗没有提交出去，重新提交boss({self.union_id})战")
+            return result
+        self.log(f"已提交预先布置的boss战（{result}），冷却结束到提交用时 {(time.monotonic() - self.cooldown_ends_at) * 1000:.0f}ms")
+        self.bot.vip_spawn_scheduler.report_fired(self.union_id)
+        return result
+
+    def request_prepare(self, return_state):
+        """时间轮回调（VipSpawnScheduler 的 on_prepare）：只切到自己，提前打开页面由下一次 process 来做，做完回到 return_state"""
+        self.prepare_return_state = return_state
+        self.set_state(self)
+
+    def prepare(self):
+        """boss 刷新前调用：浏览器先打开boss页面（走 HTTP 时只预热连接和 cookie），刷新时只需要刷新页面再提交"""
+        union_id = self.union_id
+        if not self.advanced_action_config:
+            return
+        try:
+            if self.bot.action_manager.is_http_enabled_for(self.advanced_action_config):
+                self.bot.http_client.get_page(f"index.php?union={union_id}")
+            else:
+                self.bot.driver.get(self._boss_page_url())
+            self.log(f"已提前打开boss({union_id})页面")
+        except Exception as e:
+            self.log(f"提前打开boss({union_id})页面失败，刷新时再打开: {e}")
+
+    def _boss_page_url(self):
+        return f"{self.bot.server_config_manager.current_server_data['url']}index.php?union={self.union_id}#"
+
+    def _update_challenge_result(self):
+        self.log(f"锤完了，更新一下信息，看打成功没有（有可能被人抢了）")
+        self.bot._update_info_from_hunt_page(force=True)
+        self.is_challaged_success = self.bot.hunt_snapshot.cooldown_seconds > 0
+
     def on_finish(self):
         self.log(f"直接挑战 boss 结束, is_success: {self.is_challaged_success}")
         if self.is_challaged_success:
@@ -1,6 +1,5 @@
 from .base_state import BaseState
 from .state_factory import StateFactory
-import time
 
 class IdleState(BaseState):
 
@@ -8,14 +7,39 @@ class IdleState(BaseState):
         super().__init__(bot)
         self._idle_time = 0
         self._callback = None
+        self._timer = None
         # self.next_state = None
     def process(self):
+        if self._timer is not None:
+            # 已经在时间轮上登记了到期时间，到期后由时间轮回调 on_finish
+            return
         self.log("process: 正在发呆...")
         if self._idle_time > 0:
             self.log(f"即将将发呆{self._idle_time}秒...")
-            time.sleep(self._idle_time)
+            self._timer = self.bot.scheduler.call_later(self._idle_time, self.on_finish)
+            return
         self.on_finish()
 
+    async def process_async(self, runtime):
+        # 登记到期时间本身很快，但 run_once 里的登录检测会访问浏览器
+        if not self.is_waiting():
+            await runtime.run_blocking(self.bot.run_once)
+        if self.is_waiting():
+            await runtime.idle(self.bot)
+
+    def is_waiting(self):
+        return self._timer is not None and self._timer.is_pending
+
+    def wake_up(self, after=0):
+        """把发呆的剩余时间缩短到 after 秒以内（VIP 刷新、配置重新加载等）"""
+        if self.is_waiting() and self._timer.remaining() > after:
+            self.log(f"提前结束发呆，{after:.0f}秒后继续")
+            self.bot.scheduler.reschedule(self._timer, after)
+
+    def cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
     def on_finish(self):
         if self._callback is not None:
             self.log(f"on_finish -> call_back = {self._callback}")
@@ -29,4 +53,4 @@ class IdleState(BaseState):
         self._idle_time = idle_time
         self._callback = callback
 
-        self.log(f"设置发呆时间： {self._idle_time}秒, callback = {self._callback}")
\ No newline at end of file
+        self.log(f"设置发呆时间： {self._idle_time}秒, callback = {self._callback}")
@@ -1,32 +1,49 @@
 from functools import partial
-import time
 
 from scripts.states.directly_challenge_boss_state import DirectlyChallengeBossState
 from .base_state import BaseState
 from .state_factory import StateFactory
-from scripts.boss_battle_manager import BossBattleManager
 import random
-from datetime import datetime
 
 class NormalBossState(BaseState):
+    # 选boss用的存活列表最多允许是几秒前读到的，缓存的快照只推算体力和冷却，存活boss不会跟着变
+    ALIVE_BOSS_MAX_AGE_SECONDS = 1
+
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.is_random_delay_done = False
+
     def process(self):
         """处理普通boss战斗
         Returns:
             str: 下一个游戏状态
         """
+        if self.is_random_delay_done:
+            # delay完后再刷下boss信息（不用缓存，delay期间boss可能被别人打掉了），直接开打
+            self.bot._update_info_from_hunt_page(force=True)
+            self._challenge_alive_boss()
+            self.on_finish()
+            return
+
         # 先刷新页面获取最新状态
         self.bot._update_info_from_hunt_page()
 
         standard_idle_seconds = self.bot.auto_bot_config_manager.idle_seconds_for_challenge_boss
         # 检查冷却时间
-        if self.bot.challenge_next_cooldown > standard_idle_seconds:
+        if self.bot.hunt_snapshot.cooldown_seconds > standard_idle_seconds:
             # 冷却时间还长，去干别的
             idle_state = StateFactory.create_idle_state(self.bot)
             idle_state.set_idle_time(standard_idle_seconds, partial(self.set_state, StateFactory.create_world_pvp_state(self.bot)))
             self.next_state = idle_state
-        elif self.bot.challenge_next_cooldown > 0:
+        elif 0 < self.bot.hunt_snapshot.cooldown_seconds <= self.bot.auto_bot_config_manager.boss_prearm_seconds:
+            # 冷却马上结束，先选好boss、布置好队伍，冷却结束立刻提交
+            self.log(f'Boss挑战冷却还剩{self.bot.hunt_snapshot.cooldown_seconds}秒，预先布置队伍')
+            self._challenge_alive_boss()
+            if isinstance(self.next_state, DirectlyChallengeBossState):
+                self.next_state = self.next_state.wait_for_cooldown(self.bot.hunt_snapshot.cooldown_seconds)
+        elif self.bot.hunt_snapshot.cooldown_seconds > 0:
             # 冷却时间比较短，等一等然后转到prepare boss
-            self.log(f'Boss挑战冷却中，还剩{self.bot.challenge_next_cooldown}秒，等待冷却结束')
+            self.log(f'Boss挑战冷却中，还剩{self.bot.hunt_snapshot.cooldown_seconds}秒，等待冷却结束')
             idle_state = StateFactory.create_idle_state(self.bot)
             idle_state.set_idle_time(standard_idle_seconds, partial(self.set_state, StateFactory.create_prepare_boss_state(self.bot)))
             self.next_state = idle_state
@@ -34,17 +51,13 @@ class NormalBossState(BaseState):
             self.log('没有冷却，开刷普通boss')
             # 由于刚发现游戏版规有禁止按键精灵之类的辅助规则，需要加一些随机延迟来避免太过规律
             # 先丢个随机数看本轮是否要故意delay
-            next_vip_spawn_seconds = 0
-            for vip_boss in self.bot.auto_bot_config_manager.vip_boss_need_watch:
-                next_vip_union_id = vip_boss['union_id']
-                next_vip_boss_battle_info = self.bot.boss_battle_manager.get_next_vip_boss(vip_boss, next_vip_union_id, self.bot.battle_watcher_manager)
-                if next_vip_boss_battle_info:
-                    self.log(f'下一个vip boss是{next_vip_union_id}')
-                    next_spawn_timestamp = next_vip_boss_battle_info['future_unixtime']
-                    next_spawn_time = datetime.fromtimestamp(next_spawn_timestamp / 1000000)
-                    time_until_spawn = (next_spawn_time - datetime.now()).total_seconds()
-                    next_vip_spawn_seconds = int(time_until_spawn)
-                    break
+            server_url = self.bot.server_config_manager.current_server_data['url']
+            # 所有vip boss都查同一份击杀日志索引，日志缓存期内不会重复请求
+            self.bot.vip_spawn_scheduler.update_from_kill_log(
+                self.bot.auto_bot_config_manager.vip_boss_need_watch, self.bot.battle_watcher_manager, f"{server_url}?ulog")
+            next_vip_spawn_seconds = int(self.bot.vip_spawn_scheduler.seconds_until_next_spawn() or 0)
+            if next_vip_spawn_seconds > 0:
+                self.log(f'距离下一个vip boss刷新还有{next_vip_spawn_seconds}秒')
             roll_result = random.randint(0, 100)
             if roll_result <= self.bot.auto_bot_config_manager.challenge_boss_delay_rate:
                 # 再决定要delay多少秒
@@ -52,41 +65,49 @@ class NormalBossState(BaseState):
                 self.log(f'\033[91m({roll_result})本轮有delay {delay_seconds} 秒\033[37m')
                 if next_vip_spawn_seconds > 0:
                     delay_seconds = min(delay_seconds, next_vip_spawn_seconds)
-                time.sleep(delay_seconds)
-                # delay完后再刷下boss信息
-                self.bot._update_info_from_hunt_page()
+                # 不在这里 sleep，交给时间轮，等待期间仍能响应停止和配置重新加载
+                self.is_random_delay_done = True
+                idle_state = StateFactory.create_idle_state(self.bot)
+                idle_state.set_idle_time(delay_seconds, partial(self.set_state, self))
+                self.next_state = idle_state
             else:
                 self.log(f'\033[91m({roll_result})本轮没有delay\033[37m')
+                self._challenge_alive_boss()
 
-            is_challenged = False
-            for boss in self.bot.auto_bot_config_manager.normal_boss_loop_order:
-                if boss['union_id'] not in self.bot.battle_watcher_manager.get_all_alive_boss():
-                    self.log(f'普通boss {boss["union_id"]} 未出现，跳过')
-                    continue
-                else:
-                    self.log(f'普通boss {boss["union_id"]} 已出现，尝试处理')
-                    # 执行boss战斗动作
-                    action = self.bot.server_config_manager.all_action_config_by_server.get(f"{boss['plan_action_id']}")
-                    # 检查等级是否溢出
-                    if self._check_is_action_level_exceed_boss_limit(boss['plan_action_id'], boss['union_id']):
-                        self.log(f'角色总等级溢出，无法处理boss({boss["union_id"]})，跳过。')
-                        continue
-                    directly_challenge_boss_state = StateFactory.create_directly_challenge_boss_state(self.bot)
-                    if isinstance(directly_challenge_boss_state, DirectlyChallengeBossState):
-                        directly_challenge_boss_state.union_id = boss['union_id']
-                        directly_challenge_boss_state.advanced_action_config = action
-                        directly_challenge_boss_state.on_challenge_success = self._on_challenge_normal_boss_success
-                        directly_challenge_boss_state.on_challenge_failed = self._on_challenge_normal_boss_failed
-                        self.next_state = directly_challenge_boss_state
-                        is_challenged = True
-                        break
-            # 如果没有可以打的boss，进入PVP状态 
-            if not is_challenged:
-                self.log(f'没有普通boss需要处理, 普通boss清单：{self.bot.auto_bot_config_manager.normal_boss_loop_order}')
-                self.next_state = StateFactory.create_world_pvp_state(self.bot)
-            
         self.on_finish()
 
+    def _challenge_alive_boss(self):
+        """按普通boss清单找第一个存活且能打的boss，设置 next_state"""
+        if self.bot.hunt_snapshot.age_seconds > self.ALIVE_BOSS_MAX_AGE_SECONDS:
+            # 手上的是缓存推算出来的快照，存活boss可能已经过期，重新读一次页面再选
+            self.bot._update_info_from_hunt_page(force=True)
+        is_challenged = False
+        for boss in self.bot.auto_bot_config_manager.normal_boss_loop_order:
+            if boss['union_id'] not in self.bot.hunt_snapshot.alive_boss_ids:
+                self.log(f'普通boss {boss["union_id"]} 未出现，跳过')
+                continue
+            else:
+                self.log(f'普通boss {boss["union_id"]} 已出现，尝试处理')
+                # 执行boss战斗动作
+                action = self.bot.server_config_manager.all_action_config_by_server.get(f"{boss['plan_action_id']}")
+                # 检查等级是否溢出
+                if self._check_is_action_level_exceed_boss_limit(boss['plan_action_id'], boss['union_id']):
+                    self.log(f'角色总等级溢出，无法处理boss({boss["union_id"]})，跳过。')
+                    continue
+                directly_challenge_boss_state = StateFactory.create_directly_challenge_boss_state(self.bot)
+                if isinstance(directly_challenge_boss_state, DirectlyChallengeBossState):
+                    directly_challenge_boss_state.union_id = boss['union_id']
+                    directly_challenge_boss_state.advanced_action_config = action
+                    directly_challenge_boss_state.on_challenge_success = self._on_challenge_normal_boss_success
+                    directly_challenge_boss_state.on_challenge_failed = self._on_challenge_normal_boss_failed
+                    self.next_state = directly_challenge_boss_state
+                    is_challenged = True
+                    break
+        # 如果没有可以打的boss，进入PVP状态 
+        if not is_challenged:
+            self.log(f'没有普通boss需要处理, 普通boss清单：{self.bot.auto_bot_config_manager.normal_boss_loop_order}')
+            self.next_state = StateFactory.create_world_pvp_state(self.bot)
+
     def on_finish(self):
         self.set_state(self.next_state)
 
@@ -102,8 +123,7 @@ class NormalBossState(BaseState):
         self.on_finish()
 
     def _check_is_action_level_exceed_boss_limit(self, action_id, boss_id):
-        manager = BossBattleManager()
-        # action_id = "600080"  # 一服鸟毛
-        result = manager.is_action_level_exceed_boss_limit(action_id, boss_id)  # 鳥巢
-        print(f"动作(ID:{action_id})中角色等级之和是否超过Boss(ID:8)等级限制: {result}")
+        # 用 Bot 上设置过服务器ID的实例，配置索引在多次调用之间复用
+        result = self.bot.boss_battle_manager.is_action_level_exceed_boss_limit(action_id, boss_id)
+        print(f"动作(ID:{action_id})中角色等级之和是否超过Boss(ID:{boss_id})等级限制: {result}")
         return result
\ No newline at end of file
@@ -1,23 +1,22 @@
 from .base_state import BaseState
 from .state_factory import StateFactory
-import time
 
 class NormalStageState(BaseState):
     def process(self):
         self.log('开始处理普通关卡')
+        # 只在开始时读一次冒险页，之后按每场消耗在本地扣体力，不再每打一场都刷新
+        self.bot._update_info_from_hunt_page()
+        player_stamina = self.bot.hunt_snapshot.stamina or 0
         for stage in self.bot.auto_bot_config_manager.normal_stage_loop_order:
-            self.bot._update_info_from_hunt_page()
-            player_stamina = self.bot.battle_watcher_manager.get_player_stamina()
             if (player_stamina < self.bot.auto_bot_config_manager.keep_stamnia_for_normal_stage):
+                # 体力只会越打越少，后面的小怪也打不了，交给 PrepareStage 重新读页面决定去向
                 self.log(f'体力不足打小怪...')
-                # 体力不足以打小怪的时候，设定一定等待时间，避免切换状态过快
-                time.sleep(5)
-                continue
+                break
             advanced_action_config = self.bot.server_config_manager.all_action_config_by_server.get(f"{stage['plan_action_id']}")
             if advanced_action_config:
                 self.log(f'进行普通小怪挑战：{stage["plan_action_id"]}')
                 self.bot.action_manager.execute_advanced_action(self.bot.driver, advanced_action_config)
-                # time.sleep(1)
+                player_stamina -= self.bot.auto_bot_config_manager.stage_cost_stamina
         self.next_state = StateFactory.create_prepare_stage_state(self.bot)
         self.on_finish()
 
@@ -14,10 +14,12 @@ class PrepareBossState(BaseState):
         self.log('开始处理boss战斗')
         # 检查挑战boss冷却时间
         self.bot._update_info_from_hunt_page()
+        snapshot = self.bot.hunt_snapshot
+        stamina = snapshot.stamina or 0
         
         # 如果体力不足，但这是个小概率事件
-        if self.bot.player_stamina < self.bot.auto_bot_config_manager.boss_cost_stamina:
-            recover_time = self.bot._get_recover_stamina_time(self.bot.player_stamina, self.bot.auto_bot_config_manager.boss_cost_stamina)
+        if stamina < self.bot.auto_bot_config_manager.boss_cost_stamina:
+            recover_time = self.bot._get_recover_stamina_time(stamina, self.bot.auto_bot_config_manager.boss_cost_stamina)
             self.log(f'体力不足，无法挑战boss，等待{recover_time}秒后重试')
             idle_state = StateFactory.create_idle_state(self.bot)
             idle_state.set_idle_time(recover_time, partial(self.set_state, state = StateFactory.create_prepare_boss_state(self.bot)))
@@ -25,27 +27,30 @@ class PrepareBossState(BaseState):
             return
         
         # 处理冷却时间
-        if self.bot.challenge_next_cooldown > 0:
+        if snapshot.cooldown_seconds > 0:
             idle_state = StateFactory.create_idle_state(self.bot)
             standard_idle_seconds = self.bot.auto_bot_config_manager.idle_seconds_for_challenge_boss
             # 冷却时间还久的很
-            if self.bot.challenge_next_cooldown >= standard_idle_seconds:
+            if snapshot.cooldown_seconds >= standard_idle_seconds:
                 # 如果在冷却中，去干点别的
                 next_challange_real_time = datetime.fromtimestamp(time.time()).strftime('%Y-%m-%d %H:%M:%S.%f')
-                self.log(f'BOSS冷却还早，当前体力：{self.bot.player_stamina}，下次boss挑战时间：{next_challange_real_time}，于是去干别的')
+                self.log(f'BOSS冷却还早，当前体力：{stamina}，下次boss挑战时间：{next_challange_real_time}，于是去干别的')
                 # self._set_state(self.GAME_STATE_PVP)
                 idle_state.set_idle_time(standard_idle_seconds, partial(self.set_state, state = StateFactory.create_world_pvp_state(self.bot)))
                 self.set_state(idle_state)
                 return
                 
             # 耐心等一下就能打boss了
-            else:
-                self.log(f'Boss挑战冷却中，还剩{self.bot.challenge_next_cooldown}秒，等待冷却结束')
-                idle_state.set_idle_time(self.bot.challenge_next_cooldown, partial(self.set_state, state = StateFactory.create_prepare_boss_state(self.bot)))
+            # 等VIP的时候不预先布置，冷却结束后交给等VIP的流程
+            prearm_seconds = 0 if self.bot.is_waiting_for_vip_boss else self.bot.auto_bot_config_manager.boss_prearm_seconds
+            if snapshot.cooldown_seconds > prearm_seconds:
+                self.log(f'Boss挑战冷却中，还剩{snapshot.cooldown_seconds}秒，等待冷却结束')
+                idle_state.set_idle_time(snapshot.cooldown_seconds - prearm_seconds, partial(self.set_state, state = StateFactory.create_prepare_boss_state(self.bot)))
                 self.set_state(idle_state)
                 return
-        
-        self.log('没有冷却时间，进入boss选择流程')
+            self.log(f'Boss挑战冷却还剩{snapshot.cooldown_seconds}秒，先进入boss选择流程预先布置队伍')
+        else:
+            self.log('没有冷却时间，进入boss选择流程')
         
         if self.bot.is_waiting_for_vip_boss:
             # 如果正在等待vipboss，则交出管辖权
@@ -11,7 +11,7 @@ class PrepareStageState(BaseState):
         self.log('开始处理小怪战斗')
         # 刷一下战斗界面，看看剩余体力
         self.bot._update_info_from_hunt_page()
-        player_stamina = self.bot.battle_watcher_manager.get_player_stamina()
+        player_stamina = self.bot.hunt_snapshot.stamina or 0
         current_minute = datetime.now().minute
         in_time_limited_stage = False
         if self.bot.auto_bot_config_manager.is_challenge_time_limited_stage and self.bot.auto_bot_config_manager.time_limited_stage_need_watch:
@@ -1,6 +1,7 @@
 from datetime import datetime
 from .base_state import BaseState
 from .state_factory import StateFactory
+from scripts.hunt_page_parser import find_entries
 
 class TimeLimitedStageState(BaseState):
     def process(self):
@@ -41,8 +42,13 @@ class TimeLimitedStageState(BaseState):
                     state_name = stage.get('state_name')
                     if state_name:
                         value = f"common={state_name}"
-                        elements = self.bot.driver.find_elements('xpath', f"//a[contains(@onclick, '{value}')]")
-                        if not elements:
+                        # 冒险页是通过 HTTP 读取的，浏览器不一定停在冒险页，优先查最近一次的冒险页源码
+                        hunt_html = self.bot.last_hunt_page_html
+                        if hunt_html:
+                            has_entry = value in find_entries(hunt_html)
+                        else:
+                            has_entry = bool(self.bot.driver.find_elements('xpath', f"//a[contains(@onclick, '{value}')]"))
+                        if not has_entry:
                             self.log(f"当前页面未找到关卡入口: {value}")
                             self.next_state = StateFactory.create_normal_stage_state(self.bot)
                         else:
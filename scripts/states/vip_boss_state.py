@@ -28,11 +28,11 @@ class VipBossState(BaseState):
                 self.log(f'未找到动作配置，id: {plan_action_id} ，没有办法处理boss({union_id})，找下一条vip boss。')
                 continue
             # 检查VIP boss是否出现
-            if union_id in self.bot.all_alived_boss_ids:
+            if union_id in self.bot.hunt_snapshot.alive_boss_ids:
                 # 活着，试着直接干它
                 self.log(f'VIP boss {union_id} 已出现，BEAT IT！！！')
                 directly_challenge_boss_state = self._create_dicrect_challenge_boss_state(union_id, advanced_action_config)
-                self.set_state(directly_challenge_boss_state)
+                self.set_state(directly_challenge_boss_state.wait_for_cooldown(self.bot.hunt_snapshot.cooldown_seconds))
                 return
             else:
                 # 去战报里查vip boss被击败的时间
@@ -53,7 +53,7 @@ class VipBossState(BaseState):
                     if time_until_spawn <= 0:
                         # 说明可能过期了，死马当活马医，试着直接打一下
                         directly_challenge_boss_state = self._create_dicrect_challenge_boss_state(union_id, advanced_action_config)
-                        self.set_state(directly_challenge_boss_state)
+                        self.set_state(directly_challenge_boss_state.wait_for_cooldown(self.bot.hunt_snapshot.cooldown_seconds))
                         return
                     elif time_until_spawn <= wait_time:
                         # 等待时间较少（20分钟内）
@@ -64,6 +64,12 @@ class VipBossState(BaseState):
                         self.bot.set_next_vip_boss_spawn_timestamp(union_id, next_spawn_timestamp)
                         wait_vip_boss_state = StateFactory.create_wait_vip_boss_state(self.bot)
                         directly_challenge_boss_state = self._create_dicrect_challenge_boss_state(union_id, advanced_action_config)
+                        # 刷新前切到挑战状态提前打开boss页面（打开后回来接着等），刷新时刻由时间轮直接切到挑战状态
+                        self.bot.vip_spawn_scheduler.arm(
+                            union_id, next_spawn_timestamp / 1000000,
+                            self.bot.auto_bot_config_manager.vip_boss_prepare_lead_seconds,
+                            on_prepare=partial(directly_challenge_boss_state.request_prepare, wait_vip_boss_state),
+                            on_spawn=partial(self.set_state, directly_challenge_boss_state))
                         wait_vip_boss_state.on_challenge_time_up = partial(wait_vip_boss_state.set_state, directly_challenge_boss_state)
                         self.set_state(wait_vip_boss_state)
                         return
@@ -104,7 +110,7 @@ class VipBossState(BaseState):
 
     def _get_next_vip_boss(self, vip_boss_dict: Dict, union_id):
         # 使用BossBattleManager的get_next_vip_boss方法
-        # 为vip_boss_dict添加server_url
-        vip_boss_dict['server_url'] = self.bot.server_config_manager.current_server_data['url']
+        # 为vip_boss_dict添加server_url（复制一份，不改动配置本身）
+        vip_boss_dict = dict(vip_boss_dict, server_url=self.bot.server_config_manager.current_server_data['url'])
         next_battle_info = self.bot.boss_battle_manager.get_next_vip_boss(vip_boss_dict, union_id, self.bot.battle_watcher_manager)
         return next_battle_info
@@ -6,6 +6,7 @@ from .state_factory import StateFactory
 import time
 
 class WaitVipBossState(BaseState):
+    SPAWN_FALLBACK_GRACE_SECONDS = 1
 
     def __init__(self, bot: HofAutoBot):
         super().__init__(bot)
@@ -36,13 +37,15 @@ class WaitVipBossState(BaseState):
             standard_idle_seconds = self.bot.auto_bot_config_manager.idle_seconds_for_challenge_vip_boss
             if diff_seconds > standard_idle_seconds:
                 # 时间还早（大于40秒）
-                next_active_time = datetime.now() + timedelta(seconds=standard_idle_seconds)
                 self.log("在等vip boss，但时间太久了，干点别的去，省的被踢掉！")
-                self.log(f"...但也不能刷太快，等（{next_active_time}）继续行动")
-                # 留10秒钟左右
-                idle_time = min(standard_idle_seconds - 14, diff_time.total_seconds())
-                idle_time = max(idle_time, 0)
-                idle_state.set_idle_time(idle_time, partial(self.set_state, state = StateFactory.create_prepare_stage_state(self.bot)))
+                time_before_window = diff_seconds - standard_idle_seconds
+                if time_before_window > standard_idle_seconds:
+                    next_active_time = datetime.now() + timedelta(seconds=standard_idle_seconds)
+                    self.log(f"...但也不能刷太快，等（{next_active_time}）继续行动")
+                    idle_state.set_idle_time(standard_idle_seconds, partial(self.set_state, state = StateFactory.create_prepare_stage_state(self.bot)))
+                else:
+                    # 不够再干一轮别的了，发呆到刚好进入最后一个窗口，再回来等刷新
+                    idle_state.set_idle_time(time_before_window, partial(self.set_state, state = StateFactory.create_wait_vip_boss_state(self.bot)))
                 self.next_state = idle_state
             elif diff_seconds < 0:
                 self.next_state = StateFactory.create_prepare_boss_state(self.bot)
@@ -52,7 +55,12 @@ class WaitVipBossState(BaseState):
                     self.set_state(StateFactory.create_wait_vip_boss_state(self.bot)),
                     self._invoke_challenge_time_up()
                 }
-                idle_state.set_idle_time(diff_seconds, after_idle_callback)
+                if self.bot.vip_spawn_scheduler.is_armed(self.bot.next_vip_boss_id):
+                    # 刷新时刻由 VipSpawnScheduler 的定时任务直接切到挑战状态（会取消这里的发呆），
+                    # 这里的回调只是兜底，晚一点到期，避免和它同时触发打两次
+                    idle_state.set_idle_time(diff_seconds + self.SPAWN_FALLBACK_GRACE_SECONDS, after_idle_callback)
+                else:
+                    idle_state.set_idle_time(diff_seconds, after_idle_callback)
                 self.next_state = idle_state
         self.on_finish()
 
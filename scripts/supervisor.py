@@ -0,0 +1,299 @@
+import os
+import sys
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import json
+import time
+import signal
+import argparse
+import multiprocessing
+from queue import Empty
+from scripts.log_manager import LogManager
+from scripts.server_config_manager import ServerConfigManager
+
+DEFAULT_SUPERVISOR_CONFIG = {
+    "max_workers": 8,
+    "start_interval_sec": 5.0,
+    "restart_backoff_sec": 10.0,
+    "restart_backoff_max_sec": 900.0,
+    "stable_after_sec": 600.0,
+    "server_ids": [],
+}
+STATUS_FILE = os.path.join(project_root, "supervisor_status.json")
+PID_FILE = os.path.join(project_root, "hof_supervisor.pid")
+
+
+class _QueueStatusSignal:
+    """替代 BotThread 的 pyqtSignal，把 Bot 的状态更新发回主进程"""
+
+    def __init__(self, queue, server_id):
+        self.queue = queue
+        self.server_id = server_id
+
+    def emit(self, status_info):
+        try:
+            self.queue.put_nowait((self.server_id, dict(status_info, time=time.time())))
+        except Exception:
+            pass
+
+
+def run_bot_worker(server_id, status_queue, headless=True):
+    """子进程入口：借一个浏览器，初始化 HofAutoBot 并一直运行，登录由 ReconnectState 自动完成"""
+    # SIGTERM 转成正常退出，保证 cleanup 和 DriverPool 的 atexit 能关掉浏览器
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    from scripts.hof_auto_bot_main import HofAutoBot
+    from scripts.driver_pool import DriverPool
+
+    bot = HofAutoBot()
+    bot.status_update_signal = _QueueStatusSignal(status_queue, server_id)
+    try:
+        bot.initialize_with_driver(server_id, DriverPool.get_instance(headless=headless).acquire())
+        bot.run()
+    finally:
+        bot.cleanup()
+
+
+class WorkerRecord:
+    """一个账号（server_address.json 中的一条服务器配置）对应的子进程状态"""
+
+    def __init__(self, server):
+        self.server_id = server["id"]
+        self.name = server.get("name", str(self.server_id))
+        self.process = None
+        self.status = "pending"
+        self.started_at = None
+        self.next_start_at = 0.0
+        self.restart_count = 0
+        self.consecutive_failures = 0
+        self.last_exit_code = None
+        self.last_bot_status = {}
+
+    def to_dict(self):
+        return {
+            "server_id": self.server_id,
+            "name": self.name,
+            "status": self.status,
+            "pid": self.process.pid if self.process is not None else None,
+            "restart_count": self.restart_count,
+            "last_exit_code": self.last_exit_code,
+            "next_start_at": self.next_start_at if self.status == "backoff" else None,
+            "bot": self.last_bot_status,
+        }
+
+
+class BotSupervisor:
+    """在一个进程池里同时运行多个账号的 HofAutoBot
+
+    每个账号一个子进程（各自持有一个无头浏览器），同时运行的数量不超过 max_workers，
+    启动之间间隔 start_interval_sec 避免同时登录；子进程退出后按指数退避重启，
+    稳定运行超过 stable_after_sec 后退避次数清零。汇总状态写入 supervisor_status.json。
+    """
+
+    def __init__(self, servers, config=None, headless=True, process_factory=None, clock=time.monotonic):
+        self.config = dict(DEFAULT_SUPERVISOR_CONFIG, **(config or {}))
+        self.headless = headless
+        self.clock = clock
+        self.logger = LogManager.get_instance()
+        ctx = multiprocessing.get_context("spawn")
+        self.status_queue = ctx.Queue()
+        self.process_factory = process_factory or ctx.Process
+        self.workers = [WorkerRecord(s) for s in servers]
+        self.last_start_at = None
+        self.is_stopping = False
+
+    @classmethod
+    def from_server_config(cls, server_ids=None, headless=True):
+        """根据 server_address.json 创建，默认运行所有配置了 account_config.json 的服务器"""
+        all_server_info = ServerConfigManager().get_all_server_info_config() or {}
+        config = all_server_info.get("supervisor", {})
+        server_ids = server_ids or config.get("server_ids") or []
+        servers = []
+        for server in all_server_info.get("server_address", []):
+            if server_ids and server["id"] not in server_ids:
+                continue
+            if not os.path.exists(os.path.join(project_root, server["config_path"], "account_config.json")):
+                LogManager.get_instance().warning(f'{server["name"]} 没有 account_config.json，跳过')
+                continue
+            servers.append(server)
+        return cls(servers, config=config, headless=headless)
+
+    def backoff_seconds(self, failures):
+        """第 n 次连续失败后的等待时间：restart_backoff_sec * 2^(n-1)，不超过 restart_backoff_max_sec"""
+        base = float(self.config["restart_backoff_sec"])
+        return min(base * (2 ** max(0, failures - 1)), float(self.config["restart_backoff_max_sec"]))
+
+    def running_count(self):
+        return sum(1 for w in self.workers if w.status == "running")
+
+    def _start(self, worker):
+        worker.process = self.process_factory(
+            target=run_bot_worker,
+            args=(worker.server_id, self.status_queue, self.headless),
+            name=f"hof-bot-{worker.server_id}",
+            daemon=False,
+        )
+        worker.process.start()
+        worker.status = "running"
+        worker.started_at = self.clock()
+        self.last_start_at = worker.started_at
+        self.logger.info(f"[supervisor] 启动 {worker.name}, pid={worker.process.pid}")
+
+    def _on_exit(self, worker):
+        now = self.clock()
+        worker.last_exit_code = worker.process.exitcode
+        if now - worker.started_at >= float(self.config["stable_after_sec"]):
+            worker.consecutive_failures = 0
+        worker.consecutive_failures += 1
+        worker.restart_count += 1
+        delay = self.backoff_seconds(worker.consecutive_failures)
+        worker.status = "backoff"
+        worker.next_start_at = now + delay
+        worker.process = None
+        self.logger.warning(f"[supervisor] {worker.name} 退出(exitcode={worker.last_exit_code})，{delay:.0f}s 后重启")
+
+    def _drain_status_queue(self):
+        by_id = {w.server_id: w for w in self.workers}
+        while True:
+            try:
+                server_id, status_info = self.status_queue.get_nowait()
+            except Empty:
+                return
+            except Exception:
+                return
+            if server_id in by_id:
+                by_id[server_id].last_bot_status = status_info
+
+    def poll(self):
+        """检查一次所有子进程：回收退出的、按退避时间和并发上限启动等待中的"""
+        self._drain_status_queue()
+        now = self.clock()
+        for worker in self.workers:
+            if worker.status == "running" and not worker.process.is_alive():
+                worker.process.join(timeout=0)
+                self._on_exit(worker)
+        if self.is_stopping:
+            return
+        for worker in self.workers:
+            if worker.status not in ("pending", "backoff") or now < worker.next_start_at:
+                continue
+            if self.running_count() >= int(self.config["max_workers"]):
+                break
+            if self.last_start_at is not None and now - self.last_start_at < float(self.config["start_interval_sec"]):
+                break
+            self._start(worker)
+
+    def get_status(self):
+        """汇总状态，GUI/命令行都可以直接展示"""
+        return {
+            "updated_at": time.time(),
+            "running": self.running_count(),
+            "total": len(self.workers),
+            "workers": [w.to_dict() for w in self.workers],
+        }
+
+    def write_status(self, path=STATUS_FILE):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.get_status(), f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            self.logger.error(f"[supervisor] 写入状态文件失败: {e}")
+
+    def stop(self, timeout=10.0):
+        """停止所有子进程，先 SIGTERM 让 Bot 自己关闭浏览器，超时再强制结束"""
+        self.is_stopping = True
+        for worker in self.workers:
+            if worker.process is not None and worker.process.is_alive():
+                worker.process.terminate()
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            if worker.process is not None:
+                worker.process.join(timeout=max(0.0, deadline - time.monotonic()))
+                if worker.process.is_alive():
+                    worker.process.kill()
+            worker.status = "stopped"
+
+    def run_forever(self, poll_interval=1.0, status_interval=10.0):
+        last_status_at = 0.0
+        try:
+            while not self.is_stopping:
+                self.poll()
+                if time.monotonic() - last_status_at >= status_interval:
+                    self.write_status()
+                    last_status_at = time.monotonic()
+                time.sleep(poll_interval)
+        finally:
+            self.stop()
+            self.write_status()
+
+
+def format_status(status):
+    lines = [f'运行中 {status["running"]}/{status["total"]}']
+    for w in status["workers"]:
+        bot = w.get("bot") or {}
+        lines.append(
+            f'  [{w["server_id"]}] {w["name"]}: {w["status"]}, pid={w["pid"]}, 重启={w["restart_count"]}, '
+            f'state={bot.get("state")}, 体力={bot.get("stamina")}, 冷却={bot.get("cooldown")}'
+        )
+    return "\n".join(lines)
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="多账号守护进程：在一个进程池里运行多个服务器/账号的 Bot",
+        formatter_class=argparse.RawTextHelpFormatter,
+        epilog=(
+            "示例用法:\n"
+            "  运行 server_address.json 中所有配置了账号的服务器:\n"
+            "    python -m scripts.supervisor\n"
+            "  只运行指定服务器:\n"
+            "    python -m scripts.supervisor --server-id 1 --server-id 2\n"
+            "  查看汇总状态:\n"
+            "    python -m scripts.supervisor --status\n"
+            "  停止守护进程:\n"
+            "    python -m scripts.supervisor --stop\n"
+        )
+    )
+    p.add_argument("--server-id", type=int, action="append", help="只运行指定服务器，可重复；默认读取 supervisor.server_ids")
+    p.add_argument("--no-headless", action="store_true", help="显示浏览器界面")
+    p.add_argument("--status", action="store_true", help="查看汇总状态")
+    p.add_argument("--stop", action="store_true", help="停止正在运行的守护进程")
+    args = p.parse_args()
+
+    if args.status:
+        try:
+            with open(STATUS_FILE, "r", encoding="utf-8") as f:
+                print(format_status(json.load(f)))
+        except Exception:
+            print("未运行或状态文件不存在")
+        return
+    if args.stop:
+        try:
+            with open(PID_FILE, "r", encoding="utf-8") as f:
+                os.kill(int(f.read().strip()), signal.SIGTERM)
+            print("已发送停止信号")
+        except Exception as e:
+            print(f"停止失败: {e}")
+        return
+
+    supervisor = BotSupervisor.from_server_config(server_ids=args.server_id, headless=not args.no_headless)
+    if not supervisor.workers:
+        print("没有可运行的账号")
+        return
+
+    def _handle_signal(signum, frame):
+        supervisor.is_stopping = True
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+    with open(PID_FILE, "w", encoding="utf-8") as f:
+        f.write(str(os.getpid()))
+    try:
+        supervisor.run_forever()
+    finally:
+        if os.path.exists(PID_FILE):
+            os.remove(PID_FILE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from scripts.log_manager import LogManager
+
+
+class TimerHandle:
+    """call_later 返回的句柄，可以取消或提前触发"""
+
+    def __init__(self, wheel, deadline, callback, args):
+        self.wheel = wheel
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.tick = None
+        self.is_cancelled = False
+        self.is_fired = False
+
+    @property
+    def is_pending(self):
+        return not self.is_cancelled and not self.is_fired
+
+    def remaining(self):
+        return max(0.0, self.deadline - self.wheel.clock())
+
+    def cancel(self):
+        self.wheel.cancel(self)
+
+    def fire_now(self):
+        """提前到期（下一次 advance 时触发）"""
+        self.wheel.reschedule(self, 0)
+
+
+class TimerWheel:
+    """基于单调时钟的时间轮调度器
+
+    定时任务按到期 tick 放入 slot_count 个槽中，插入/取消是 O(1)，推进只扫描经过的槽；
+    回调总是在调用 advance()/wait() 的线程里执行，所以同一个时间轮上的 Bot 不需要加锁。
+    wait() 会一直睡到最近的到期时间，期间 wakeup() 或新加入更早的任务都会让它立刻返回，
+    因此停止、暂停、重新加载配置可以在毫秒级生效，而不用等一个几百秒的 time.sleep。
+    """
+
+    def __init__(self, tick_sec=0.1, slot_count=512, clock=time.monotonic):
+        self.tick_sec = tick_sec
+        self.slot_count = slot_count
+        self.clock = clock
+        self._slots = [[] for _ in range(slot_count)]
+        self._current_tick = self._tick_of(clock())
+        self._pending_count = 0
+        self._is_woken = False
+        self._cond = threading.Condition()
+        self._listeners = []
+        self.logger = LogManager.get_instance()
+
+    def add_listener(self, listener):
+        """任务变化或 wakeup 时调用 listener()，供 asyncio 运行时等不阻塞线程的等待方使用"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self):
+        self._cond.notify_all()
+        for listener in list(self._listeners):
+            listener()
+
+    def _tick_of(self, deadline):
+        return math.ceil(deadline / self.tick_sec)
+
+    def _insert(self, handle):
+        handle.tick = max(self._tick_of(handle.deadline), self._current_tick)
+        self._slots[handle.tick % self.slot_count].append(handle)
+        self._pending_count += 1
+
+    def _remove(self, handle):
+        slot = self._slots[handle.tick % self.slot_count]
+        if handle in slot:
+            slot.remove(handle)
+            self._pending_count -= 1
+
+    def call_later(self, delay, callback, *args):
+        """delay 秒后执行 callback(*args)，返回 TimerHandle"""
+        with self._cond:
+            handle = TimerHandle(self, self.clock() + max(0.0, delay), callback, args)
+            self._insert(handle)
+            self._notify()
+            return handle
+
+    def cancel(self, handle):
+        with self._cond:
+            if handle.is_pending:
+                self._remove(handle)
+                handle.is_cancelled = True
+                self._notify()
+
+    def reschedule(self, handle, delay):
+        """修改一个未触发任务的到期时间（delay=0 即提前唤醒）"""
+        with self._cond:
+            if not handle.is_pending:
+                return False
+            self._remove(handle)
+            handle.deadline = self.clock() + max(0.0, delay)
+            self._insert(handle)
+            self._notify()
+            return True
+
+    @property
+    def pending_count(self):
+        return self._pending_count
+
+    def next_deadline(self):
+        """最近一个任务的到期时间（单调时钟），没有任务返回 None"""
+        with self._cond:
+            if self._pending_count == 0:
+                return None
+            for offset in range(self.slot_count):
+                tick = self._current_tick + offset
+                due = [h.deadline for h in self._slots[tick % self.slot_count] if h.tick == tick]
+                if due:
+                    return min(due)
+            # 所有任务都在一圈之后
+            return min(h.deadline for slot in self._slots for h in slot)
+
+    def advance(self):
+        """触发所有已到期的任务，返回触发的个数"""
+        now = self.clock()
+        now_tick = self._tick_of(now)
+        due = []
+        with self._cond:
+            if self._pending_count:
+                ticks = range(self._current_tick, now_tick + 1)
+                if len(ticks) > self.slot_count:
+                    ticks = range(now_tick - self.slot_count + 1, now_tick + 1)
+                for tick in ticks:
+                    slot = self._slots[tick % self.slot_count]
+                    if not slot:
+                        continue
+                    # 同一个槽里还有下几圈才到期的任务，按到期时间精确判断
+                    ready = [h for h in slot if h.deadline <= now]
+                    for h in ready:
+                        slot.remove(h)
+                        h.is_fired = True
+                    self._pending_count -= len(ready)
+                    due.extend(ready)
+            self._current_tick = now_tick
+        due.sort(key=lambda h: h.deadline)
+        for handle in due:
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                self.logger.error(f'定时任务执行失败: {e}')
+        return len(due)
+
+    def wakeup(self):
+        """让正在 wait() 的线程立刻返回"""
+        with self._cond:
+            self._is_woken = True
+            self._notify()
+
+    def wait(self, max_wait=None):
+        """睡到最近的任务到期（最多 max_wait 秒，或被 wakeup 提前唤醒），然后触发到期任务"""
+        with self._cond:
+            while not self._is_woken:
+                deadline = self.next_deadline()
+                timeout = max_wait
+                if deadline is not None:
+                    until_due = deadline - self.clock()
+                    if until_due <= 0:
+                        break
+                    timeout = until_due if timeout is None else min(timeout, until_due)
+                if timeout is not None and timeout <= 0:
+                    break
+                start = self.clock()
+                if not self._cond.wait(timeout):
+                    break
+                if max_wait is not None:
+                    max_wait = max(0.0, max_wait - (self.clock() - start))
+            self._is_woken = False
+        return self.advance()
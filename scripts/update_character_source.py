@@ -3,7 +3,7 @@
 
 import os
 import json
-from bs4 import BeautifulSoup
+from scripts.page_extractors import extract_character_list_html
 
 # 配置
 CHARACTER_PAGE_URL = 'index.php#'
@@ -29,17 +29,14 @@ def update_character_source(driver, server):
         else:
             driver.get(source_url)
         
-        # 使用BeautifulSoup解析页面源码
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        # 提取目标div内容
-        content_div = soup.find('div', id='Jq_Conten')
-        if not content_div:
+        # 只在页面里取出目标div的HTML，不传回整个页面源码
+        content_html = extract_character_list_html(driver)
+        if not content_html:
             raise ValueError('未找到目标内容块(div id="Jq_Conten")')
         
         # 保存到文件
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(str(content_div))
+            f.write(content_html)
             
         print(f'成功更新角色数据源文件: {output_file}')
         return True
@@ -0,0 +1,79 @@
+import time
+from typing import Dict, Optional
+from scripts.log_manager import LogManager
+
+
+class VipSpawnScheduler:
+    """VIP boss 刷新时间表和刷新时刻的精确唤醒
+
+    next_spawns 保存 {union_id: 下次刷新时间（unix 秒）}，由击杀日志里最近一次记录 + kill_cooldown_seconds 推算。
+    arm() 在 Bot 的时间轮（单调时钟）上登记两个定时任务：
+    刷新前 lead_seconds 秒调用 on_prepare（预先打开boss页面 / 预热连接），刷新时刻调用 on_spawn（提交战斗）。
+    时间轮在 Bot 发呆时按到期时间精确唤醒，不再依赖 WaitVipBossState 的粗粒度轮询。
+    """
+
+    def __init__(self, scheduler, wall_clock=time.time):
+        self.scheduler = scheduler
+        self.wall_clock = wall_clock
+        self.logger = LogManager.get_instance()
+        self.next_spawns: Dict[int, float] = {}
+        self.armed_union_id = None
+        self.armed_spawn_at = None
+        self._prepare_handle = None
+        self._spawn_handle = None
+
+    def set_next_spawn(self, union_id, spawn_at):
+        self.next_spawns[union_id] = spawn_at
+
+    def update_from_kill_log(self, vip_bosses, battle_watcher_manager, log_url):
+        """按击杀日志刷新所有 VIP boss 的下次刷新时间（共用一份日志索引，只请求一次），返回 next_spawns"""
+        for vip_boss in vip_bosses:
+            union_id = vip_boss['union_id']
+            latest = battle_watcher_manager.get_boss_latest_kill_timestamp(union_id, log_url)
+            if latest is None:
+                continue
+            kill_cooldown = vip_boss.get('kill_cooldown_seconds', 14400)  # 默认为4小时
+            self.set_next_spawn(union_id, int(latest) / 1000000 + kill_cooldown)
+        return dict(self.next_spawns)
+
+    def seconds_until_next_spawn(self) -> Optional[float]:
+        """最近一个还没刷新的 VIP boss 距离刷新的秒数，没有时返回 None"""
+        now = self.wall_clock()
+        upcoming = [spawn_at - now for spawn_at in self.next_spawns.values() if spawn_at > now]
+        return min(upcoming) if upcoming else None
+
+    def arm(self, union_id, spawn_at, lead_seconds, on_prepare=None, on_spawn=None):
+        """在 spawn_at（unix 秒）前 lead_seconds 秒调用 on_prepare，spawn_at 时调用 on_spawn，重复调用会替换之前的登记"""
+        self.disarm()
+        self.set_next_spawn(union_id, spawn_at)
+        self.armed_union_id = union_id
+        self.armed_spawn_at = spawn_at
+        # 墙上时间只用来换算剩余秒数，定时本身在单调时钟上，不受系统对时影响
+        delay = spawn_at - self.wall_clock()
+        if on_prepare is not None:
+            self._prepare_handle = self.scheduler.call_later(max(0.0, delay - lead_seconds), on_prepare)
+        if on_spawn is not None:
+            self._spawn_handle = self.scheduler.call_later(max(0.0, delay), on_spawn)
+        self.logger.info(f'VIP boss({union_id}) {delay:.1f}秒后刷新，提前{lead_seconds}秒准备')
+
+    def is_armed(self, union_id=None):
+        if self._spawn_handle is None or not self._spawn_handle.is_pending:
+            return False
+        return union_id is None or union_id == self.armed_union_id
+
+    def disarm(self):
+        for handle in (self._prepare_handle, self._spawn_handle):
+            if handle is not None:
+                handle.cancel()
+        self._prepare_handle = None
+        self._spawn_handle = None
+
+    def report_fired(self, union_id):
+        """提交战斗后调用，记录从刷新到提交的延迟（秒），不是本次登记的 boss 时返回 None"""
+        if union_id != self.armed_union_id or self.armed_spawn_at is None:
+            return None
+        latency = self.wall_clock() - self.armed_spawn_at
+        self.logger.info(f'VIP boss({union_id}) 刷新到提交战斗用时 {latency * 1000:.0f}ms')
+        self.armed_union_id = None
+        self.armed_spawn_at = None
+        return latency
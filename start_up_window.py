@@ -8,7 +8,6 @@ import time
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QComboBox, QPushButton, QMessageBox, QInputDialog, QDialog, QLineEdit, QHBoxLayout, QLabel
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QIcon
-from selenium import webdriver
 import atexit
 
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -19,9 +18,9 @@ from scripts.update_character_source import update_character_source
 from scripts.parse_characters import CharacterParser
 from scripts.hof_auto_bot_main import HofAutoBot
 from scripts.states.state_factory import StateFactory
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from scripts.captcha_recognizer import recognize_captcha
+from scripts.driver_pool import DriverPool
+from scripts.driver_provider import pause_resource_blocking, resume_resource_blocking
 
 class BotThread(QThread):
     finished = pyqtSignal()
@@ -45,7 +44,9 @@ class BotThread(QThread):
         while self.is_running:
             # 执行一次循环
             self.bot.run_once()
-            
+            # 发呆时最多睡 0.5 秒，保证暂停/停止能及时响应
+            self.bot.wait_for_timers(max_wait=0.5)
+
             # 检查是否需要暂停
             while not self.is_running and not self.isInterruptionRequested():
                 # 暂停状态，等待恢复
@@ -77,6 +78,10 @@ class CaptchaDialog(QDialog):
         self.captcha = ''
         self.init_ui()
         self.result = None
+        # 浏览器屏蔽了图片，手动输入时需要放开并刷新一次验证码，让图片真正显示出来
+        self.is_blocking_paused = pause_resource_blocking(self.driver)
+        if self.is_blocking_paused:
+            self.refresh_captcha()
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -114,6 +119,12 @@ class CaptchaDialog(QDialog):
     def close(self):
         self.reject()
 
+    def done(self, result):
+        if self.is_blocking_paused:
+            resume_resource_blocking(self.driver)
+            self.is_blocking_paused = False
+        super().done(result)
+
 class LoginWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -215,6 +226,14 @@ class LoginWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, '错误', f'打开Boss编辑器失败：{str(e)}')
     
+    def open_log_viewer(self):
+        from scripts.log_viewer import LogViewerDialog
+        server = self.server_combo.currentData()
+        if not server:
+            return
+        self.log_viewer = LogViewerDialog(server['id'], self)
+        self.log_viewer.show()
+
     def on_bot_finished(self):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -227,7 +246,7 @@ class LoginWindow(QMainWindow):
 
     def init_ui(self):
         self.setWindowTitle('HofAutoBot登录器')
-        self.setFixedSize(300, 300)
+        self.setFixedSize(300, 340)
         
         # 设置应用图标
         icon_path = os.path.join(os.path.dirname(__file__), 'images', 'main_icon', 'app_icon.svg')
@@ -258,6 +277,7 @@ class LoginWindow(QMainWindow):
         self.stop_btn = QPushButton('暂停')
         self.boss_editor_btn = QPushButton('打开Boss编辑器')
         self.normal_stage_editor_btn = QPushButton('编辑普通关卡')
+        self.log_viewer_btn = QPushButton('查看日志')
         self.close_btn = QPushButton('关闭')
 
         # 设置按钮状态
@@ -273,6 +293,7 @@ class LoginWindow(QMainWindow):
         layout.addWidget(self.stop_btn)
         layout.addWidget(self.boss_editor_btn)
         layout.addWidget(self.normal_stage_editor_btn)
+        layout.addWidget(self.log_viewer_btn)
         layout.addWidget(self.close_btn)
 
         # 创建状态显示标签
@@ -290,6 +311,7 @@ class LoginWindow(QMainWindow):
         self.stop_btn.clicked.connect(self.toggle_pause_resume)
         self.boss_editor_btn.clicked.connect(self.open_boss_editor)
         self.normal_stage_editor_btn.clicked.connect(self.edit_normal_stage)
+        self.log_viewer_btn.clicked.connect(self.open_log_viewer)
         self.close_btn.clicked.connect(self.close_application)
         self.auto_run_btn.clicked.connect(self.open_browser_and_auto_login)
 
@@ -313,8 +335,7 @@ class LoginWindow(QMainWindow):
             return
     
         # 启动浏览器
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service)
+        self.driver = DriverPool.get_instance(headless=False).acquire()
         self.driver.get(self.current_server['url'])
         
         # 等待页面加载完成
@@ -378,8 +399,7 @@ class LoginWindow(QMainWindow):
         if not self.current_server:
             QMessageBox.warning(self, '警告', '请先选择服务器')
             return
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service)
+        self.driver = DriverPool.get_instance(headless=False).acquire()
         self.driver.get(self.current_server['url'])
         self.driver.implicitly_wait(8)
         from scripts.account_config_reader import get_account_config
@@ -0,0 +1,127 @@
+import json
+import shutil
+import subprocess
+import unittest
+from unittest.mock import MagicMock
+from scripts.action_group_compiler import ActionGroupCompiler
+from scripts.advanced_action_executor import AdvancedActionManager
+
+STAGE_GROUP = {
+    'name': '点一次冒险->伟大航路',
+    'actions': [
+        {'trigger_type': 'click_main_menu', 'value': 'hunt'},
+        {'trigger_type': 'click_sub_menu_stage', 'value': 'common=ocean1'},
+        {'trigger_type': 'click_button_clear_team', 'value': 'checkDelAll()'},
+        {'trigger_type': 'check_box_select_character', 'value': 'char_1'},
+        {'trigger_type': 'check_box_select_character', 'value': 'char_2'},
+        {'trigger_type': 'click_button_start_battle', 'value': 'monster_battle'},
+    ],
+}
+
+# 在 node 里模拟页面：菜单点击后 jQuery.active 变成 1，20ms 后加载完成并出现下一级的元素
+FAKE_PAGE = r"""
+var clicks = [];
+var byCss = {}, byName = {};
+global.window = {jQuery: {active: 0}};
+global.document = {
+    querySelector: function (s) { return byCss[s] || null; },
+    getElementsByName: function (n) { return byName[n] ? [byName[n]] : []; }
+};
+function element(label, checked, onClick) {
+    return {checked: checked, click: function () { clicks.push(label); if (onClick) onClick(); }};
+}
+function load(then) {
+    window.jQuery.active = 1;
+    setTimeout(function () { window.jQuery.active = 0; then(); }, 20);
+}
+byCss['a[onclick*="hunt"]'] = element('hunt', false, function () {
+    load(function () {
+        byCss['a[onclick*="common=ocean1"]'] = element('ocean1', false, function () {
+            load(function () {
+                byCss['input[type="button"][onclick="checkDelAll()"]'] = element('clear', false);
+                byName['char_1'] = element('char_1', false);
+                byName['char_2'] = element('char_2', true);
+                byName['monster_battle'] = element('battle', false, function () { load(function () {}); });
+            });
+        });
+    });
+});
+"""
+
+
+def run_in_node(script):
+    program = FAKE_PAGE + '(function () {\n' + script + '\n}).call(null, function (result) {' \
+        'console.log(JSON.stringify({result: result, clicks: clicks})); });'
+    output = subprocess.run(['node', '-e', program], capture_output=True, text=True, timeout=30, check=True)
+    return json.loads(output.stdout)
+
+
+class TestActionGroupCompiler(unittest.TestCase):
+    def setUp(self):
+        self.compiler = ActionGroupCompiler(find_timeout_ms=200, load_timeout_ms=500, poll_ms=5)
+
+    def test_steps_wait_only_after_navigation(self):
+        compiled = self.compiler.compile(STAGE_GROUP)
+        self.assertEqual([step['navigates'] for step in compiled.steps], [True, True, False, False, False, True])
+        self.assertEqual(compiled.steps[0]['selector'], 'a[onclick*="hunt"]')
+        self.assertEqual(compiled.steps[3], {'by': 'name', 'selector': 'char_1', 'mode': 'check', 'navigates': False})
+
+    def test_compiled_program_is_cached(self):
+        same_actions = dict(STAGE_GROUP, name='另一个名字')
+        self.assertIs(self.compiler.compile(STAGE_GROUP), self.compiler.compile(same_actions))
+
+    def test_unsupported_action_is_not_compiled(self):
+        group = {'name': 'x', 'actions': [{'trigger_type': 'unknown', 'value': 'a'}]}
+        self.assertIsNone(self.compiler.compile(group))
+
+    def test_selector_values_are_escaped(self):
+        group = {'name': 'x', 'actions': [{'trigger_type': 'click_main_menu', 'value': 'a"b'}]}
+        self.assertEqual(self.compiler.compile(group).steps[0]['selector'], 'a[onclick*="a\\"b"]')
+
+    @unittest.skipUnless(shutil.which('node'), '需要 node')
+    def test_program_runs_whole_group_in_page(self):
+        output = run_in_node(self.compiler.compile(STAGE_GROUP).script)
+        self.assertEqual(output['result'], {'ok': True, 'step': 6, 'reason': None})
+        # char_2 已经勾上了，不能再点（再点就取消了）
+        self.assertEqual(output['clicks'], ['hunt', 'ocean1', 'clear', 'char_1', 'battle'])
+
+    @unittest.skipUnless(shutil.which('node'), '需要 node')
+    def test_program_reports_first_missing_step(self):
+        group = dict(STAGE_GROUP, actions=STAGE_GROUP['actions'][:1] + [{'trigger_type': 'click_sub_menu_stage', 'value': 'missing'}])
+        output = run_in_node(self.compiler.compile(group).script)
+        self.assertEqual(output['result'], {'ok': False, 'step': 1, 'reason': 'not_found'})
+
+
+class TestCompiledExecution(unittest.TestCase):
+    def setUp(self):
+        self.manager = AdvancedActionManager()
+        self.manager._execute_actions_one_by_one = MagicMock(return_value=True)
+        self.driver = MagicMock()
+
+    def test_success_needs_one_round_trip(self):
+        self.driver.execute_async_script.return_value = {'ok': True, 'step': 6, 'reason': None}
+        self.assertTrue(self.manager.execute_advanced_action(self.driver, STAGE_GROUP))
+        self.assertEqual(self.driver.execute_async_script.call_count, 1)
+        self.driver.find_elements.assert_not_called()
+        self.manager._execute_actions_one_by_one.assert_not_called()
+
+    def test_failure_falls_back_from_failed_step(self):
+        self.driver.execute_async_script.return_value = {'ok': False, 'step': 2, 'reason': 'not_found'}
+        self.assertTrue(self.manager.execute_advanced_action(self.driver, STAGE_GROUP))
+        actions = self.manager._execute_actions_one_by_one.call_args.args[2]
+        self.assertEqual(actions, STAGE_GROUP['actions'][2:])
+
+    def test_webdriver_error_does_not_rerun_group(self):
+        self.driver.execute_async_script.side_effect = RuntimeError('script timeout')
+        self.assertFalse(self.manager.execute_advanced_action(self.driver, STAGE_GROUP))
+        self.manager._execute_actions_one_by_one.assert_not_called()
+
+    def test_disabled_compiler_uses_per_action_path(self):
+        self.manager.is_compiled_enabled = False
+        self.manager.execute_advanced_action(self.driver, STAGE_GROUP)
+        self.driver.execute_async_script.assert_not_called()
+        self.manager._execute_actions_one_by_one.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import MagicMock
+from scripts.action_waits import AJAX_IDLE_SCRIPT, ActionWaiter, AdaptiveTimeout, wait_until
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestWaitUntil(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_returns_as_soon_as_condition_holds(self):
+        results = iter([None, None, 'ok'])
+        result, waited_ms = wait_until(lambda: next(results), 1000, poll_ms=50, clock=self.clock, sleep=self.clock.sleep)
+        self.assertEqual(result, 'ok')
+        self.assertAlmostEqual(waited_ms, 100)
+
+    def test_times_out(self):
+        result, waited_ms = wait_until(lambda: False, 120, poll_ms=50, clock=self.clock, sleep=self.clock.sleep)
+        self.assertFalse(result)
+        self.assertAlmostEqual(waited_ms, 120)
+
+
+class TestAdaptiveTimeout(unittest.TestCase):
+    def test_starts_from_configured_wait(self):
+        self.assertEqual(AdaptiveTimeout(1800).timeout_ms, 1800)
+        self.assertEqual(AdaptiveTimeout(0).timeout_ms, 300)
+
+    def test_follows_observed_waits_above_configured_wait(self):
+        timeout = AdaptiveTimeout(500, window=3)
+        for waited_ms in (200, 400, 250):
+            timeout.observe(waited_ms)
+        self.assertEqual(timeout.timeout_ms, 800)
+        # 慢的那次滑出窗口后超时跟着缩短，但不低于配置的等待时间
+        timeout.observe(100)
+        timeout.observe(100)
+        self.assertEqual(timeout.timeout_ms, 500)
+
+    def test_fast_waits_do_not_shrink_below_configured_wait(self):
+        timeout = AdaptiveTimeout(3000, window=5)
+        for _ in range(5):
+            timeout.observe(50)
+        self.assertEqual(timeout.timeout_ms, 3000)
+        # 一串快响应之后来了一次 2 秒的慢响应：仍在超时之内，下次超时放宽
+        timeout.observe(2000)
+        self.assertEqual(timeout.timeout_ms, 4000)
+
+    def test_timeout_widens_next_wait(self):
+        timeout = AdaptiveTimeout(1000, max_ms=5000)
+        timeout.observe(1000, is_timeout=True)
+        self.assertEqual(timeout.timeout_ms, 2000)
+        timeout.observe(2000, is_timeout=True)
+        timeout.observe(4000, is_timeout=True)
+        self.assertEqual(timeout.timeout_ms, 5000)
+
+
+class TestActionWaiter(unittest.TestCase):
+    def setUp(self):
+        self.waiter = ActionWaiter(poll_ms=1)
+        self.driver = MagicMock()
+
+    def test_waits_for_element_to_appear(self):
+        finder = MagicMock()
+        element = MagicMock()
+        finder.find_elements.side_effect = [[], [], [element]]
+        self.assertEqual(self.waiter.wait_for_elements(self.driver, 'click_main_menu', finder, 'hunt', 0), [element])
+        self.assertEqual(finder.find_elements.call_count, 3)
+
+    def test_navigation_waits_for_ajax_idle(self):
+        self.driver.execute_script.side_effect = [False, False, True]
+        self.assertTrue(self.waiter.wait_after_action(self.driver, 'click_sub_menu_stage', idle_after=200))
+        self.driver.execute_script.assert_called_with(AJAX_IDLE_SCRIPT)
+        self.assertEqual(self.driver.execute_script.call_count, 3)
+
+    def test_checkbox_waits_for_selected(self):
+        element = MagicMock()
+        element.is_selected.side_effect = [False, True]
+        self.assertTrue(self.waiter.wait_after_action(self.driver, 'check_box_select_character', element, 100))
+        self.driver.execute_script.assert_not_called()
+
+    def test_clear_team_does_not_wait(self):
+        self.assertTrue(self.waiter.wait_after_action(self.driver, 'click_button_clear_team', idle_after=100))
+        self.driver.execute_script.assert_not_called()
+
+    def test_report_time_saved_per_group(self):
+        self.driver.execute_script.return_value = True
+        for _ in range(2):
+            self.waiter.begin_group('点一次冒险')
+            self.waiter.wait_after_action(self.driver, 'click_main_menu', idle_after=1800)
+            self.waiter.wait_after_action(self.driver, 'click_button_start_battle', idle_after=1000)
+            stats = self.waiter.end_group()
+        self.assertEqual(stats['runs'], 2)
+        self.assertEqual(stats['fixed_ms'], 5600)
+        self.assertGreater(stats['saved_ms'], 5000)
+        self.assertEqual(self.waiter.report['点一次冒险'], stats)
+        self.assertIsNone(self.waiter.end_group())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+import unittest
+from scripts.async_runtime import AsyncBotRuntime
+from scripts.hof_auto_bot_main import HofAutoBot
+from scripts.states.idle_state import IdleState
+
+
+def make_idle_bot(idle_seconds, finished):
+    bot = HofAutoBot()
+    bot._is_on_login_page = lambda: False
+    state = IdleState(bot)
+
+    def on_idle_done():
+        finished.append(bot)
+        bot.is_finished = True
+
+    state.set_idle_time(idle_seconds, on_idle_done)
+    bot.switch_to_next_state(state)
+    return bot
+
+
+class TestAsyncBotRuntime(unittest.TestCase):
+    def test_bots_idle_concurrently_on_one_loop(self):
+        finished = []
+        bots = [make_idle_bot(0.3, finished) for _ in range(5)]
+        runtime = AsyncBotRuntime(max_blocking_workers=1)
+        start = time.monotonic()
+        runtime.run(bots)
+        self.assertEqual(len(finished), 5)
+        # 发呆不占线程：5 个 Bot 只用 1 个阻塞线程也能同时发呆
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_cleanup_wakes_idle_bot(self):
+        finished = []
+        bot = make_idle_bot(600, finished)
+        threading.Timer(0.1, bot.cleanup).start()
+        runtime = AsyncBotRuntime()
+        start = time.monotonic()
+        runtime.run([bot])
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(finished, [])
+
+    def test_blocking_calls_are_bounded(self):
+        runtime = AsyncBotRuntime(max_blocking_workers=2)
+        active = []
+        peak = []
+
+        def blocking():
+            active.append(1)
+            peak.append(len(active))
+            time.sleep(0.05)
+            active.pop()
+
+        async def main():
+            await asyncio.gather(*(runtime.run_blocking(blocking) for _ in range(6)))
+
+        asyncio.run(main())
+        runtime.shutdown()
+        self.assertLessEqual(max(peak), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
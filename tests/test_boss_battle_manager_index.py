@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from scripts.boss_battle_manager import BossBattleManager
+
+
+def write_json(path, data, mtime):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.utime(path, (mtime, mtime))
+
+
+class TestBossBattleManagerIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        server_dir = os.path.join(self.tmp.name, 'configs', 'server_01')
+        os.makedirs(server_dir)
+        write_json(os.path.join(self.tmp.name, 'configs', 'boss_config.json'),
+                   {'boss_list': [{'name': '鳥巢', 'level_limit': 200, 'union_id': 8}]}, 1000)
+        self.character_path = os.path.join(server_dir, 'character_config.json')
+        write_json(self.character_path, {'characters': [{'udid': '111', 'level': '100'}, {'udid': '222', 'level': '90'}]}, 1000)
+        write_json(os.path.join(server_dir, 'action_config_advanced.json'), {
+            '600080': {'name': '鸟毛', 'actions': [
+                {'trigger_type': 'click_button_clear_team', 'value': ''},
+                {'trigger_type': 'check_box_select_character', 'value': 'char_111'},
+                {'trigger_type': 'check_box_select_character', 'value': 'char_222'},
+            ]},
+        }, 1000)
+        self.manager = BossBattleManager()
+        self.manager.base_path = self.tmp.name
+        self.manager.set_server_id(1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookups_accept_int_action_id(self):
+        self.assertEqual(self.manager.get_boss_level_limit(8), 200)
+        self.assertEqual(self.manager.get_character_level('222'), 90)
+        self.assertEqual(self.manager.get_action_characters(600080), ['111', '222'])
+        self.assertEqual(self.manager.get_action_total_level(600080), 190)
+        self.assertFalse(self.manager.is_action_level_exceed_boss_limit(600080, 8))
+        self.assertIsNone(self.manager.is_action_level_exceed_boss_limit(600080, 99))
+
+    def test_repeated_decisions_do_not_read_files(self):
+        self.manager.is_action_level_exceed_boss_limit(600080, 8)
+        with mock.patch('builtins.open', side_effect=AssertionError('不应该再读文件')):
+            for _ in range(10):
+                self.assertFalse(self.manager.is_action_level_exceed_boss_limit(600080, 8))
+
+    def test_reloads_when_file_modified(self):
+        self.assertFalse(self.manager.is_action_level_exceed_boss_limit(600080, 8))
+        write_json(self.character_path, {'characters': [{'udid': '111', 'level': '150'}, {'udid': '222', 'level': '90'}]}, 2000)
+        self.assertEqual(self.manager.get_action_total_level(600080), 240)
+        self.assertTrue(self.manager.is_action_level_exceed_boss_limit(600080, 8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from scripts.boss_config_repository import BossConfigRepository, boss_config_path_for, server_boss_config_paths
+
+
+class TestBossConfigRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'boss_config.json')
+        self.write([{'name': '黑龍軍團', 'level_limit': 400, 'union_id': 0},
+                    {'name': '鳥巢', 'level_limit': 200, 'union_id': 8}], mtime=1000)
+        self.repository = BossConfigRepository(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, boss_list, mtime):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'boss_list': boss_list}, f, ensure_ascii=False)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_lookup_by_union_id_and_name(self):
+        self.assertEqual(self.repository.get_by_union_id(8)['name'], '鳥巢')
+        self.assertEqual(self.repository.get_by_name('黑龍軍團')['union_id'], 0)
+        self.assertEqual(self.repository.get_level_limit(0), 400)
+        self.assertIsNone(self.repository.get_by_union_id(99))
+
+    def test_reads_file_once_until_modified(self):
+        self.repository.get_by_union_id(8)
+        with mock.patch('builtins.open', side_effect=AssertionError('不应该再读文件')):
+            for _ in range(5):
+                self.assertEqual(self.repository.get_level_limit(8), 200)
+        self.write([{'name': '鳥巢', 'level_limit': 250, 'union_id': 8}], mtime=2000)
+        self.assertEqual(self.repository.get_level_limit(8), 250)
+        self.assertIsNone(self.repository.get_by_name('黑龍軍團'))
+
+    def test_save_updates_file_and_memory(self):
+        self.repository.save_boss_list([{'name': '新Boss', 'level_limit': 300, 'union_id': 30}])
+        self.assertEqual(self.repository.get_by_name('新Boss')['union_id'], 30)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['boss_list'][0]['union_id'], 30)
+
+    def test_boss_list_is_a_copy(self):
+        self.repository.get_boss_list()[0]['level_limit'] = 1
+        self.assertEqual(self.repository.get_level_limit(0), 400)
+
+    def test_lookups_return_copies(self):
+        self.repository.get_by_union_id(0)['level_limit'] = 1
+        self.repository.get_by_name('鳥巢')['union_id'] = 99
+        self.assertEqual(self.repository.get_level_limit(0), 400)
+        self.assertEqual(self.repository.get_by_name('鳥巢')['union_id'], 8)
+
+    def test_server_config_is_preferred(self):
+        server_dir = os.path.join(self.tmp.name, 'server_01')
+        os.makedirs(server_dir)
+        self.assertEqual(boss_config_path_for(server_dir, self.path), self.path)
+        self.assertEqual(server_boss_config_paths(self.tmp.name), [])
+        server_path = os.path.join(server_dir, 'boss_config.json')
+        with open(server_path, 'w', encoding='utf-8') as f:
+            json.dump({'boss_list': []}, f)
+        self.assertEqual(boss_config_path_for(server_dir, self.path), server_path)
+        self.assertEqual(server_boss_config_paths(self.tmp.name), [server_path])
+
+    def test_get_instance_shared_per_path(self):
+        self.assertIs(BossConfigRepository.get_instance(self.path), BossConfigRepository.get_instance(self.path))
+        self.assertIsNot(BossConfigRepository.get_instance(self.path), BossConfigRepository.get_instance())
+
+
+if __name__ == '__main__':
+    unittest.main()
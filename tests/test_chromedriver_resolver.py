@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from scripts import chromedriver_resolver
+
+
+class TestChromedriverResolver(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp.name
+        index = {}
+        for version in ['143.0.7499.40', '144.0.7559.109']:
+            binary = os.path.join(self.cache_dir, version, 'chromedriver')
+            os.makedirs(os.path.dirname(binary))
+            open(binary, 'w').close()
+            index[f'linux64_chromedriver_{version}_for_{version.rsplit(".", 1)[0]}'] = {
+                'timestamp': '02/02/2026',
+                'binary_path': binary,
+            }
+        index['linux64_chromedriver_145.0.1.1_for_145.0.1'] = {'binary_path': '/not/exists/chromedriver'}
+        with open(os.path.join(self.cache_dir, 'drivers.json'), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        chromedriver_resolver._resolved_cache.clear()
+
+    def tearDown(self):
+        chromedriver_resolver._resolved_cache.clear()
+        self.tmp.cleanup()
+
+    def test_find_cached_driver_by_major_version(self):
+        path = chromedriver_resolver.find_cached_driver('143.0.7499.1', [self.cache_dir])
+        self.assertTrue(path.endswith(os.path.join('143.0.7499.40', 'chromedriver')))
+
+    def test_unknown_version_does_not_guess(self):
+        self.assertIsNone(chromedriver_resolver.find_cached_driver(None, [self.cache_dir]))
+
+    def test_unknown_version_falls_back_to_manager(self):
+        with patch.object(chromedriver_resolver, 'detect_chrome_version', return_value=None), \
+                patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+            manager.return_value.install.return_value = '/downloaded/chromedriver'
+            path = chromedriver_resolver.resolve_chromedriver_path([self.cache_dir])
+        self.assertEqual(path, '/downloaded/chromedriver')
+
+    def test_windows_version_from_install_dir(self):
+        app_dir = os.path.join(self.cache_dir, 'Google', 'Chrome', 'Application')
+        for name in ['chrome.exe', '143.0.7499.40', '144.0.7559.109', 'SetupMetrics']:
+            os.makedirs(os.path.join(app_dir, name))
+        with patch.dict(os.environ, {'LocalAppData': self.cache_dir, 'ProgramFiles': '/not/exists',
+                                     'ProgramFiles(x86)': '/not/exists'}):
+            self.assertEqual(chromedriver_resolver._detect_windows_chrome_version(), '144.0.7559.109')
+
+    def test_detected_version_is_memoized(self):
+        with patch.object(chromedriver_resolver, '_detected_version', chromedriver_resolver._NOT_DETECTED), \
+                patch.object(chromedriver_resolver.os, 'name', 'posix'), \
+                patch.object(chromedriver_resolver, '_detect_chrome_version_from_binary',
+                             return_value='144.0.7559.109') as detect:
+            self.assertEqual(chromedriver_resolver.detect_chrome_version(), '144.0.7559.109')
+            self.assertEqual(chromedriver_resolver.detect_chrome_version(), '144.0.7559.109')
+            detect.assert_called_once()
+            chromedriver_resolver.detect_chrome_version(refresh=True)
+            self.assertEqual(detect.call_count, 2)
+
+    def test_cache_hit_does_not_touch_network(self):
+        with patch.object(chromedriver_resolver, 'detect_chrome_version', return_value='144.0.7559.20'), \
+                patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+            path = chromedriver_resolver.resolve_chromedriver_path([self.cache_dir])
+            manager.assert_not_called()
+        self.assertIn('144.0.7559.109', path)
+
+    def test_cache_miss_falls_back_to_manager(self):
+        with patch.object(chromedriver_resolver, 'detect_chrome_version', return_value='150.0.1.1'), \
+                patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+            manager.return_value.install.return_value = '/downloaded/chromedriver'
+            path = chromedriver_resolver.resolve_chromedriver_path([self.cache_dir])
+            manager.return_value.install.assert_called_once()
+        self.assertEqual(path, '/downloaded/chromedriver')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+from scripts.condition_checker import ConditionChecker, compile_element_pattern
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COOLDOWN = '<div style="margin:0 20px">離下次戰鬥還需要 : <span class="bold">${wait_time}</span></div>'
+STAMINA = '<span id="mtime">${my_time}</span>/4000'
+
+
+class TestCompileElementPattern(unittest.TestCase):
+    def test_literal_parts_are_escaped(self):
+        pattern, placeholders, prefix = compile_element_pattern("RA_UseBack('index2.php?union=${id}')")
+        self.assertEqual(placeholders, ('id',))
+        self.assertEqual(prefix, "RA_UseBack('index2.php?union=")
+        self.assertIsNone(pattern.search("RA_UseBack'index2Xphpunion=8'"))
+        self.assertEqual(pattern.search("RA_UseBack('index2.php?union=8')").group('p0'), '8')
+
+    def test_compiled_once(self):
+        self.assertIs(compile_element_pattern(COOLDOWN), compile_element_pattern(COOLDOWN))
+
+
+class TestConditionChecker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        config = {'1': {'name': '测试', 'conditions': [
+            {'element_info': COOLDOWN, 'contract_below': True, 'default_result': False,
+             'validation': [{'value_of_placeholder': 'wait_time', 'target_value': '', 'type': 'NOT_EQUAL'}]},
+            {'element_info': STAMINA, 'default_result': False, 'jump_to_action_group_id': 10001,
+             'validation': [{'value_of_placeholder': 'my_time', 'target_value': 1000, 'type': 'GREATER_THAN'}]},
+            {'default_result': True, 'jump_to_action_group_id': 10002},
+        ]}}
+        path = os.path.join(self.tmp.name, 'condition_config.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False)
+        self.checker = ConditionChecker(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def page(self, wait_time, my_time):
+        return ('<div>' + COOLDOWN.replace('${wait_time}', wait_time) + '</div>\n'
+                + STAMINA.replace('${my_time}', my_time))
+
+    def test_and_with_next_condition(self):
+        self.assertEqual(self.checker.check_condition('1', self.page('1:15', '2942')), 10001)
+
+    def test_failed_validation_falls_through(self):
+        self.assertEqual(self.checker.check_condition('1', self.page('1:15', '500')), 10002)
+        # 第一个条件不满足时，下一个条件单独检查
+        self.assertEqual(self.checker.check_condition('1', self.page('', '2942')), 10001)
+        self.assertEqual(self.checker.check_condition('1', self.page('', '500')), 10002)
+
+    def test_missing_element_uses_default_result(self):
+        self.assertEqual(self.checker.check_condition('1', '<html></html>'), 10002)
+        self.assertIsNone(self.checker.check_condition('9', '<html></html>'))
+
+    def test_extract_placeholder_value(self):
+        self.assertEqual(self.checker._extract_placeholder_value(self.page(' 1:15 ', '1'), COOLDOWN), {'wait_time': '1:15'})
+        self.assertEqual(self.checker._extract_placeholder_value('', COOLDOWN), {})
+
+    def test_hunt_page(self):
+        with open(os.path.join(PROJECT_ROOT, 'source_codes', 'source_code_hunt_page.htm'), 'r', encoding='utf-8') as f:
+            html = f.read()
+        self.assertEqual(self.checker._extract_placeholder_value(html, COOLDOWN), {'wait_time': '1:15'})
+
+
+if __name__ == '__main__':
+    unittest.main()
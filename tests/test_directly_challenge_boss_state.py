@@ -0,0 +1,155 @@
+import unittest
+from functools import partial
+from unittest.mock import MagicMock
+from scripts.hof_auto_bot_main import HofAutoBot
+from scripts.http_action_engine import NOT_SENT, UNCONFIRMED
+from scripts.states.directly_challenge_boss_state import DirectlyChallengeBossState
+from scripts.states.idle_state import IdleState
+from scripts.timer_wheel import TimerWheel
+from scripts.vip_spawn_scheduler import VipSpawnScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestWaitForCooldown(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bot = HofAutoBot(scheduler=TimerWheel(clock=self.clock))
+        self.bot.auto_bot_config_manager = MagicMock(boss_prearm_seconds=10)
+        self.bot.server_config_manager = MagicMock(current_server_data={'url': 'http://host/'})
+        self.bot.action_manager = MagicMock()
+        self.state = DirectlyChallengeBossState(self.bot)
+        self.state.union_id = 7
+        self.state.advanced_action_config = {'name': '一服猴王', 'actions': []}
+
+    def run_idle(self, state, seconds):
+        self.bot.switch_to_next_state(state)
+        state.process()
+        self.clock.now += seconds
+        self.bot.scheduler.advance()
+
+    def test_long_cooldown_prearms_only_in_the_last_seconds(self):
+        idle_state = self.state.wait_for_cooldown(600)
+        self.assertIsInstance(idle_state, IdleState)
+        self.bot.action_manager.prearm_advanced_action.assert_not_called()
+
+        # 时间轮回调里只切回挑战状态，不去开页面
+        self.run_idle(idle_state, 590)
+        self.bot.action_manager.prearm_advanced_action.assert_not_called()
+        self.assertIs(self.bot.current_state, self.state)
+
+        self.clock.now += 1
+        self.state.process()
+        self.bot.action_manager.prearm_advanced_action.assert_called_once()
+        self.assertIsInstance(self.bot.current_state, IdleState)
+        self.bot.action_manager.execute_by_http.assert_not_called()
+
+        self.run_idle(self.bot.current_state, 9)
+        self.assertIs(self.bot.current_state, self.state)
+
+    def test_short_cooldown_prearms_immediately(self):
+        self.state.wait_for_cooldown(5)
+        self.bot.action_manager.prearm_advanced_action.assert_called_once()
+
+    def test_zero_prearm_seconds_never_prearms(self):
+        self.bot.auto_bot_config_manager.boss_prearm_seconds = 0
+        self.run_idle(self.state.wait_for_cooldown(5), 5)
+        self.bot.action_manager.prearm_advanced_action.assert_not_called()
+        self.assertIs(self.bot.current_state, self.state)
+
+
+class TestPrepareBeforeSpawn(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.wall = FakeClock()
+        self.bot = HofAutoBot(scheduler=TimerWheel(clock=self.clock))
+        self.bot.vip_spawn_scheduler = VipSpawnScheduler(self.bot.scheduler, wall_clock=self.wall)
+        self.bot.server_config_manager = MagicMock(current_server_data={'url': 'http://host/'})
+        self.bot.action_manager = MagicMock()
+        self.bot.action_manager.is_http_enabled_for.return_value = False
+        self.bot.driver = MagicMock()
+        self.state = DirectlyChallengeBossState(self.bot)
+        self.state.union_id = 7
+        self.state.advanced_action_config = {'name': '一服猴王', 'actions': []}
+        self.state._submit_battle = MagicMock()
+        self.state._update_challenge_result = MagicMock()
+        self.state.on_finish = MagicMock()
+        self.waiting_state = IdleState(self.bot)
+        self.bot.switch_to_next_state(self.waiting_state)
+        self.bot.vip_spawn_scheduler.arm(
+            7, 60, 3,
+            on_prepare=partial(self.state.request_prepare, self.waiting_state),
+            on_spawn=partial(self.state.set_state, self.state))
+
+    def advance_to(self, seconds):
+        self.clock.now = self.wall.now = seconds
+        self.bot.scheduler.advance()
+
+    def test_prepare_runs_in_process_then_goes_back_to_waiting(self):
+        # 时间轮回调里只切状态，不去开页面
+        self.advance_to(57)
+        self.assertIs(self.bot.current_state, self.state)
+        self.bot.driver.get.assert_not_called()
+
+        self.state.process()
+        self.bot.driver.get.assert_called_once_with('http://host/index.php?union=7#')
+        self.assertIs(self.bot.current_state, self.waiting_state)
+        self.state._submit_battle.assert_not_called()
+
+        self.advance_to(60)
+        self.assertIs(self.bot.current_state, self.state)
+        self.state.process()
+        self.state._submit_battle.assert_called_once_with(7)
+
+    def test_spawn_already_fired_challenges_without_preparing(self):
+        self.advance_to(60)
+        self.state.process()
+        self.bot.driver.get.assert_not_called()
+        self.state._submit_battle.assert_called_once_with(7)
+
+
+class TestSubmitBattleOnce(unittest.TestCase):
+    def setUp(self):
+        self.bot = HofAutoBot()
+        self.bot.server_config_manager = MagicMock(current_server_data={'url': 'http://host/'})
+        self.bot.action_manager = MagicMock()
+        self.bot.driver = MagicMock()
+        self.bot.vip_spawn_scheduler = MagicMock()
+        self.state = DirectlyChallengeBossState(self.bot)
+        self.state.union_id = 7
+        self.state.advanced_action_config = {'name': '一服猴王', 'actions': []}
+        self.state.cooldown_ends_at = 0
+        self.state._update_challenge_result = MagicMock()
+        self.state.on_finish = MagicMock()
+
+    def test_sent_prepared_battle_is_never_resubmitted(self):
+        self.state.prepared_battle = MagicMock()
+        self.state.prepared_battle.fire.return_value = UNCONFIRMED
+        self.state.process()
+        self.bot.action_manager.execute_by_http.assert_not_called()
+        self.bot.action_manager.execute_advanced_action.assert_not_called()
+        self.state._update_challenge_result.assert_called_once()
+
+    def test_sent_http_battle_does_not_fall_back_to_browser(self):
+        self.bot.action_manager.execute_by_http.return_value = UNCONFIRMED
+        self.state.process()
+        self.bot.action_manager.execute_advanced_action.assert_not_called()
+        self.state._update_challenge_result.assert_called_once()
+
+    def test_falls_back_only_when_nothing_was_sent(self):
+        self.state.prepared_battle = MagicMock()
+        self.state.prepared_battle.fire.return_value = NOT_SENT
+        self.bot.action_manager.execute_by_http.return_value = NOT_SENT
+        self.state.process()
+        self.bot.action_manager.execute_by_http.assert_called_once()
+        self.bot.action_manager.execute_advanced_action.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
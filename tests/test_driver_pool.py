@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import MagicMock
+from scripts.driver_pool import DriverPool, PooledDriver
+
+
+class TestDriverPool(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+
+        def factory():
+            driver = MagicMock()
+            driver.execute_script.return_value = 'complete'
+            self.created.append(driver)
+            return driver
+
+        self.pool = DriverPool(factory, size=2, max_age_hours=6, max_navigations=3)
+
+    def test_release_then_acquire_reuses_driver(self):
+        first = self.pool.acquire()
+        self.assertIsInstance(first, PooledDriver)
+        first.release()
+        self.assertEqual(self.pool.idle_count, 1)
+        second = self.pool.acquire()
+        self.assertIs(second, first)
+        self.assertEqual(len(self.created), 1)
+
+    def test_release_clears_session(self):
+        pooled = self.pool.acquire()
+        pooled.get('https://pim0110.com/hall/')
+        pooled.release()
+        driver = self.created[0]
+        driver.delete_all_cookies.assert_called_once()
+        driver.execute_cdp_cmd.assert_called_once_with('Network.clearBrowserCookies', {})
+        driver.get.assert_called_with('about:blank')
+        self.assertEqual(self.pool.idle_count, 1)
+
+    def test_release_quits_when_session_cannot_be_cleared(self):
+        pooled = self.pool.acquire()
+        self.created[0].delete_all_cookies.side_effect = Exception('no such window')
+        pooled.release()
+        self.assertEqual(self.pool.idle_count, 0)
+        self.created[0].quit.assert_called_once()
+
+    def test_recycle_after_max_navigations(self):
+        pooled = self.pool.acquire()
+        for _ in range(3):
+            pooled.get('https://example.com/')
+        pooled.release()
+        self.assertEqual(self.pool.idle_count, 0)
+        self.created[0].quit.assert_called_once()
+
+    def test_recycle_after_max_age(self):
+        pooled = self.pool.acquire()
+        pooled.created_at -= 7 * 3600
+        pooled.release()
+        self.assertEqual(self.pool.idle_count, 0)
+        self.created[0].quit.assert_called_once()
+
+    def test_unhealthy_driver_is_replaced(self):
+        pooled = self.pool.acquire()
+        pooled.release()
+        self.created[0].execute_script.side_effect = Exception('session deleted')
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, pooled)
+        self.assertEqual(len(self.created), 2)
+        self.created[0].quit.assert_called_once()
+
+    def test_release_beyond_size_quits(self):
+        drivers = [self.pool.acquire() for _ in range(3)]
+        for pooled in drivers:
+            pooled.release()
+        self.assertEqual(self.pool.idle_count, 2)
+        self.created[2].quit.assert_called_once()
+
+    def test_warm_up_prestarts_drivers(self):
+        self.pool.warm_up()
+        self.assertEqual(self.pool.idle_count, 2)
+        self.pool.shutdown()
+        self.assertEqual(self.pool.idle_count, 0)
+        for driver in self.created:
+            driver.quit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
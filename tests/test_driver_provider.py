@@ -0,0 +1,44 @@
+import importlib
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestDriverProvider(unittest.TestCase):
+    def test_import_does_not_start_browser(self):
+        """import 动作执行模块时不应该启动浏览器"""
+        with patch('selenium.webdriver.Chrome') as chrome, \
+                patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+            import scripts.advanced_action_executor
+            import scripts.hof_auto_bot_main
+            importlib.reload(scripts.advanced_action_executor)
+            chrome.assert_not_called()
+            manager.assert_not_called()
+            self.assertFalse(hasattr(scripts.advanced_action_executor, 'driver'))
+
+    def test_create_chrome_driver_headless(self):
+        from scripts import driver_provider
+        with patch('selenium.webdriver.Chrome') as chrome, \
+                patch.object(driver_provider, 'resolve_chromedriver_path', return_value='/tmp/chromedriver'):
+            chrome.return_value = MagicMock()
+            driver = driver_provider.create_chrome_driver(headless=True)
+            self.assertIs(driver, chrome.return_value)
+            options = chrome.call_args.kwargs['options']
+            self.assertIn('--headless=new', options.arguments)
+            self.assertIn('--window-size=1280,900', options.arguments)
+            self.assertEqual(options.page_load_strategy, 'eager')
+            driver.execute_cdp_cmd.assert_any_call(
+                'Network.setBlockedURLs', {'urls': driver_provider.build_blocked_url_patterns(True)})
+
+    def test_resource_blocking_paused_restores_patterns(self):
+        from scripts import driver_provider
+        driver = MagicMock()
+        driver_provider.set_resource_blocking(driver, True, block_stylesheets=False)
+        driver.execute_cdp_cmd.reset_mock()
+        with driver_provider.resource_blocking_paused(driver):
+            driver.execute_cdp_cmd.assert_called_with('Network.setBlockedURLs', {'urls': []})
+        driver.execute_cdp_cmd.assert_called_with(
+            'Network.setBlockedURLs', {'urls': driver_provider.build_blocked_url_patterns(False)})
+
+
+if __name__ == '__main__':
+    unittest.main()
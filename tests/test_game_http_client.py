@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from scripts.game_http_client import GameHttpClient, GameHttpError
+
+LOGIN_HTML = '<img id="captchaImage"><input name="Login" class="btn">'
+HUNT_HTML = '<span id="mtime">1234</span>'
+
+
+def make_response(text, status_code=200, cookies=None):
+    response = MagicMock()
+    response.text = text
+    response.status_code = status_code
+    response.cookies = cookies or []
+    return response
+
+
+class TestGameHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.driver = MagicMock()
+        self.driver.get_cookies.return_value = [{'name': 'PHPSESSID', 'value': 'abc', 'domain': 'pim0110.com', 'path': '/'}]
+        self.driver.execute_script.return_value = 'Mozilla/5.0 test'
+        self.client = GameHttpClient(self.driver, 'https://pim0110.com/hall', retry_max=2, retry_backoff=0)
+        self.client.session = MagicMock()
+        self.client.session.cookies = MagicMock()
+        self.client.session.headers = {}
+
+    def test_get_page_borrows_browser_cookies(self):
+        self.client.session.request.return_value = make_response(HUNT_HTML)
+        html = self.client.get_page('index.php?hunt#')
+        self.assertEqual(html, HUNT_HTML)
+        self.client.session.cookies.set.assert_called_with('PHPSESSID', 'abc', domain='pim0110.com', path='/')
+        self.assertEqual(self.client.session.headers['User-Agent'], 'Mozilla/5.0 test')
+        self.client.session.request.assert_called_with('GET', 'https://pim0110.com/hall/index.php?hunt', timeout=5.0)
+        self.driver.get.assert_not_called()
+
+    def test_login_page_resyncs_once_then_raises(self):
+        self.client.session.request.return_value = make_response(LOGIN_HTML)
+        with self.assertRaises(GameHttpError):
+            self.client.get_page('index.php?hunt')
+        self.assertEqual(self.driver.get_cookies.call_count, 2)
+
+    def test_non_200_is_retried(self):
+        self.client.session.request.side_effect = [make_response('', status_code=502), make_response(HUNT_HTML)]
+        self.assertEqual(self.client.get_page('index.php?hunt'), HUNT_HTML)
+        self.assertEqual(self.client.session.request.call_count, 2)
+
+    def test_quick_get_retries_at_most_once(self):
+        import requests
+        self.client.retry_max = 5
+        self.client.retry_backoff = 100
+        self.client.session.request.side_effect = requests.ConnectionError('down')
+        with patch('scripts.game_http_client.time.sleep') as sleep:
+            with self.assertRaises(GameHttpError):
+                self.client.get_page('index.php?hunt', is_quick=True)
+        self.assertEqual(self.client.session.request.call_count, 2)
+        sleep.assert_called_once_with(GameHttpClient.QUICK_RETRY_BACKOFF_SEC)
+
+    def test_post_error_reports_whether_request_was_sent(self):
+        import requests
+        from urllib3.exceptions import MaxRetryError, NewConnectionError
+        refused = requests.ConnectionError(MaxRetryError(None, 'https://pim0110.com', NewConnectionError(None, 'refused')))
+        for error, is_sent in ((refused, False), (requests.ConnectTimeout('connect'), False),
+                               (requests.ReadTimeout('read'), True), (requests.ConnectionError('reset'), True)):
+            self.client.session.request.side_effect = error
+            with self.assertRaises(GameHttpError) as context:
+                self.client.post_form('index2.php?union=7', [])
+            self.assertEqual(context.exception.is_sent, is_sent, error)
+        self.client.session.request.side_effect = [make_response('', status_code=500)]
+        with self.assertRaises(GameHttpError) as context:
+            self.client.post_form('index2.php?union=7', [])
+        self.assertTrue(context.exception.is_sent)
+        # 返回登录页：服务器没有按已登录处理，没有打
+        self.client.session.request.side_effect = None
+        self.client.session.request.return_value = make_response(LOGIN_HTML)
+        with self.assertRaises(GameHttpError) as context:
+            self.client.post_form('index2.php?union=7', [])
+        self.assertFalse(context.exception.is_sent)
+
+    def test_new_server_cookie_is_pushed_to_browser(self):
+        cookie = MagicMock()
+        cookie.name, cookie.value, cookie.path = 'PHPSESSID', 'rotated', '/'
+        self.client.session.request.return_value = make_response(HUNT_HTML, cookies=[cookie])
+        self.client.get_page('index.php?hunt')
+        self.driver.add_cookie.assert_called_once_with({'name': 'PHPSESSID', 'value': 'rotated', 'path': '/'})
+
+
+if __name__ == '__main__':
+    unittest.main()
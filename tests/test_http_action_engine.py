@@ -0,0 +1,107 @@
+import os
+import unittest
+from unittest.mock import MagicMock
+from scripts.game_http_client import GameHttpError
+from scripts.http_action_engine import CONFIRMED, NOT_SENT, UNCONFIRMED, HttpActionEngine, check_battle_result, find_battle_form
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'source_codes')
+
+
+def read_source(name):
+    with open(os.path.join(SOURCE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+BOSS_GROUP = {
+    'name': '一服猴王',
+    'executor': 'http',
+    'actions': [
+        {'trigger_type': 'click_button_clear_team', 'value': 'checkDelAll()'},
+        {'trigger_type': 'check_box_select_character', 'value': 'char_1340513102982626'},
+        {'trigger_type': 'check_box_select_character', 'value': 'char_1340513135031688'},
+        {'trigger_type': 'click_button_start_battle', 'value': 'union_battle'},
+    ],
+}
+
+STAGE_GROUP = {
+    'name': '点一次冒险->伟大航路',
+    'executor': 'http',
+    'actions': [
+        {'trigger_type': 'click_main_menu', 'value': 'hunt'},
+        {'trigger_type': 'click_sub_menu_stage', 'value': 'common=ocean1'},
+        {'trigger_type': 'click_button_start_battle', 'value': 'monster_battle'},
+    ],
+}
+
+
+# 战斗结果页的骨架（Battle_Result_Load 切换 .battle / .battle_result 两个区块）
+BATTLE_RESULT_PAGE = ('<div class="battle">...</div>'
+                      '<div class="battle_result" style="display:none"><span class="bold">勝利</span></div>')
+
+
+class TestHttpActionEngine(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.post_form.return_value = BATTLE_RESULT_PAGE
+        self.engine = HttpActionEngine(self.client)
+
+    def test_find_stage_form_fields(self):
+        form = find_battle_form(read_source('source_code_select_character_page.htm'), 'monster_battle')
+        self.assertEqual(form['action'], 'index2.php?common=ocean1')
+        names = [name for name, _ in form['fields']]
+        self.assertIn('type2', names)
+        self.assertIn('sort_type', names)
+        self.assertIn('Monster_Round', names)
+        self.assertFalse(any(name.startswith('char_') for name in names))
+
+    def test_boss_group_posts_selected_characters(self):
+        self.client.get_page.return_value = read_source('source_code_error_over_level')
+        self.assertEqual(self.engine.execute(BOSS_GROUP, form_target='union=7'), CONFIRMED)
+        self.client.get_page.assert_called_once_with('index2.php?union=7')
+        path, data = self.client.post_form.call_args.args
+        self.assertEqual(path, 'index2.php?union=7')
+        self.assertIn(('char_1340513102982626', '1'), data)
+        self.assertIn(('char_1340513135031688', '1'), data)
+        self.assertIn(('union_battle', '戰鬥!'), data)
+
+    def test_stage_group_uses_sub_menu_as_target(self):
+        self.client.get_page.return_value = read_source('source_code_select_character_page.htm')
+        self.assertEqual(self.engine.execute(STAGE_GROUP), CONFIRMED)
+        path, data = self.client.post_form.call_args.args
+        self.assertEqual(path, 'index2.php?common=ocean1')
+        self.assertIn(('monster_battle', '戰鬥!'), data)
+
+    def test_group_without_target_is_not_supported(self):
+        group = {'name': 'pvp', 'executor': 'http', 'actions': [{'trigger_type': 'click_button_start_battle', 'value': 'ChallengeRank'}]}
+        self.assertEqual(self.engine.execute(group), NOT_SENT)
+        self.client.get_page.assert_not_called()
+
+    def test_http_error_before_post_is_not_sent(self):
+        self.client.get_page.side_effect = GameHttpError('会话已失效')
+        self.assertEqual(self.engine.execute(BOSS_GROUP, form_target='union=7'), NOT_SENT)
+        self.client.post_form.assert_not_called()
+
+    def test_error_page_after_submit_is_unconfirmed(self):
+        self.client.get_page.return_value = read_source('source_code_select_character_page.htm')
+        self.client.post_form.return_value = read_source('source_code_error_over_level')
+        self.assertEqual(self.engine.execute(STAGE_GROUP), UNCONFIRMED)
+        # 200 但不是战斗结果页（比如又回到了选人页面）也没有确认
+        self.client.post_form.return_value = read_source('source_code_select_character_page.htm')
+        self.assertEqual(self.engine.execute(STAGE_GROUP), UNCONFIRMED)
+
+    def test_post_error_depends_on_whether_it_was_sent(self):
+        self.client.get_page.return_value = read_source('source_code_select_character_page.htm')
+        self.client.post_form.side_effect = GameHttpError('连接被拒绝', is_sent=False)
+        self.assertEqual(self.engine.execute(STAGE_GROUP), NOT_SENT)
+        self.client.post_form.side_effect = GameHttpError('读取超时')
+        self.assertEqual(self.engine.execute(STAGE_GROUP), UNCONFIRMED)
+
+    def test_check_battle_result(self):
+        self.assertEqual(check_battle_result(BATTLE_RESULT_PAGE), (True, None))
+        self.assertEqual(check_battle_result('<div id="MAP_BATTLE_PROCESS"></div>'), (True, None))
+        self.assertEqual(check_battle_result(read_source('source_code_error_over_level'))[0], False)
+        self.assertIn('合計級別水準', check_battle_result(read_source('source_code_error_over_level'))[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
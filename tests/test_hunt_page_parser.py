@@ -0,0 +1,63 @@
+import os
+import unittest
+from dataclasses import FrozenInstanceError
+from scripts.battle_watcher_manager import BattleWatcherManager
+from scripts.hunt_page_parser import HuntSnapshot, find_entries, parse_hunt_page
+
+HUNT_PAGE_PATH = os.path.join(os.path.dirname(__file__), '..', 'source_codes', 'source_code_hunt_page.htm')
+
+
+class TestParseHuntPage(unittest.TestCase):
+    def test_parses_saved_hunt_page(self):
+        with open(HUNT_PAGE_PATH, 'r', encoding='utf-8') as f:
+            html = f.read()
+        snapshot = parse_hunt_page(html, fetched_at=123.0)
+        self.assertEqual(snapshot.stamina, 2942)
+        self.assertEqual(snapshot.cooldown_seconds, 75)
+        self.assertIn(7, snapshot.alive_boss_ids)
+        self.assertNotIn(2, snapshot.alive_boss_ids)
+        self.assertIsInstance(snapshot.alive_boss_ids, frozenset)
+        self.assertEqual(snapshot.fetched_at, 123.0)
+
+    def test_double_quoted_stamina_and_no_cooldown(self):
+        html = ('<span id="mtime">100</span>/4000'
+                '<a onclick="RA_UseBack(\'index2.php?union=3\')">'
+                '<a onclick="RA_UseBack( \'index2.php?union=5\' )">')
+        snapshot = parse_hunt_page(html)
+        self.assertEqual(snapshot.stamina, 100)
+        self.assertEqual(snapshot.cooldown_seconds, 0)
+        self.assertEqual(snapshot.alive_boss_ids, frozenset({3, 5}))
+
+    def test_login_page_gives_empty_snapshot(self):
+        snapshot = parse_hunt_page('<input name="Login" class="btn">')
+        self.assertIsNone(snapshot.stamina)
+        self.assertEqual(snapshot.alive_boss_ids, frozenset())
+
+    def test_find_entries_matches_whole_parameter(self):
+        with open(HUNT_PAGE_PATH, 'r', encoding='utf-8') as f:
+            entries = find_entries(f.read())
+        self.assertIn('common=gb0', entries)
+        self.assertIn('union=7', entries)
+        # 只是前缀相同的入口不算
+        self.assertNotIn('common=gb', entries)
+        self.assertIn('common=ac1', find_entries('<a onClick="RA_UseBack( \'index2.php?common=ac1\' )">'))
+
+    def test_snapshot_is_frozen(self):
+        with self.assertRaises(FrozenInstanceError):
+            HuntSnapshot().stamina = 1
+
+
+class TestBattleWatcherManagerSnapshot(unittest.TestCase):
+    def test_getters_read_latest_snapshot(self):
+        manager = BattleWatcherManager()
+        self.assertEqual(manager.get_player_stamina(), 0)
+        html = '<span id=\'mtime\'>3000</span>離下次戰鬥還需要 : <span class="bold">2:05</span>RA_UseBack(\'index2.php?union=9\')'
+        snapshot = manager.update_all_from_hunt_page(html)
+        self.assertIs(manager.snapshot, snapshot)
+        self.assertEqual(manager.get_player_stamina(), 3000)
+        self.assertEqual(manager.get_player_challenge_boss_cooldown(), 125)
+        self.assertEqual(manager.get_all_alive_boss(), frozenset({9}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import unittest
+from types import SimpleNamespace
+from scripts.advanced_action_executor import AdvancedActionManager
+from scripts.auto_bot_config_manager import AutoBotConfigManager
+from scripts.battle_watcher_manager import BattleWatcherManager
+from scripts.hof_auto_bot_main import HofAutoBot
+from scripts.hunt_page_parser import HuntSnapshot
+from scripts.hunt_snapshot_cache import HuntSnapshotCache
+from scripts.states.normal_stage_state import NormalStageState
+from scripts.states.prepare_stage_state import PrepareStageState
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'configs', 'server_01', 'auto_bot_loop_config.json')
+HUNT_HTML = ('<span id="mtime">3900</span>/4000'
+             '<a onclick="RA_UseBack(\'index2.php?union=7\')">')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHuntSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = HuntSnapshotCache(clock=self.clock)
+
+    def test_extrapolates_stamina_and_cooldown(self):
+        self.cache.update(HuntSnapshot(frozenset({7}), stamina=1000, cooldown_seconds=100, fetched_at=1000.0))
+        self.clock.now += 36
+        snapshot = self.cache.get(60, recover_stamina_per_hour=1000, max_stamina=4000)
+        self.assertEqual(snapshot.stamina, 1010)
+        self.assertEqual(snapshot.cooldown_seconds, 64)
+        self.assertEqual(snapshot.alive_boss_ids, frozenset({7}))
+        self.assertEqual(snapshot.fetched_at, 1000.0)
+
+    def test_stamina_capped_and_cooldown_floored(self):
+        self.cache.update(HuntSnapshot(stamina=3999, cooldown_seconds=5, fetched_at=1000.0))
+        self.clock.now += 50
+        snapshot = self.cache.get(60, recover_stamina_per_hour=1000, max_stamina=4000)
+        self.assertEqual(snapshot.stamina, 4000)
+        self.assertEqual(snapshot.cooldown_seconds, 0)
+
+    def test_stale_invalidated_or_disabled_returns_none(self):
+        self.cache.update(HuntSnapshot(stamina=100, fetched_at=1000.0))
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get(60, 1000, 4000))
+        self.cache.update(HuntSnapshot(stamina=100, fetched_at=self.clock.now))
+        self.assertIsNone(self.cache.get(0, 1000, 4000))
+        self.assertIsNotNone(self.cache.get(60, 1000, 4000))
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get(60, 1000, 4000))
+
+    def test_login_page_is_not_cached(self):
+        self.cache.update(HuntSnapshot(stamina=None, fetched_at=1000.0))
+        self.assertIsNone(self.cache.get(60, 1000, 4000))
+
+
+class FakeHttpClient:
+    def __init__(self):
+        self.loads = 0
+
+    def get_page(self, path, is_quick=False):
+        self.loads += 1
+        return HUNT_HTML
+
+
+def make_bot():
+    bot = HofAutoBot()
+    bot.auto_bot_config_manager = AutoBotConfigManager(CONFIG_PATH)
+    bot.auto_bot_config_manager.config['is_challenge_time_limited_stage'] = False
+    bot.auto_bot_config_manager.config['normal_stage_loop_order'] = [
+        {'stage_name': 'a', 'plan_action_id': 1},
+        {'stage_name': 'b', 'plan_action_id': 2},
+    ]
+    bot.server_config_manager = SimpleNamespace(
+        current_server_data={'name': 'test', 'url': 'http://example.invalid/', 'hunt_page': 'index2.php?hunt'},
+        all_action_config_by_server={'1': {'name': 'stage 1', 'actions': []}, '2': {'name': 'stage 2', 'actions': []}},
+    )
+    bot.battle_watcher_manager = BattleWatcherManager()
+    bot.http_client = FakeHttpClient()
+    bot.action_manager = AdvancedActionManager()
+    bot.action_manager.add_action_listener(bot.invalidate_hunt_snapshot)
+    executed = []
+
+    def execute_advanced_action(driver, action_group, allow_http=True):
+        bot.action_manager._notify_action(action_group)
+        executed.append(action_group['name'])
+        return True
+
+    bot.action_manager.execute_advanced_action = execute_advanced_action
+    return bot, executed
+
+
+class TestBotUsesHuntSnapshotCache(unittest.TestCase):
+    def test_second_refresh_within_max_age_does_not_load(self):
+        bot, _ = make_bot()
+        bot._update_info_from_hunt_page()
+        bot._update_info_from_hunt_page()
+        self.assertEqual(bot.http_client.loads, 1)
+        self.assertEqual(bot.player_stamina, 3900)
+        bot._update_info_from_hunt_page(force=True)
+        self.assertEqual(bot.http_client.loads, 2)
+
+    def test_action_invalidates_cache(self):
+        bot, _ = make_bot()
+        bot._update_info_from_hunt_page()
+        bot.action_manager.execute_advanced_action(None, {'name': 'boss', 'actions': []})
+        bot._update_info_from_hunt_page()
+        self.assertEqual(bot.http_client.loads, 2)
+
+    def test_stage_cycle_loads_hunt_page_once(self):
+        # 改造前：PrepareStage 读一次，NormalStage 每个小怪前再读一次，共 3 次
+        bot, executed = make_bot()
+        PrepareStageState(bot).process()
+        self.assertIsInstance(bot.current_state, NormalStageState)
+        bot.current_state.process()
+        self.assertEqual(executed, ['stage 1', 'stage 2'])
+        self.assertEqual(bot.http_client.loads, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from scripts.battle_watcher_manager import BattleWatcherManager
+from scripts.kill_log_client import KillLogClient, KillLogError
+
+LOG_TEXT = ('<a href="?ulog=1700000000000002">鳥巢 被 A 擊敗</a><br />'
+            '<a href="?ulog=1700000000000001">黑龍軍團 被 B 擊敗</a><br />'
+            '<a href="?ulog=1690000000000000">鳥巢 被 C 擊敗</a>')
+
+
+def make_response(text='', status_code=200, headers=None):
+    response = MagicMock()
+    response.text = text
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestKillLogClient(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.session = MagicMock()
+        self.client = KillLogClient('https://pim0110.com/hall/?ulog', retry_max=2, retry_backoff=0,
+                                    cache_ttl_sec=15, clock=self.clock, session=self.session)
+
+    def test_text_cached_within_ttl(self):
+        self.session.get.return_value = make_response(LOG_TEXT, headers={'ETag': '"v1"'})
+        self.assertEqual(self.client.get_text(), LOG_TEXT)
+        self.clock.now += 10
+        self.client.get_text()
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_conditional_get_reuses_body_on_304(self):
+        self.session.get.return_value = make_response(LOG_TEXT, headers={'ETag': '"v1"', 'Last-Modified': 'Mon'})
+        self.client.get_text()
+        self.clock.now += 20
+        self.session.get.return_value = make_response(status_code=304)
+        self.assertEqual(self.client.get_text(), LOG_TEXT)
+        headers = self.session.get.call_args.kwargs['headers']
+        self.assertEqual(headers, {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon'})
+
+    def test_retries_then_raises(self):
+        self.session.get.return_value = make_response(status_code=502)
+        with self.assertRaises(KillLogError):
+            self.client.get_text()
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_get_instance_applies_server_config(self):
+        client = KillLogClient.get_instance('https://example.invalid/?ulog', {'http_timeout_sec': 2.5, 'http_retry_max': 5})
+        self.assertIs(client, KillLogClient.get_instance('https://example.invalid/?ulog'))
+        self.assertEqual(client.timeout, 2.5)
+        self.assertEqual(client.retry_max, 5)
+
+
+class TestBattleWatcherManagerKillLog(unittest.TestCase):
+    def test_several_bosses_resolved_from_one_fetch(self):
+        manager = BattleWatcherManager()
+        client = KillLogClient('https://pim0110.com/hall/?ulog', cache_ttl_sec=15, session=MagicMock())
+        client.session.get.return_value = make_response(LOG_TEXT)
+        with patch.object(manager, '_get_kill_log_client', return_value=client), \
+                patch.object(manager, 'get_boss_info', side_effect=lambda union_id: {8: {'name': '鳥巢'}, 0: {'name': '黑龍軍團'}}[union_id]):
+            bird = manager.get_boss_next_battle_real_time(8, 60, client.url)
+            dragon = manager.get_boss_next_battle_real_time(0, 60, client.url)
+        self.assertEqual(bird['original_unixtime'], 1700000000000002)
+        self.assertEqual(dragon['original_unixtime'], 1700000000000001)
+        self.assertEqual(client.session.get.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import unittest
+from scripts.kill_log_index import KillLogIndex
+
+BOSS_PAGE_PATH = os.path.join(os.path.dirname(__file__), '..', 'source_codes', 'source_code_boss_full')
+BOSSES = [{'name': '鳥巢', 'union_id': 8}, {'name': '深海幼幼', 'union_id': 5}, {'name': '黑龍軍團', 'union_id': 0}]
+
+
+def entry(ulog, boss_name):
+    return f'[ <a href="?ulog={ulog}">time</a> ] 玩家(5: 39.8) vs {boss_name}(8: 45.3)<br />'
+
+
+class TestKillLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = KillLogIndex()
+        self.index.set_bosses(BOSSES)
+
+    def test_indexes_saved_boss_page_in_one_pass(self):
+        with open(BOSS_PAGE_PATH, 'r', encoding='utf-8') as f:
+            html = f.read()
+        self.assertGreater(self.index.update(html), 0)
+        self.assertEqual(self.index.get_latest_timestamp(8), '1746605284413866')
+        self.assertEqual(self.index.get_latest_timestamp(5), '1746604565948310')
+
+    def test_incremental_update_stops_at_seen_entries(self):
+        old_log = entry(1000000000000002, '鳥巢') + entry(1000000000000001, '深海幼幼')
+        self.assertEqual(self.index.update(old_log), 2)
+        self.assertEqual(self.index.update(old_log), 0)
+        new_log = entry(1000000000000004, '深海幼幼') + entry(1000000000000003, '深海幼幼') + old_log
+        self.assertEqual(self.index.update(new_log), 2)
+        self.assertEqual(self.index.get_latest_timestamp(5), '1000000000000004')
+        self.assertEqual(self.index.get_latest_timestamp(8), '1000000000000002')
+        self.assertIsNone(self.index.get_latest_timestamp(0))
+
+    def test_changing_bosses_resets_index(self):
+        self.index.update(entry(1000000000000001, '鳥巢'))
+        self.index.set_bosses(BOSSES[:1])
+        self.assertIsNone(self.index.get_latest_timestamp(8))
+        self.assertEqual(self.index.update(entry(1000000000000001, '鳥巢')), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+from scripts.element_finder import build_xpath, parse_html_content
+from scripts.legacy_locator_table import (
+    CONDITIONS_DROPPED, DUPLICATE, NO_CONDITIONS, PREFIX_ONLY,
+    LegacyLocatorTable, compile_action_configs, compile_legacy_locator, locator_key,
+)
+
+HUNT_LINK = '<a href="#" onclick="RA_UseBack(\'index2.php?hunt\')">冒險</a>'
+
+
+class FakeDriver:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.results.pop(0) if self.results else None
+
+
+class TestCompileLegacyLocator(unittest.TestCase):
+    def test_matches_build_xpath(self):
+        tag_name, text, attrs = parse_html_content(HUNT_LINK, verbose=False)
+        locator = compile_legacy_locator(HUNT_LINK)
+        self.assertEqual(locator['xpath'], build_xpath(tag_name, text, attrs, True, verbose=False))
+        self.assertIsNone(locator['container_xpath'])
+        self.assertEqual(locator['loose_xpath'], '//a[contains(text(),"冒險")]')
+        self.assertEqual(locator['ambiguous'], [])
+
+    def test_container_makes_element_xpath_relative(self):
+        locator = compile_legacy_locator('<input type="checkbox" name="char_1">', '<form id="team">')
+        self.assertEqual(locator['container_xpath'], '//form[@id="team"]')
+        self.assertEqual(locator['xpath'], './/input[@type="checkbox" and @name="char_1"]')
+        self.assertIsNone(locator['loose_xpath'])
+
+    def test_flags_ambiguous_snippets(self):
+        self.assertIn(NO_CONDITIONS, compile_legacy_locator('<a>')['ambiguous'])
+        self.assertIn(PREFIX_ONLY, compile_legacy_locator('<a onclick="showDetail(3)"></a>')['ambiguous'])
+        many = '<a href="x" class="c" id="i" name="n" onclick="RA_UseBack(\'index2.php?hunt\')">冒險</a>'
+        self.assertIn(CONDITIONS_DROPPED, compile_legacy_locator(many)['ambiguous'])
+        self.assertIn('container_no_conditions', compile_legacy_locator(HUNT_LINK, '<div>')['ambiguous'])
+
+    def test_duplicate_locators_are_flagged(self):
+        config = {'1': {'name': '冒险', 'actions': [
+            {'element_info': '<a onclick="showDetail(1)">詳細</a>'},
+            {'element_info': '<a onclick="showDetail(1)"  >詳細</a>'},
+            {'element_info': HUNT_LINK, 'container_info': ''},
+            {'element_info': HUNT_LINK},
+        ]}}
+        table = compile_action_configs([config])
+        self.assertEqual(len(table), 3)
+        duplicates = [locator for locator in table.values() if DUPLICATE in locator['ambiguous']]
+        self.assertEqual(len(duplicates), 2)
+
+
+class TestLegacyLocatorTable(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'action_locators.json')
+        precompiled = dict(compile_legacy_locator(HUNT_LINK), xpath='//a[@id="precompiled"]')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({locator_key(HUNT_LINK): precompiled}, f, ensure_ascii=False)
+        self.table = LegacyLocatorTable([self.path], initial_wait_ms=100, poll_ms=1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_uses_precompiled_locator(self):
+        element = object()
+        driver = FakeDriver(None, element)
+        self.assertIs(self.table.find_element(driver, HUNT_LINK), element)
+        self.assertEqual(driver.calls[0], (None, '//a[@id="precompiled"]', '//a[contains(text(),"冒險")]'))
+        self.assertEqual(len(driver.calls), 2)
+
+    def test_missing_snippet_is_compiled_once(self):
+        snippet = '<input type="submit" value="戰鬥!">'
+        self.assertIs(self.table.get(snippet), self.table.get(snippet))
+
+    def test_missing_element_times_out_within_the_short_wait(self):
+        driver = FakeDriver()
+        self.assertIsNone(self.table.find_element(driver, HUNT_LINK, timeout=10))
+        self.assertLess(len(driver.calls), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
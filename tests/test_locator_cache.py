@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import StaleElementReferenceException
+from scripts.locator_cache import LocatorCache, compile_locator
+from scripts.advanced_action_executor import ClearTeamActionExecutor
+
+
+class FakeDriver:
+    """只实现 LocatorCache 用到的 execute_script，按顺序返回预设的查找结果"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.results.pop(0)
+
+
+class TestCompileLocator(unittest.TestCase):
+    def test_xpath_contains_becomes_css(self):
+        self.assertEqual(compile_locator('click_main_menu', 'hunt'), ('css', 'a[onclick*="hunt"]'))
+        self.assertEqual(compile_locator('click_sub_menu_boss', "union=7"), ('css', 'a[onclick*="union=7"]'))
+        self.assertEqual(compile_locator('click_button_clear_team', 'checkDelAll()'),
+                         ('css', 'input[type="button"][onclick="checkDelAll()"]'))
+
+    def test_named_elements_use_name(self):
+        self.assertEqual(compile_locator('check_box_select_character', 'char_1'), ('name', 'char_1'))
+        self.assertEqual(compile_locator('click_button_start_battle', 'union_battle'), ('name', 'union_battle'))
+        self.assertEqual(compile_locator('click_button_start_battle', 'other'), ('css', 'input[type="submit"][value="戰鬥!"]'))
+
+    def test_unknown_type(self):
+        self.assertIsNone(compile_locator('unknown', 'x'))
+
+
+class TestLocatorCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LocatorCache()
+        self.hunt, self.battle = object(), object()
+
+    def test_repeated_find_on_same_page_is_free(self):
+        driver = FakeDriver({'fresh': False, 'elements': [self.hunt]})
+        self.assertEqual(self.cache.find_elements(driver, 'click_main_menu', 'hunt'), [self.hunt])
+        self.assertEqual(self.cache.find_elements(driver, 'click_main_menu', 'hunt'), [self.hunt])
+        self.assertEqual(len(driver.calls), 1)
+        self.assertEqual(driver.calls[0][1:], ('css', 'a[onclick*="hunt"]'))
+        self.assertEqual(self.cache.hit_count, 1)
+
+    def test_marker_still_present_keeps_cache_after_invalidate(self):
+        driver = FakeDriver({'fresh': False, 'elements': [self.hunt]},
+                            {'fresh': True, 'elements': [self.battle]},
+                            {'fresh': True, 'elements': [self.battle]})
+        self.cache.find_elements(driver, 'click_main_menu', 'hunt')
+        self.cache.invalidate(driver)
+        # 导航后第一次查找会确认代数标记
+        self.cache.find_elements(driver, 'click_button_start_battle', 'union_battle')
+        self.assertEqual(len(driver.calls), 2)
+        # 标记还在，之前定位到的菜单仍然有效
+        self.assertEqual(self.cache.find_elements(driver, 'click_main_menu', 'hunt'), [self.hunt])
+        self.assertEqual(len(driver.calls), 2)
+
+    def test_new_page_generation_drops_cached_elements(self):
+        new_hunt = object()
+        driver = FakeDriver({'fresh': False, 'elements': [self.hunt]},
+                            {'fresh': False, 'elements': [self.battle]},
+                            {'fresh': True, 'elements': [new_hunt]})
+        self.cache.find_elements(driver, 'click_main_menu', 'hunt')
+        self.cache.invalidate(driver)
+        self.cache.find_elements(driver, 'click_button_start_battle', 'union_battle')
+        self.assertEqual(self.cache.find_elements(driver, 'click_main_menu', 'hunt'), [new_hunt])
+        self.assertEqual(len(driver.calls), 3)
+
+    def test_browser_navigation_resets_state(self):
+        driver = FakeDriver({'fresh': False, 'elements': [self.hunt]}, {'fresh': False, 'elements': [self.hunt]})
+        driver.navigation_count = 0
+        self.cache.find_elements(driver, 'click_main_menu', 'hunt')
+        driver.navigation_count = 1
+        self.cache.find_elements(driver, 'click_main_menu', 'hunt')
+        self.assertEqual(len(driver.calls), 2)
+
+    def test_missing_element_is_not_cached(self):
+        driver = FakeDriver({'fresh': False, 'elements': []}, {'fresh': True, 'elements': [self.hunt]})
+        self.assertEqual(self.cache.find_elements(driver, 'click_main_menu', 'hunt'), [])
+        self.assertEqual(self.cache.find_elements(driver, 'click_main_menu', 'hunt'), [self.hunt])
+
+    def test_drivers_do_not_share_cache(self):
+        first = FakeDriver({'fresh': False, 'elements': [self.hunt]})
+        second = FakeDriver({'fresh': False, 'elements': [self.battle]})
+        self.cache.find_elements(first, 'click_main_menu', 'hunt')
+        self.assertEqual(self.cache.find_elements(second, 'click_main_menu', 'hunt'), [self.battle])
+        self.assertNotEqual(first.calls[0][0], second.calls[0][0])
+
+
+class TestStaleElementRetry(unittest.TestCase):
+    def test_stale_cached_element_is_located_again(self):
+        stale, fresh = MagicMock(), MagicMock()
+        stale.click.side_effect = StaleElementReferenceException('stale')
+        driver = MagicMock(spec=['execute_script'])
+        driver.execute_script.side_effect = [{'fresh': False, 'elements': [stale]}, {'fresh': False, 'elements': [fresh]}]
+        self.assertTrue(ClearTeamActionExecutor().execute(driver, 'checkDelAll()', 0, 0))
+        fresh.click.assert_called_once()
+        self.assertEqual(driver.execute_script.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
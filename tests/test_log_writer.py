@@ -0,0 +1,156 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from scripts.log_manager import LogManager
+from scripts.log_writer import BufferedLogWriter, convert_latest_first_file, read_latest_lines
+
+
+class TestBufferedLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'logs', 'log_server_1.txt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_appends_in_order_and_reads_latest_first(self):
+        writer = BufferedLogWriter(self.path, flush_interval=60)
+        for i in range(5):
+            writer.write(f'line {i}')
+        writer.flush()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), [f'line {i}' for i in range(5)])
+        self.assertEqual(read_latest_lines(self.path, limit=2), ['line 4', 'line 3'])
+        writer.close()
+
+    def test_rotation_keeps_backups_and_viewer_spans_them(self):
+        writer = BufferedLogWriter(self.path, max_bytes=50, backup_count=2, flush_interval=60)
+        for i in range(8):
+            writer.write(f'第{i}行日志内容')
+            writer.flush()
+        writer.close()
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertTrue(os.path.exists(self.path + '.2'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+        latest = read_latest_lines(self.path, limit=4, backup_count=2)
+        self.assertEqual(latest, [f'第{i}行日志内容' for i in (7, 6, 5, 4)])
+
+    def test_restart_on_next_day_rotates_by_last_write(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('昨天的日志\n')
+        yesterday = time.time() - 86400
+        os.utime(self.path, (yesterday, yesterday))
+        writer = BufferedLogWriter(self.path, rotate_interval_sec=86400, flush_interval=60)
+        writer.write('今天的日志')
+        writer.close()
+        with open(self.path + '.1', encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), ['昨天的日志'])
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), ['今天的日志'])
+
+    def test_restart_on_same_day_keeps_appending(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('line 0\n')
+        writer = BufferedLogWriter(self.path, rotate_interval_sec=86400, flush_interval=60)
+        writer.write('line 1')
+        writer.close()
+        self.assertFalse(os.path.exists(self.path + '.1'))
+        self.assertEqual(read_latest_lines(self.path), ['line 1', 'line 0'])
+
+    def test_latest_first_file_is_converted_on_open(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('[2024-01-02 08:00:00.000000][INFO] 第三条\n'
+                    '[2024-01-01 09:00:00.000000][INFO] 第二条\n续行\n'
+                    '[2024-01-01 08:00:00.000000][INFO] 第一条\n')
+        writer = BufferedLogWriter(self.path, flush_interval=60)
+        writer.write('[2024-01-02 09:00:00.000000][INFO] 第四条')
+        writer.close()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), [
+                '[2024-01-01 08:00:00.000000][INFO] 第一条',
+                '[2024-01-01 09:00:00.000000][INFO] 第二条', '续行',
+                '[2024-01-02 08:00:00.000000][INFO] 第三条',
+                '[2024-01-02 09:00:00.000000][INFO] 第四条',
+            ])
+        # 已经是时间顺序的文件不再改动
+        self.assertFalse(convert_latest_first_file(self.path))
+
+    def test_concurrent_writers_lose_nothing(self):
+        writer = BufferedLogWriter(self.path, flush_interval=0.01, max_buffer_lines=50)
+
+        def worker(n):
+            for i in range(500):
+                writer.write(f'{n}-{i}')
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.close()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(len(f.read().splitlines()), 2000)
+
+    def test_reverse_reader_handles_block_boundaries(self):
+        writer = BufferedLogWriter(self.path, flush_interval=60)
+        lines = [f'{i}:' + '日志' * (i % 37) for i in range(3000)]
+        for line in lines:
+            writer.write(line)
+        writer.close()
+        self.assertEqual(read_latest_lines(self.path, limit=3000), list(reversed(lines)))
+
+
+class TestLogManagerForPath(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        for path in list(LogManager._path_loggers):
+            if path.startswith(os.path.abspath(self.tmp.name)):
+                LogManager._path_loggers.pop(path)._writer.close()
+        self.tmp.cleanup()
+
+    def test_each_bot_writes_its_own_file(self):
+        path_1 = os.path.join(self.tmp.name, 'logs', 'log_server_1.txt')
+        path_2 = os.path.join(self.tmp.name, 'logs', 'log_server_2.txt')
+        logger_1 = LogManager.for_path(path_1)
+        logger_2 = LogManager.for_path(path_2)
+        self.assertIs(LogManager.for_path(path_1), logger_1)
+        self.assertIsNot(logger_1, LogManager.get_instance())
+        logger_1.info('一服', is_write_in_file=True)
+        logger_2.info('二服', is_write_in_file=True)
+        self.assertEqual([line.split('] ', 1)[1] for line in LogManager.read_latest(log_path=path_1)], ['一服'])
+        self.assertEqual([line.split('] ', 1)[1] for line in LogManager.read_latest(log_path=path_2)], ['二服'])
+
+
+class TestLogManagerDebug(unittest.TestCase):
+    def tearDown(self):
+        LogManager.set_debug(False)
+
+    def test_arguments_formatted_only_when_debug_enabled(self):
+        formatted = []
+
+        class Value:
+            def __str__(self):
+                formatted.append(1)
+                return 'value'
+
+        logger = LogManager.get_instance()
+        LogManager.set_debug(False)
+        logger.debug('值: %s', Value())
+        self.assertEqual(formatted, [])
+        LogManager.set_debug(True)
+        with mock.patch('builtins.print') as printed:
+            logger.debug('值: %s', Value())
+        self.assertEqual(formatted, [1])
+        self.assertTrue(printed.call_args.args[0].endswith('[DEBUG] 值: value'))
+
+
+if __name__ == '__main__':
+    unittest.main()
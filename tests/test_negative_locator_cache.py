@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import MagicMock
+from scripts.action_executor import ActionExecutor
+from scripts.legacy_locator_table import locator_key
+from scripts.negative_locator_cache import PRESENCE_PROBE_SCRIPT, NegativeLocatorCache
+
+BOSS_LINK = '<a href="#" onclick="RA_UseBack(\'index2.php?union=7\')">魔王</a>'
+
+
+class ProbeDriver:
+    """探测脚本返回预设的 {fingerprint, present}"""
+
+    def __init__(self, fingerprint='page-1', present=False):
+        self.fingerprint = fingerprint
+        self.present = present
+        self.probes = []
+
+    def execute_script(self, script, *args):
+        assert script == PRESENCE_PROBE_SCRIPT
+        self.probes.append(args)
+        return {'fingerprint': self.fingerprint, 'present': self.present}
+
+
+class TestNegativeLocatorCache(unittest.TestCase):
+    def test_absent_is_keyed_by_page_and_locator(self):
+        cache = NegativeLocatorCache()
+        cache.mark_absent('page-1', 'boss')
+        self.assertTrue(cache.is_absent('page-1', 'boss'))
+        self.assertFalse(cache.is_absent('page-2', 'boss'))
+        self.assertFalse(cache.is_absent('page-1', 'hunt'))
+
+    def test_evicts_least_recently_used(self):
+        cache = NegativeLocatorCache(max_entries=2)
+        cache.mark_absent('p', 'a')
+        cache.mark_absent('p', 'b')
+        cache.is_absent('p', 'a')
+        cache.mark_absent('p', 'c')
+        self.assertTrue(cache.is_absent('p', 'a'))
+        self.assertFalse(cache.is_absent('p', 'b'))
+        self.assertFalse(cache.has_absent('b'))
+        self.assertTrue(cache.has_absent('c'))
+
+    def test_failed_probe_counts_as_present(self):
+        driver = MagicMock()
+        driver.execute_script.side_effect = Exception('no page')
+        probe = NegativeLocatorCache.probe(driver, [])
+        self.assertTrue(probe.present)
+        self.assertIsNone(probe.fingerprint)
+        NegativeLocatorCache().mark_absent(probe.fingerprint, 'boss')
+
+
+class TestActionExecutorFastFail(unittest.TestCase):
+    def setUp(self):
+        self.executor = ActionExecutor()
+        self.executor.negative_cache = NegativeLocatorCache()
+        self.executor.html_finder = MagicMock()
+        self.executor.html_finder.find_element.return_value = None
+        self.executor.text_url_finder = MagicMock()
+        self.executor.text_url_finder.find_element.return_value = None
+        self.action = {'trigger_type': '跳转', 'element_info': BOSS_LINK, 'container_info': '', 'wait_time': 0}
+
+    def test_probe_covers_all_fallbacks_in_one_call(self):
+        driver = ProbeDriver()
+        self.executor._execute_action(driver, self.action)
+        locators, links = driver.probes[0]
+        self.assertGreater(len(locators), 2)
+        self.assertIn("//a[contains(text(),'魔王') and contains(@onclick,'index2.php?union=7')]",
+                      [locator['xpath'] for locator in locators])
+        self.assertEqual(links, {'text': '魔王', 'url': 'index2.php?union=7'})
+
+    def test_known_absent_element_fails_without_waiting(self):
+        driver = ProbeDriver()
+        self.assertFalse(self.executor._execute_action(driver, self.action))
+        self.assertEqual(self.executor.html_finder.find_element.call_count, 1)
+        self.assertEqual(self.executor.text_url_finder.find_element.call_count, 1)
+        # 第一次失败后才探测一次
+        self.assertEqual(len(driver.probes), 1)
+        # 同一页面再执行：只探测一次就返回
+        self.assertFalse(self.executor._execute_action(driver, self.action))
+        self.assertEqual(self.executor.html_finder.find_element.call_count, 1)
+        self.assertEqual(self.executor.text_url_finder.find_element.call_count, 1)
+        self.assertEqual(len(driver.probes), 2)
+
+    def test_found_element_needs_no_probe(self):
+        driver = ProbeDriver(present=True)
+        self.executor.html_finder.find_element.return_value = MagicMock()
+        self.assertTrue(self.executor._execute_action(driver, self.action))
+        self.assertEqual(driver.probes, [])
+
+    def test_page_change_or_presence_runs_finders_again(self):
+        driver = ProbeDriver()
+        self.executor._execute_action(driver, self.action)
+        driver.fingerprint = 'page-2'
+        self.executor._execute_action(driver, self.action)
+        self.assertEqual(self.executor.html_finder.find_element.call_count, 2)
+        # 执行前探测一次用来快速失败，查找失败后再探测一次记下当时的页面
+        self.assertEqual(len(driver.probes), 3)
+        self.assertTrue(self.executor.negative_cache.is_absent('page-2', locator_key(BOSS_LINK, '')))
+        driver.present = True
+        self.executor._execute_action(driver, self.action)
+        self.assertEqual(self.executor.html_finder.find_element.call_count, 3)
+
+    def test_marks_the_page_seen_after_finders_give_up(self):
+        driver = ProbeDriver()
+        self.executor._execute_action(driver, self.action)
+
+        # 执行前探测时还在 page-1（元素还在），查找期间跳转到了 page-2
+        def navigate(*args):
+            driver.fingerprint = 'page-2'
+            return None
+        self.executor.html_finder.find_element.side_effect = navigate
+        driver.present = True
+        self.executor._execute_action(driver, self.action)
+        key = locator_key(BOSS_LINK, '')
+        self.assertTrue(self.executor.negative_cache.is_absent('page-2', key))
+
+
+if __name__ == '__main__':
+    unittest.main()
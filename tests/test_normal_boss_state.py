@@ -0,0 +1,45 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+from scripts.hof_auto_bot_main import HofAutoBot
+from scripts.hunt_page_parser import HuntSnapshot
+from scripts.states.directly_challenge_boss_state import DirectlyChallengeBossState
+from scripts.states.normal_boss_state import NormalBossState
+
+
+class TestChooseAliveBoss(unittest.TestCase):
+    def setUp(self):
+        self.bot = HofAutoBot()
+        self.bot.auto_bot_config_manager = MagicMock(normal_boss_loop_order=[{'union_id': 7, 'plan_action_id': 1}])
+        self.bot.server_config_manager = MagicMock(all_action_config_by_server={'1': {'name': '一服猴王', 'actions': []}})
+        self.bot.boss_battle_manager = MagicMock()
+        self.bot.boss_battle_manager.is_action_level_exceed_boss_limit.return_value = False
+        self.bot._update_info_from_hunt_page = MagicMock(side_effect=self.fetch_page)
+        self.state = NormalBossState(self.bot)
+
+    def fetch_page(self, force=False):
+        # 重新读到的页面上 boss 7 已经被别人打掉了
+        self.bot.hunt_snapshot = HuntSnapshot(alive_boss_ids=frozenset(), stamina=100, fetched_at=time.time())
+
+    def test_cached_snapshot_is_refreshed_before_choosing(self):
+        self.bot.hunt_snapshot = HuntSnapshot(alive_boss_ids=frozenset({7}), stamina=100, fetched_at=time.time() - 30)
+        self.state._challenge_alive_boss()
+        self.bot._update_info_from_hunt_page.assert_called_once_with(force=True)
+        self.assertNotIsInstance(self.state.next_state, DirectlyChallengeBossState)
+
+    def test_fresh_snapshot_is_used_directly(self):
+        self.bot.hunt_snapshot = HuntSnapshot(alive_boss_ids=frozenset({7}), stamina=100, fetched_at=time.time())
+        self.state._challenge_alive_boss()
+        self.bot._update_info_from_hunt_page.assert_not_called()
+        self.assertIsInstance(self.state.next_state, DirectlyChallengeBossState)
+        self.assertEqual(self.state.next_state.union_id, 7)
+
+    def test_refreshes_without_cache_after_random_delay(self):
+        self.state.is_random_delay_done = True
+        self.state.process()
+        self.bot._update_info_from_hunt_page.assert_called_once_with(force=True)
+        self.assertNotIsInstance(self.bot.current_state, DirectlyChallengeBossState)
+
+
+if __name__ == '__main__':
+    unittest.main()
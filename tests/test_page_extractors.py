@@ -0,0 +1,46 @@
+import unittest
+from scripts.page_extractors import (CHARACTER_LIST, HUNT, PVP_RANKING, extract, extract_character_list_html,
+                                     extract_hunt_snapshot, extract_pvp_ranking)
+
+
+class FakeDriver:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.result
+
+
+class TestPageExtractors(unittest.TestCase):
+    def test_extract_runs_all_extractors_in_one_script(self):
+        driver = FakeDriver({HUNT: {}, PVP_RANKING: {}})
+        extract(driver, HUNT, PVP_RANKING)
+        self.assertEqual(len(driver.calls), 1)
+        script, args = driver.calls[0]
+        self.assertEqual(args, ([HUNT, PVP_RANKING],))
+        for name in (HUNT, PVP_RANKING, CHARACTER_LIST):
+            self.assertIn(f'{name}: function', script)
+
+    def test_hunt_snapshot(self):
+        driver = FakeDriver({HUNT: {'stamina': 2942, 'cooldown_seconds': 75, 'alive_boss_ids': [7, 1, 7]}})
+        snapshot = extract_hunt_snapshot(driver)
+        self.assertEqual(snapshot.stamina, 2942)
+        self.assertEqual(snapshot.cooldown_seconds, 75)
+        self.assertEqual(snapshot.alive_boss_ids, frozenset({1, 7}))
+        self.assertGreater(snapshot.fetched_at, 0)
+
+    def test_hunt_snapshot_error_returns_none(self):
+        self.assertIsNone(extract_hunt_snapshot(FakeDriver({HUNT: {'error': 'TypeError'}})))
+
+    def test_pvp_ranking_and_character_list(self):
+        driver = FakeDriver({PVP_RANKING: {'current_user': '陸斯坎軍團老兵', 'first_place_user': '陸斯坎軍團老兵'},
+                             CHARACTER_LIST: {'html': '<div id="Jq_Conten"></div>'}})
+        self.assertEqual(extract_pvp_ranking(driver)['first_place_user'], '陸斯坎軍團老兵')
+        self.assertEqual(extract_character_list_html(driver), '<div id="Jq_Conten"></div>')
+        self.assertIsNone(extract_character_list_html(FakeDriver(None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
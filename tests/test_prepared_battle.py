@@ -0,0 +1,121 @@
+import os
+import unittest
+from unittest.mock import MagicMock
+from scripts.game_http_client import GameHttpError
+from scripts.advanced_action_executor import AdvancedActionManager
+from scripts.http_action_engine import CONFIRMED, NOT_SENT, UNCONFIRMED
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'source_codes')
+
+
+def read_source(name):
+    with open(os.path.join(SOURCE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+BOSS_ACTIONS = [
+    {'trigger_type': 'click_button_clear_team', 'value': 'checkDelAll()'},
+    {'trigger_type': 'check_box_select_character', 'value': 'char_1340513102982626'},
+    {'trigger_type': 'check_box_select_character', 'value': 'char_1340513135031688'},
+    {'trigger_type': 'click_button_start_battle', 'value': 'union_battle'},
+]
+
+
+class TestPreparedBattle(unittest.TestCase):
+    def setUp(self):
+        self.manager = AdvancedActionManager()
+        self.driver = MagicMock()
+        self.notified = []
+        self.manager.add_action_listener(self.notified.append)
+
+    def test_http_prearm_reads_form_and_posts_only_on_fire(self):
+        client = MagicMock()
+        client.get_page.return_value = read_source('source_code_error_over_level')
+        client.post_form.return_value = '<div class="battle_result"></div>'
+        self.manager.set_http_client(client)
+        group = {'name': '一服猴王', 'executor': 'http', 'actions': BOSS_ACTIONS}
+
+        prepared = self.manager.prearm_advanced_action(self.driver, group, form_target='union=7')
+        self.assertIsNotNone(prepared)
+        client.get_page.assert_called_once_with('index2.php?union=7')
+        client.post_form.assert_not_called()
+        self.assertEqual(self.notified, [])
+
+        self.assertEqual(prepared.fire(), CONFIRMED)
+        path, data = client.post_form.call_args.args
+        self.assertEqual(path, 'index2.php?union=7')
+        self.assertIn(('char_1340513102982626', '1'), data)
+        self.assertIn(('union_battle', '戰鬥!'), data)
+        self.assertEqual(self.notified, [group])
+        # 只能提交一次，再次调用也不能让调用方回退再提交
+        self.assertEqual(prepared.fire(), UNCONFIRMED)
+        self.assertEqual(client.post_form.call_count, 1)
+        self.driver.get.assert_not_called()
+
+    def test_http_execute_notifies_once(self):
+        client = MagicMock()
+        client.get_page.return_value = read_source('source_code_select_character_page.htm')
+        client.post_form.return_value = '<div class="battle_result"></div>'
+        self.manager.set_http_client(client)
+        group = {'name': '伟大航路', 'executor': 'http', 'actions': [
+            {'trigger_type': 'click_sub_menu_stage', 'value': 'common=ocean1'},
+            {'trigger_type': 'click_button_start_battle', 'value': 'monster_battle'},
+        ]}
+        self.assertTrue(self.manager.execute_advanced_action(self.driver, group))
+        self.assertEqual(self.notified, [group])
+
+    def test_unconfirmed_http_submit_does_not_fall_back_to_browser(self):
+        client = MagicMock()
+        client.get_page.return_value = read_source('source_code_select_character_page.htm')
+        client.post_form.return_value = read_source('source_code_error_over_level')
+        self.manager.set_http_client(client)
+        self.manager._execute_actions_one_by_one = MagicMock(return_value=True)
+        group = {'name': '伟大航路', 'executor': 'http', 'actions': [
+            {'trigger_type': 'click_sub_menu_stage', 'value': 'common=ocean1'},
+            {'trigger_type': 'click_button_start_battle', 'value': 'monster_battle'},
+        ]}
+        self.manager.is_compiled_enabled = False
+        self.assertFalse(self.manager.execute_advanced_action(self.driver, group))
+        self.manager._execute_actions_one_by_one.assert_not_called()
+        self.assertEqual(client.post_form.call_count, 1)
+        # 表单都没读到（没有提交）时才用浏览器执行
+        client.get_page.side_effect = GameHttpError('会话已失效')
+        self.assertTrue(self.manager.execute_advanced_action(self.driver, group))
+        self.manager._execute_actions_one_by_one.assert_called_once()
+        self.assertEqual(client.post_form.call_count, 1)
+
+    def test_browser_prearm_selects_team_and_clicks_only_on_fire(self):
+        group = {'name': '一服猴王', 'actions': BOSS_ACTIONS}
+        self.manager.execute_advanced_action = MagicMock(return_value=True)
+
+        prepared = self.manager.prearm_advanced_action(self.driver, group, page_url='http://host/index.php?union=7#')
+        self.driver.get.assert_called_once_with('http://host/index.php?union=7#')
+        setup_group = self.manager.execute_advanced_action.call_args.args[1]
+        self.assertEqual(setup_group['actions'], BOSS_ACTIONS[:-1])
+        self.assertFalse(self.manager.execute_advanced_action.call_args.kwargs['allow_http'])
+        self.assertFalse(self.manager.execute_advanced_action.call_args.kwargs['notify'])
+        self.driver.execute_script.assert_not_called()
+        self.assertEqual(self.notified, [])
+
+        self.driver.execute_script.return_value = True
+        self.assertEqual(prepared.fire(), UNCONFIRMED)
+        self.assertEqual(self.driver.execute_script.call_args.args[1], 'union_battle')
+        self.assertEqual(self.notified, [group])
+
+    def test_browser_fire_reports_missing_button(self):
+        self.manager.execute_advanced_action = MagicMock(return_value=True)
+        prepared = self.manager.prearm_advanced_action(self.driver, {'name': 'boss', 'actions': BOSS_ACTIONS})
+        self.driver.execute_script.return_value = False
+        self.assertEqual(prepared.fire(), NOT_SENT)
+
+    def test_group_without_start_battle_cannot_be_prearmed(self):
+        group = {'name': 'menu', 'actions': [{'trigger_type': 'click_main_menu', 'value': 'hunt'}]}
+        self.assertIsNone(self.manager.prearm_advanced_action(self.driver, group))
+
+    def test_failed_setup_returns_none(self):
+        self.manager.execute_advanced_action = MagicMock(return_value=False)
+        self.assertIsNone(self.manager.prearm_advanced_action(self.driver, {'name': 'boss', 'actions': BOSS_ACTIONS}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from scripts.supervisor import BotSupervisor
+
+
+class FakeProcess:
+    next_pid = 100
+
+    def __init__(self, target, args, name, daemon):
+        self.args = args
+        self.pid = None
+        self.alive = False
+        self.exitcode = None
+
+    def start(self):
+        FakeProcess.next_pid += 1
+        self.pid = FakeProcess.next_pid
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def join(self, timeout=None):
+        pass
+
+    def terminate(self):
+        self.alive = False
+        self.exitcode = -15
+
+    def kill(self):
+        self.alive = False
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def crash(worker):
+    worker.process.alive = False
+    worker.process.exitcode = 1
+
+
+class TestBotSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        servers = [{"id": i, "name": f"{i}服"} for i in range(1, 4)]
+        config = {"max_workers": 2, "start_interval_sec": 0, "restart_backoff_sec": 10,
+                  "restart_backoff_max_sec": 60, "stable_after_sec": 600}
+        self.supervisor = BotSupervisor(servers, config=config, process_factory=FakeProcess, clock=self.clock)
+
+    def test_concurrency_is_bounded(self):
+        self.supervisor.poll()
+        self.assertEqual(self.supervisor.running_count(), 2)
+        self.assertEqual(self.supervisor.workers[2].status, "pending")
+
+    def test_crashed_worker_restarts_with_exponential_backoff(self):
+        self.supervisor.config["max_workers"] = 3
+        self.supervisor.poll()
+        worker = self.supervisor.workers[0]
+        delays = []
+        for _ in range(4):
+            crash(worker)
+            self.supervisor.poll()
+            self.assertEqual(worker.status, "backoff")
+            delays.append(worker.next_start_at - self.clock.now)
+            self.clock.now = worker.next_start_at
+            self.supervisor.poll()
+            self.assertEqual(worker.status, "running")
+        self.assertEqual(delays, [10, 20, 40, 60])
+        self.assertEqual(worker.restart_count, 4)
+
+    def test_stable_worker_resets_backoff(self):
+        self.supervisor.poll()
+        worker = self.supervisor.workers[0]
+        worker.consecutive_failures = 5
+        self.clock.now += 601
+        crash(worker)
+        self.supervisor.poll()
+        self.assertEqual(worker.next_start_at - self.clock.now, 10)
+
+    def test_status_aggregates_bot_updates(self):
+        self.supervisor.poll()
+        self.supervisor.workers[0].last_bot_status = {"state": "IdleState", "stamina": 800}
+        status = self.supervisor.get_status()
+        self.assertEqual(status["running"], 2)
+        self.assertEqual(status["total"], 3)
+        self.assertEqual(status["workers"][0]["bot"]["stamina"], 800)
+
+    def test_stop_terminates_workers(self):
+        self.supervisor.poll()
+        self.supervisor.stop(timeout=0)
+        self.assertTrue(all(w.status == "stopped" for w in self.supervisor.workers))
+        self.supervisor.poll()
+        self.assertEqual(self.supervisor.running_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import threading
+import time
+import unittest
+from scripts.timer_wheel import TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTimerWheel(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.wheel = TimerWheel(tick_sec=0.1, slot_count=8, clock=self.clock)
+        self.fired = []
+
+    def test_fires_in_deadline_order(self):
+        self.wheel.call_later(0.5, self.fired.append, 'b')
+        self.wheel.call_later(0.2, self.fired.append, 'a')
+        self.wheel.call_later(30, self.fired.append, 'later')
+        self.clock.now += 1
+        self.assertEqual(self.wheel.advance(), 2)
+        self.assertEqual(self.fired, ['a', 'b'])
+        self.assertEqual(self.wheel.pending_count, 1)
+
+    def test_deadline_beyond_one_revolution(self):
+        # 8 个槽 * 0.1s，3 秒的任务要转好几圈才到期
+        self.wheel.call_later(3, self.fired.append, 'x')
+        self.clock.now += 1
+        self.wheel.advance()
+        self.assertEqual(self.fired, [])
+        self.assertAlmostEqual(self.wheel.next_deadline(), 103.0)
+        self.clock.now += 2
+        self.wheel.advance()
+        self.assertEqual(self.fired, ['x'])
+
+    def test_cancel_and_reschedule(self):
+        cancelled = self.wheel.call_later(1, self.fired.append, 'cancelled')
+        early = self.wheel.call_later(600, self.fired.append, 'early')
+        cancelled.cancel()
+        self.assertTrue(self.wheel.reschedule(early, 0))
+        self.wheel.advance()
+        self.assertEqual(self.fired, ['early'])
+        self.assertFalse(self.wheel.reschedule(early, 10))
+
+    def test_wakeup_interrupts_long_wait(self):
+        wheel = TimerWheel()
+        wheel.call_later(600, self.fired.append, 'never')
+        threading.Timer(0.05, wheel.wakeup).start()
+        start = time.monotonic()
+        wheel.wait()
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(self.fired, [])
+
+    def test_wait_returns_when_due(self):
+        wheel = TimerWheel(tick_sec=0.01)
+        wheel.call_later(0.05, self.fired.append, 'done')
+        wheel.wait(max_wait=2)
+        self.assertEqual(self.fired, ['done'])
+
+
+if __name__ == '__main__':
+    unittest.main()
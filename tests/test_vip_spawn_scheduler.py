@@ -0,0 +1,99 @@
+import unittest
+from scripts.timer_wheel import TimerWheel
+from scripts.vip_spawn_scheduler import VipSpawnScheduler
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBattleWatcherManager:
+    def __init__(self, latest_by_union_id):
+        self.latest_by_union_id = latest_by_union_id
+        self.queried_urls = []
+
+    def get_boss_latest_kill_timestamp(self, union_id, log_url):
+        self.queried_urls.append(log_url)
+        return self.latest_by_union_id.get(union_id)
+
+
+class TestVipSpawnScheduler(unittest.TestCase):
+    def setUp(self):
+        # 单调时钟和墙上时间分开，模拟两者起点不同
+        self.monotonic = FakeClock(100.0)
+        self.wall = FakeClock(1700000000.0)
+        self.wheel = TimerWheel(tick_sec=0.1, slot_count=64, clock=self.monotonic)
+        self.scheduler = VipSpawnScheduler(self.wheel, wall_clock=self.wall)
+        self.events = []
+
+    def _elapse(self, seconds):
+        self.monotonic.now += seconds
+        self.wall.now += seconds
+        self.wheel.advance()
+
+    def test_next_spawn_from_kill_log(self):
+        watcher = FakeBattleWatcherManager({17: str(int((self.wall.now - 600) * 1000000))})
+        vip_bosses = [{'union_id': 17, 'kill_cooldown_seconds': 1200}, {'union_id': 18}]
+        next_spawns = self.scheduler.update_from_kill_log(vip_bosses, watcher, 'http://host/?ulog')
+        self.assertEqual(list(next_spawns), [17])
+        self.assertAlmostEqual(next_spawns[17], self.wall.now + 600)
+        self.assertAlmostEqual(self.scheduler.seconds_until_next_spawn(), 600)
+        self.assertEqual(watcher.queried_urls, ['http://host/?ulog'] * 2)
+
+    def test_no_upcoming_spawn(self):
+        self.scheduler.set_next_spawn(17, self.wall.now - 1)
+        self.assertIsNone(self.scheduler.seconds_until_next_spawn())
+
+    def test_prepares_before_spawn_and_fires_at_spawn(self):
+        self.scheduler.arm(17, self.wall.now + 10, 3,
+                           on_prepare=lambda: self.events.append('prepare'),
+                           on_spawn=lambda: self.events.append('spawn'))
+        self.assertTrue(self.scheduler.is_armed(17))
+        self.assertFalse(self.scheduler.is_armed(18))
+        self._elapse(6.9)
+        self.assertEqual(self.events, [])
+        self._elapse(0.2)
+        self.assertEqual(self.events, ['prepare'])
+        self._elapse(2.8)
+        self.assertEqual(self.events, ['prepare'])
+        self._elapse(0.2)
+        self.assertEqual(self.events, ['prepare', 'spawn'])
+        self.assertFalse(self.scheduler.is_armed())
+
+    def test_rearm_replaces_previous_timers(self):
+        self.scheduler.arm(17, self.wall.now + 5, 1, on_spawn=lambda: self.events.append(17))
+        self.scheduler.arm(18, self.wall.now + 8, 1, on_spawn=lambda: self.events.append(18))
+        self._elapse(10)
+        self.assertEqual(self.events, [18])
+
+    def test_disarm_cancels_timers(self):
+        self.scheduler.arm(17, self.wall.now + 5, 1,
+                           on_prepare=lambda: self.events.append('prepare'),
+                           on_spawn=lambda: self.events.append('spawn'))
+        self.scheduler.disarm()
+        self._elapse(10)
+        self.assertEqual(self.events, [])
+        self.assertEqual(self.wheel.pending_count, 0)
+
+    def test_spawn_already_passed_fires_immediately(self):
+        self.scheduler.arm(17, self.wall.now - 2, 3,
+                           on_prepare=lambda: self.events.append('prepare'),
+                           on_spawn=lambda: self.events.append('spawn'))
+        self._elapse(0.1)
+        self.assertEqual(self.events, ['prepare', 'spawn'])
+
+    def test_report_fired_measures_spawn_to_click_latency(self):
+        self.scheduler.arm(17, self.wall.now + 5, 1, on_spawn=lambda: None)
+        self._elapse(5.25)
+        self.assertIsNone(self.scheduler.report_fired(18))
+        self.assertAlmostEqual(self.scheduler.report_fired(17), 0.25)
+        # 只记录一次
+        self.assertIsNone(self.scheduler.report_fired(17))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.action_waits import ActionWaiter  # noqa: E402
+from scripts.advanced_action_executor import AdvancedActionManager  # noqa: E402
+
+DEFAULT_CONFIG = os.path.join(PROJECT_ROOT, 'configs', 'server_01', 'action_config_advanced.json')
+
+
+class CountingElement:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.round_trips += 1
+
+    def is_selected(self):
+        self.driver.round_trips += 1
+        return False
+
+
+class CountingDriver:
+    """不连浏览器，只统计 WebDriver 往返次数（每次 find / click / is_selected / execute_script 都是一次 HTTP 往返）
+
+    不是 PooledDriver（没有导航计数），每次都是新的实例，所以 LocatorCache 对每个动作组都从空缓存开始
+    """
+
+    def __init__(self):
+        self.round_trips = 0
+
+    def find_elements(self, by, value):
+        self.round_trips += 1
+        return [CountingElement(self)]
+
+    def execute_script(self, script, *args):
+        self.round_trips += 1
+        if 'hof-page-marker' in script:
+            # LocatorCache 的查找：代数标记检查 + 定位
+            return {'fresh': True, 'elements': [CountingElement(self)]}
+        return True
+
+    def execute_async_script(self, script, *args):
+        self.round_trips += 1
+        return {'ok': True, 'step': None, 'reason': None}
+
+
+def measure(manager, group, is_compiled_enabled):
+    """返回 (WebDriver 往返次数, 改成条件等待前这些动作的固定等待毫秒数)"""
+    driver = CountingDriver()
+    report = ActionWaiter.get_instance().report
+    fixed_before = report.get(group['name'], {}).get('fixed_ms', 0.0)
+    manager.is_compiled_enabled = is_compiled_enabled
+    manager.execute_advanced_action(driver, group, allow_http=False)
+    return driver.round_trips, report.get(group['name'], {}).get('fixed_ms', 0.0) - fixed_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description='比较动作组逐个执行和编译成 JS 后执行的 WebDriver 往返次数')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='action_config_advanced.json')
+    parser.add_argument('--rtt-ms', type=float, default=15.0, help='估算用的单次 WebDriver 往返耗时（毫秒）')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        groups = json.load(f)
+
+    manager = AdvancedActionManager()
+    # 动作组执行时的打印不是这里要看的
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            rows = []
+            for group_id, group in groups.items():
+                legacy_trips, fixed_wait_ms = measure(manager, group, False)
+                compiled_trips, _ = measure(manager, group, True)
+                rows.append((group_id, group['name'], len(group['actions']), legacy_trips, fixed_wait_ms, compiled_trips))
+        finally:
+            sys.stdout = stdout
+
+    total_fixed = total_legacy = total_compiled = 0.0
+    print(f'{"id":>8} {"动作数":>4} {"逐个往返":>6} {"原固定等待ms":>8} {"编译往返":>6}  名称')
+    for group_id, name, action_count, legacy_trips, fixed_wait_ms, compiled_trips in rows:
+        legacy_ms = legacy_trips * args.rtt_ms
+        total_fixed += legacy_ms + fixed_wait_ms
+        total_legacy += legacy_ms
+        total_compiled += compiled_trips * args.rtt_ms
+        print(f'{group_id:>8} {action_count:>6} {legacy_trips:>10} {fixed_wait_ms:>14.0f} {compiled_trips:>10}  {name}')
+    print(f'合计（不含页面加载本身）: 固定等待时约 {total_fixed:.0f}ms, '
+          f'逐个执行+条件等待约 {total_legacy:.0f}ms, 编译后约 {total_compiled:.0f}ms')
+
+if __name__ == '__main__':
+    main()
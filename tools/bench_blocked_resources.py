@@ -0,0 +1,82 @@
+import argparse
+import fnmatch
+import os
+import re
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.driver_provider import build_blocked_url_patterns  # noqa: E402
+
+SOURCE_DIR = os.path.join(PROJECT_ROOT, 'source_codes')
+LOCAL_IMAGE_DIR = os.path.join(PROJECT_ROOT, 'images', 'characters')
+RESOURCE_PATTERN = re.compile(r'''(?:src|href)\s*=\s*["']([^"']+)["']|url\(\s*["']?([^"')]+)["']?\s*\)''', re.IGNORECASE)
+RESOURCE_SUFFIXES = ('.gif', '.png', '.jpg', '.jpeg', '.webp', '.svg', '.ico', '.bmp',
+                     '.woff', '.woff2', '.ttf', '.otf', '.eot', '.mp3', '.mp4', '.ogg', '.wav', '.webm',
+                     '.css', '.js')
+
+
+def extract_resources(html):
+    """从保存的页面源码中提取子资源 URL（去重）"""
+    urls = []
+    for match in RESOURCE_PATTERN.finditer(html):
+        url = match.group(1) or match.group(2)
+        if url.split('?')[0].lower().endswith(RESOURCE_SUFFIXES) and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def is_blocked(url, patterns):
+    return any(fnmatch.fnmatch(url.lower(), p) for p in patterns)
+
+
+def local_image_sizes():
+    """images/characters 下保存的角色图片，用来估算同名资源的大小"""
+    sizes = {}
+    if os.path.isdir(LOCAL_IMAGE_DIR):
+        for name in os.listdir(LOCAL_IMAGE_DIR):
+            sizes[name] = os.path.getsize(os.path.join(LOCAL_IMAGE_DIR, name))
+    return sizes
+
+
+def estimate_ms(requests, total_bytes, rtt_ms, bandwidth_kbps, connections):
+    """按 往返次数 * RTT + 传输时间 粗略估算加载耗时"""
+    rounds = (requests + connections - 1) // connections
+    return rounds * rtt_ms + total_bytes * 8 / bandwidth_kbps
+
+
+def main():
+    parser = argparse.ArgumentParser(description='统计保存的游戏页面中会被 CDP 屏蔽的子资源数量、字节数和估算耗时（不需要本机安装 Chrome）')
+    parser.add_argument('--rtt-ms', type=float, default=80.0, help='单次请求往返耗时（毫秒）')
+    parser.add_argument('--bandwidth-kbps', type=float, default=8000.0, help='下行带宽（kbit/s）')
+    parser.add_argument('--connections', type=int, default=6, help='浏览器对同一域名的并发连接数')
+    parser.add_argument('--keep-stylesheets', action='store_true', help='模拟非无头模式（不屏蔽样式表）')
+    args = parser.parse_args()
+
+    patterns = build_blocked_url_patterns(block_stylesheets=not args.keep_stylesheets)
+    sizes = local_image_sizes()
+    default_size = sum(sizes.values()) // len(sizes) if sizes else 4096
+
+    total_before = total_after = 0.0
+    print(f'{"页面":<40}{"资源数":>8}{"屏蔽":>6}{"屏蔽字节":>12}{"屏蔽前ms":>10}{"屏蔽后ms":>10}')
+    for name in sorted(os.listdir(SOURCE_DIR)):
+        with open(os.path.join(SOURCE_DIR, name), 'r', encoding='utf-8', errors='ignore') as f:
+            urls = extract_resources(f.read())
+        all_bytes = blocked_bytes = blocked = 0
+        for url in urls:
+            size = sizes.get(os.path.basename(url.split('?')[0]), default_size)
+            all_bytes += size
+            if is_blocked(url, patterns):
+                blocked += 1
+                blocked_bytes += size
+        before = estimate_ms(len(urls), all_bytes, args.rtt_ms, args.bandwidth_kbps, args.connections)
+        after = estimate_ms(len(urls) - blocked, all_bytes - blocked_bytes, args.rtt_ms, args.bandwidth_kbps, args.connections)
+        total_before += before
+        total_after += after
+        print(f'{name:<40}{len(urls):>8}{blocked:>6}{blocked_bytes:>12}{before:>10.0f}{after:>10.0f}')
+    print(f'合计估算: 屏蔽前 {total_before:.0f}ms, 屏蔽后 {total_after:.0f}ms（仅为估算，真实耗时取决于服务器与缓存）')
+
+
+if __name__ == '__main__':
+    main()
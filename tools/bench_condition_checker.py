@@ -0,0 +1,77 @@
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.condition_checker import ConditionChecker  # noqa: E402
+
+DEFAULT_PAGE = os.path.join(PROJECT_ROOT, 'source_codes', 'source_code_hunt_page.htm')
+DEFAULT_CONFIG = os.path.join(PROJECT_ROOT, 'configs', 'condition_config.json')
+
+
+def legacy_extract(element_content, element_pattern):
+    """改造前 _extract_placeholder_value 的写法：每次重新拼正则，打印整个页面"""
+    print(f"元素内容: {element_content}")
+    placeholders = re.findall(r'\${([^}]+)}', element_pattern)
+    pattern_parts = []
+    last_end = 0
+    for match in re.finditer(r'\${([^}]+)}', element_pattern):
+        pattern_parts.append(re.escape(element_pattern[last_end:match.start()]))
+        pattern_parts.append('(.*?)')
+        last_end = match.end()
+    if last_end < len(element_pattern):
+        pattern_parts.append(re.escape(element_pattern[last_end:]))
+    match = re.search(''.join(pattern_parts), element_content, re.DOTALL)
+    if not match:
+        return {}
+    return dict(zip(placeholders, [group.strip(' \t\n\r"\'') for group in match.groups()]))
+
+
+def legacy_check(conditions, page_content):
+    """改造前 check_condition 的匹配部分：未转义的存在性检查 + 再提取一次占位符"""
+    for condition in conditions:
+        print(f"条件内容: {condition}")
+        element_pattern = condition.get('element_info')
+        if element_pattern and re.search(element_pattern.replace('${', '.*?').replace('}', '.*?'), page_content):
+            legacy_extract(page_content, element_pattern)
+
+
+def measure(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='测量条件检查耗时（预编译条件 vs 旧的每次拼正则 + 打印页面）')
+    parser.add_argument('--page', default=DEFAULT_PAGE, help='页面源码文件')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='condition_config.json')
+    parser.add_argument('--condition-id', default='1')
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(args.page, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    checker = ConditionChecker(args.config)
+    conditions = checker.condition_config[args.condition_id]['conditions']
+    # 旧写法的 print 也算在耗时里，但不输出到终端
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = checker.check_condition(args.condition_id, html)
+        compiled_us = measure(lambda: checker.check_condition(args.condition_id, html), args.rounds)
+    with contextlib.redirect_stdout(open(os.devnull, 'w', encoding='utf-8')):
+        legacy_us = measure(lambda: legacy_check(conditions, html), args.rounds)
+    print(f'页面 {len(html)} 字符, 条件{args.condition_id}（{len(conditions)}个条件）结果: {result}')
+    print(f'预编译条件: 每次 {compiled_us:.1f}us')
+    print(f'旧写法: 每次 {legacy_us:.1f}us（{legacy_us / compiled_us:.2f}x）')
+
+
+if __name__ == '__main__':
+    main()
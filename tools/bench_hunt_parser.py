@@ -0,0 +1,61 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.hunt_page_parser import parse_hunt_page  # noqa: E402
+
+DEFAULT_PAGE = os.path.join(PROJECT_ROOT, 'source_codes', 'source_code_hunt_page.htm')
+
+
+def legacy_parse(content):
+    """改造前 BattleWatcherManager 的写法：三个正则各自从头扫一遍全文（每次调用都重新查编译缓存）"""
+    boss_ids = [int(x) for x in re.findall(r"RA_UseBack\s*\(\s*'index2\.php\?union=(\d+)'\s*\)", content)]
+    stamina_match = re.search(r'<span id="mtime">(\d+)</span>', content)
+    stamina = int(stamina_match.group(1)) if stamina_match else None
+    cooldown_match = re.search(r'離下次戰鬥還需要 : <span class="bold">(\d+:\d+)</span>', content)
+    cooldown = 0
+    if cooldown_match:
+        minutes, seconds = map(int, cooldown_match.group(1).split(':'))
+        cooldown = minutes * 60 + seconds
+    return boss_ids, stamina, cooldown
+
+
+def measure(func, html, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(html)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='测量冒险页解析耗时（预编译单次扫描 vs 旧的三次全文正则）')
+    parser.add_argument('--page', default=DEFAULT_PAGE, help='冒险页源码文件')
+    parser.add_argument('--rounds', type=int, default=5000)
+    parser.add_argument('--budget-us', type=float, default=200.0, help='单次解析的耗时上限（微秒）')
+    args = parser.parse_args()
+
+    with open(args.page, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    snapshot = parse_hunt_page(html)
+    print(f'页面 {len(html)} 字符, 解析结果: 存活boss {sorted(snapshot.alive_boss_ids)}, '
+          f'体力 {snapshot.stamina}, 冷却 {snapshot.cooldown_seconds}秒')
+
+    elapsed_us = measure(parse_hunt_page, html, args.rounds)
+    legacy_us = measure(legacy_parse, html, args.rounds)
+    print(f'单次扫描: 每次 {elapsed_us:.1f}us')
+    print(f'旧的三次扫描: 每次 {legacy_us:.1f}us（{legacy_us / elapsed_us:.2f}x）')
+
+    if elapsed_us > args.budget_us:
+        print(f'超出预算 {args.budget_us:.1f}us')
+        sys.exit(1)
+    print(f'在预算 {args.budget_us:.1f}us 以内')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.log_manager import LogManager  # noqa: E402
+
+
+def legacy_prepend_write(path, message):
+    """改造前 LogManager._write_to_file 的写法：每行都读出整个文件再把新行写在最前面"""
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"{message}\n")
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"{message}\n{content}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='测量 LogManager 写入日志文件的耗时（追加缓冲写入 vs 旧的倒序重写）')
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--budget', type=float, default=3.0, help='写入 --lines 行（含最终 flush）的耗时上限（秒）')
+    parser.add_argument('--legacy-lines', type=int, default=2000, help='旧写法的对比行数（旧写法是 O(n²)，不要设太大）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'logs', 'log_server_bench.txt')
+        LogManager.set_log_path(path)
+        logger = LogManager.get_instance()
+        message = '[2026-01-01 00:00:00.000000][INFO] 普通boss 7 已出现，尝试处理 ' + 'x' * 40
+        start = time.perf_counter()
+        for _ in range(args.lines):
+            logger._write_to_file(message)
+        LogManager.flush()
+        elapsed = time.perf_counter() - start
+        latest = LogManager.read_latest(10)
+        LogManager._writer.close()
+        LogManager._writer = None
+        print(f'追加写入: {args.lines} 行, 耗时 {elapsed:.3f}s, 每行 {elapsed / args.lines * 1e6:.2f}us, 读取最新 10 行: {len(latest)} 行')
+
+        legacy_path = os.path.join(tmp, 'legacy.txt')
+        start = time.perf_counter()
+        for _ in range(args.legacy_lines):
+            legacy_prepend_write(legacy_path, message)
+        legacy_elapsed = time.perf_counter() - start
+        print(f'旧的倒序重写: {args.legacy_lines} 行, 耗时 {legacy_elapsed:.3f}s, 每行 {legacy_elapsed / args.legacy_lines * 1e6:.2f}us')
+
+    if elapsed > args.budget:
+        print(f'超出预算 {args.budget:.3f}s')
+        sys.exit(1)
+    print(f'在预算 {args.budget:.3f}s 以内')
+
+
+if __name__ == '__main__':
+    main()
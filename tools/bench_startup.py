@@ -0,0 +1,42 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module, runs):
+    """在全新的子进程中 import 指定模块，返回每次的耗时（秒）"""
+    cmd = [sys.executable, "-c", f"import {module}"]
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            print(proc.stderr)
+            raise SystemExit(f"import {module} 失败")
+        results.append(elapsed)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量启动时 import 主模块的耗时（不需要本机安装 Chrome）")
+    parser.add_argument("--module", default="scripts.hof_auto_bot_main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="中位数耗时上限（秒）")
+    args = parser.parse_args()
+    results = measure_import(args.module, args.runs)
+    median = statistics.median(results)
+    print(f"import {args.module}: runs={args.runs}, min={min(results):.3f}s, median={median:.3f}s, max={max(results):.3f}s")
+    if median > args.budget:
+        print(f"超出预算 {args.budget:.3f}s")
+        sys.exit(1)
+    print(f"在预算 {args.budget:.3f}s 以内")
+
+
+if __name__ == "__main__":
+    main()
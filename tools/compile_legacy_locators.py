@@ -0,0 +1,53 @@
+import argparse
+import glob
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.legacy_locator_table import (  # noqa: E402
+    DEFAULT_ACTION_CONFIG_PATTERNS, LOCATOR_TABLE_NAME, compile_action_configs,
+)
+
+
+def compile_config(config_path):
+    """编译一份旧版 action_config.json，定位表写到同目录的 action_locators.json，返回 (输出路径, 定位表)"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    table = compile_action_configs([config])
+    output_path = os.path.join(os.path.dirname(config_path), LOCATOR_TABLE_NAME)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+    return output_path, table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把旧版动作配置里的 element_info / container_info 预编译成定位表，并标出有歧义的 XPath')
+    parser.add_argument('configs', nargs='*', help='action_config.json 路径（默认 configs/ 和 configs/server_*/ 下的）')
+    parser.add_argument('--strict', action='store_true', help='有歧义的定位时返回非零退出码')
+    args = parser.parse_args()
+
+    config_paths = args.configs or [path for pattern in DEFAULT_ACTION_CONFIG_PATTERNS
+                                    for path in sorted(glob.glob(pattern))]
+    if not config_paths:
+        print('没有找到旧版动作配置（action_config.json）')
+        return 0
+
+    ambiguous_count = 0
+    for config_path in config_paths:
+        output_path, table = compile_config(config_path)
+        print(f'{config_path}: {len(table)} 个定位 -> {output_path}')
+        for locator in table.values():
+            if locator['ambiguous']:
+                ambiguous_count += 1
+                print(f"  [歧义: {', '.join(locator['ambiguous'])}] {locator['element_info']}")
+                print(f"    XPath: {locator['xpath']}")
+    if ambiguous_count:
+        print(f'共 {ambiguous_count} 个定位可能匹配到多个元素，建议在配置中补充文本或容器')
+    return 1 if args.strict and ambiguous_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())